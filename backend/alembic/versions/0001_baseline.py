@@ -0,0 +1,203 @@
+"""Baseline schema (matches database/init.sql before migrations were introduced)
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# IF NOT EXISTS lets databases created from database/init.sql upgrade in place
+_TABLES = [
+    """
+    -- Users (Admin)
+    CREATE TABLE IF NOT EXISTS users (
+        id SERIAL PRIMARY KEY,
+        username VARCHAR(50) UNIQUE NOT NULL,
+        password_hash VARCHAR(255) NOT NULL,
+        email VARCHAR(100) UNIQUE NOT NULL,
+        role VARCHAR(20) NOT NULL DEFAULT 'admin' CHECK (role IN ('admin', 'superadmin')),
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    -- Departments
+    CREATE TABLE IF NOT EXISTS departments (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        location VARCHAR(100),
+        created_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    -- Branches
+    CREATE TABLE IF NOT EXISTS branches (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        location VARCHAR(200),
+        phone VARCHAR(20),
+        created_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    -- Employees
+    CREATE TABLE IF NOT EXISTS employees (
+        id SERIAL PRIMARY KEY,
+        first_name VARCHAR(50) NOT NULL,
+        last_name VARCHAR(50) NOT NULL,
+        email VARCHAR(100) UNIQUE NOT NULL,
+        phone VARCHAR(20),
+        hire_date DATE NOT NULL DEFAULT CURRENT_DATE,
+        salary NUMERIC(10, 2),
+        commission_pct NUMERIC(4, 2),
+        job_title VARCHAR(100),
+        department_id INTEGER REFERENCES departments(id),
+        manager_id INTEGER REFERENCES employees(id),
+        branch_id INTEGER REFERENCES branches(id),
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    -- Customers
+    CREATE TABLE IF NOT EXISTS customers (
+        id SERIAL PRIMARY KEY,
+        username VARCHAR(50) UNIQUE NOT NULL,
+        password_hash VARCHAR(255) NOT NULL,
+        first_name VARCHAR(50) NOT NULL,
+        last_name VARCHAR(50) NOT NULL,
+        email VARCHAR(100) UNIQUE NOT NULL,
+        phone VARCHAR(20),
+        address TEXT,
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    -- Categories
+    CREATE TABLE IF NOT EXISTS categories (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        description TEXT
+    )
+    """,
+    """
+    -- Products
+    CREATE TABLE IF NOT EXISTS products (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(200) NOT NULL,
+        description TEXT,
+        price NUMERIC(10, 2) NOT NULL,
+        stock_quantity INTEGER NOT NULL DEFAULT 0,
+        category_id INTEGER REFERENCES categories(id),
+        image_url VARCHAR(500),
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    -- Discounts
+    CREATE TABLE IF NOT EXISTS discounts (
+        id SERIAL PRIMARY KEY,
+        product_id INTEGER REFERENCES products(id),
+        discount_pct NUMERIC(4, 2) NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE NOT NULL,
+        created_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    -- Stores
+    CREATE TABLE IF NOT EXISTS stores (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        branch_id INTEGER REFERENCES branches(id),
+        location VARCHAR(200),
+        manager_id INTEGER REFERENCES employees(id),
+        created_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    -- Store Inventory
+    CREATE TABLE IF NOT EXISTS store_inventory (
+        id SERIAL PRIMARY KEY,
+        store_id INTEGER REFERENCES stores(id),
+        product_id INTEGER REFERENCES products(id),
+        quantity INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    -- Supply
+    CREATE TABLE IF NOT EXISTS supply (
+        id SERIAL PRIMARY KEY,
+        product_id INTEGER REFERENCES products(id),
+        store_id INTEGER REFERENCES stores(id),
+        quantity INTEGER NOT NULL,
+        supply_date DATE NOT NULL DEFAULT CURRENT_DATE,
+        supplier_name VARCHAR(100),
+        created_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    -- Orders
+    CREATE TABLE IF NOT EXISTS orders (
+        id SERIAL PRIMARY KEY,
+        customer_id INTEGER REFERENCES customers(id),
+        order_date TIMESTAMP DEFAULT NOW(),
+        status VARCHAR(30) NOT NULL DEFAULT 'pending'
+            CHECK (status IN ('pending', 'confirmed', 'shipped', 'delivered', 'cancelled')),
+        total_amount NUMERIC(12, 2),
+        shipping_address TEXT,
+        branch_id INTEGER REFERENCES branches(id),
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    -- Order Items
+    CREATE TABLE IF NOT EXISTS order_items (
+        id SERIAL PRIMARY KEY,
+        order_id INTEGER REFERENCES orders(id) ON DELETE CASCADE,
+        product_id INTEGER REFERENCES products(id),
+        quantity INTEGER NOT NULL,
+        unit_price NUMERIC(10, 2) NOT NULL,
+        discount_pct NUMERIC(4, 2) DEFAULT 0
+    )
+    """,
+    """
+    -- Shipments
+    CREATE TABLE IF NOT EXISTS shipments (
+        id SERIAL PRIMARY KEY,
+        order_id INTEGER REFERENCES orders(id),
+        shipped_date TIMESTAMP,
+        estimated_delivery DATE,
+        actual_delivery DATE,
+        carrier VARCHAR(100),
+        tracking_number VARCHAR(100),
+        status VARCHAR(30) DEFAULT 'pending'
+            CHECK (status IN ('pending', 'in_transit', 'delivered', 'returned')),
+        created_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+]
+
+_DROP_ORDER = [
+    "shipments", "order_items", "orders", "supply", "store_inventory", "stores", "discounts",
+    "products", "categories", "customers", "employees", "branches", "departments", "users",
+]
+
+
+def upgrade() -> None:
+    for ddl in _TABLES:
+        op.execute(ddl)
+
+
+def downgrade() -> None:
+    for table in _DROP_ORDER:
+        op.execute(f"DROP TABLE IF EXISTS {table}")
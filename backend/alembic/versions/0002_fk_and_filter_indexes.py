@@ -0,0 +1,50 @@
+"""Indexes for foreign keys, router filters and text search
+
+Revision ID: 0002_fk_and_filter_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0002_fk_and_filter_indexes"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+# name -> (table, definition); built CONCURRENTLY so live tables stay writable
+_INDEXES = {
+    "ix_orders_customer_id": ("orders", "(customer_id, id)"),
+    "ix_order_items_order_id": ("order_items", "(order_id)"),
+    "ix_order_items_product_id": ("order_items", "(product_id)"),
+    "ix_shipments_order_id": ("shipments", "(order_id)"),
+    "ix_employees_department_id": ("employees", "(department_id)"),
+    "ix_employees_manager_id": ("employees", "(manager_id)"),
+    "ix_supply_store_id": ("supply", "(store_id)"),
+    "ix_discounts_product_id": ("discounts", "(product_id)"),
+    "ix_products_category_id": ("products", "(category_id)"),
+    "ix_products_name_trgm": ("products", "USING gin (name gin_trgm_ops)"),
+    "ix_products_description_trgm": ("products", "USING gin (description gin_trgm_ops)"),
+    "ix_customers_first_name_trgm": ("customers", "USING gin (first_name gin_trgm_ops)"),
+    "ix_customers_last_name_trgm": ("customers", "USING gin (last_name gin_trgm_ops)"),
+    "ix_customers_email_trgm": ("customers", "USING gin (email gin_trgm_ops)"),
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # store_inventory has never been written to, so a plain unique build is safe and
+    # gives later upserts their ON CONFLICT (store_id, product_id) target.
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_store_inventory_store_product "
+        "ON store_inventory (store_id, product_id)"
+    )
+    with op.get_context().autocommit_block():
+        for name, (table, definition) in _INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in _INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    op.execute("DROP INDEX IF EXISTS ux_store_inventory_store_product")
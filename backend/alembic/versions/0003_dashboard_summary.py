@@ -0,0 +1,38 @@
+"""Dashboard summary rollup and low-stock index
+
+Revision ID: 0003_dashboard_summary
+Revises: 0002_fk_and_filter_indexes
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0003_dashboard_summary"
+down_revision = "0002_fk_and_filter_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS dashboard_summary (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            products INTEGER NOT NULL DEFAULT 0,
+            customers INTEGER NOT NULL DEFAULT 0,
+            employees INTEGER NOT NULL DEFAULT 0,
+            orders INTEGER NOT NULL DEFAULT 0,
+            revenue NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            orders_by_status JSONB NOT NULL DEFAULT '{}',
+            low_stock JSONB NOT NULL DEFAULT '[]',
+            refreshed_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_stock_quantity ON products (stock_quantity, id)")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_products_stock_quantity")
+    op.execute("DROP TABLE IF EXISTS dashboard_summary")
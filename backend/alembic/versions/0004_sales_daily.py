@@ -0,0 +1,39 @@
+"""Daily sales fact rollup for the analytics API
+
+Revision ID: 0004_sales_daily
+Revises: 0003_dashboard_summary
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0004_sales_daily"
+down_revision = "0003_dashboard_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sales_daily (
+            day DATE NOT NULL,
+            branch_id INTEGER NOT NULL DEFAULT 0,
+            category_id INTEGER NOT NULL DEFAULT 0,
+            product_id INTEGER NOT NULL,
+            orders INTEGER NOT NULL DEFAULT 0,
+            units INTEGER NOT NULL DEFAULT 0,
+            revenue NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, branch_id, category_id, product_id)
+        )
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_sales_daily_product_day ON sales_daily (product_id, day)")
+    # Backfills rebuild one day of orders at a time
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_order_date ON orders (order_date)")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_orders_order_date")
+    op.execute("DROP TABLE IF EXISTS sales_daily")
@@ -0,0 +1,29 @@
+"""Shared token buckets for auth rate limiting (RATE_LIMIT_BACKEND=postgres)
+
+Revision ID: 0005_rate_limit_buckets
+Revises: 0004_sales_daily
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0005_rate_limit_buckets"
+down_revision = "0004_sales_daily"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Unlogged: bucket state is disposable, so skip WAL on a write-per-login table
+    op.execute(
+        """
+        CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_buckets (
+            key VARCHAR(200) PRIMARY KEY,
+            tokens DOUBLE PRECISION NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS rate_limit_buckets")
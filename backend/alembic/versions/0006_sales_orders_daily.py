@@ -0,0 +1,56 @@
+"""Count orders in a (day, branch) rollup and snapshot item categories
+
+sales_daily.orders summed to N for an order with N products, so it is
+dropped in favour of sales_orders_daily. order_items.category_id records
+the product's category at checkout. sales_orders_daily is filled from
+existing orders here, so order counts are right as soon as this upgrade runs.
+
+Revision ID: 0006_sales_orders_daily
+Revises: 0005_rate_limit_buckets
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0006_sales_orders_daily"
+down_revision = "0005_rate_limit_buckets"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE order_items ADD COLUMN IF NOT EXISTS category_id INTEGER")
+    # Existing rows were rolled up under the product's current category
+    op.execute(
+        """
+        UPDATE order_items oi SET category_id = p.category_id
+        FROM products p
+        WHERE p.id = oi.product_id AND oi.category_id IS NULL
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sales_orders_daily (
+            day DATE NOT NULL,
+            branch_id INTEGER NOT NULL DEFAULT 0,
+            orders INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, branch_id)
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO sales_orders_daily (day, branch_id, orders)
+        SELECT order_date::date, COALESCE(branch_id, 0), count(*)
+        FROM orders
+        WHERE status <> 'cancelled'
+        GROUP BY 1, 2
+        ON CONFLICT (day, branch_id) DO UPDATE SET orders = EXCLUDED.orders
+        """
+    )
+    op.execute("ALTER TABLE sales_daily DROP COLUMN IF EXISTS orders")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE sales_daily ADD COLUMN IF NOT EXISTS orders INTEGER NOT NULL DEFAULT 0")
+    op.execute("DROP TABLE IF EXISTS sales_orders_daily")
+    op.execute("ALTER TABLE order_items DROP COLUMN IF EXISTS category_id")
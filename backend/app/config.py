@@ -1,12 +1,54 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     database_url: str = "postgresql+asyncpg://postgres:postgres@db:5432/acmedb"
+    database_replica_url: Optional[str] = None
+    replica_max_lag_seconds: float = 5.0
+    replica_check_interval: float = 5.0  # seconds between replica health probes
+    replica_probe_timeout: float = 1.0  # an unanswered probe marks the replica unhealthy
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 10.0
+    db_pool_recycle: int = 1800  # seconds; drop connections older than this
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100  # asyncpg prepared statements per connection
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 8  # 8 hours
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:80"]
+    default_page_size: int = 100  # list endpoints called without ?limit
+    max_page_size: int = 1000
+    password_hash_executor: Literal["thread", "process"] = "thread"
+    password_hash_workers: int = 4
+    password_hash_queue_size: int = 32
+    token_cache_size: int = 10_000
+    catalogue_cache_max_bytes: int = 32 * 1024 * 1024
+    catalogue_cache_ttl: float = 60.0  # bounds staleness on workers that missed an invalidation
+    discount_index_ttl: float = 300.0
+    dashboard_refresh_seconds: float = 60.0
+    low_stock_threshold: int = 10
+    low_stock_limit: int = 20
+    fast_serialization: bool = False  # Core rows + orjson for large list responses
+    compression_min_size: int = 1024  # bytes; smaller bodies are sent uncompressed
+    brotli_quality: int = 4
+    metrics_enabled: bool = True
+    sql_profiling: bool = False  # X-DB-Query-Count / X-DB-Time headers and N+1 warnings
+    slow_query_ms: float = 500.0
+    n_plus_one_threshold: int = 5  # identical statement shapes per request
+    rate_limit_enabled: bool = True
+    rate_limit_backend: Literal["memory", "postgres"] = "memory"  # postgres: shared across replicas
+    rate_limit_max_keys: int = 100_000  # memory backend: LRU bound on tracked IPs/accounts
+    rate_limit_client_ip_header: Optional[str] = None  # e.g. X-Real-IP behind the bundled nginx
+    auth_ip_rate: float = 0.5  # tokens per second per client IP on the auth routes
+    auth_ip_burst: int = 20
+    auth_account_rate: float = 0.1  # failed attempts refilled per second per (client IP, account)
+    auth_account_burst: int = 5
+    auth_account_ceiling_rate: float = 1.0  # failed attempts refilled per second per account, across all IPs
+    auth_account_ceiling_burst: int = 100
+    auth_max_concurrent: int = 16  # guarded auth requests in flight per worker
 
     class Config:
         env_file = ".env"
@@ -1,14 +1,131 @@
+import asyncio
+import logging
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
+from app.utils.sqlprofile import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+
+class PoolWaitStats:
+    """Running totals for time spent waiting on a pool checkout."""
+
+    def __init__(self):
+        self.count = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.count += 1
+            self.timeouts += timed_out
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "checkouts": self.count,
+            "timeouts": self.timeouts,
+            "wait_total_ms": round(self.total_seconds * 1000, 3),
+            "wait_avg_ms": round(self.total_seconds * 1000 / self.count, 3) if self.count else 0.0,
+            "wait_max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return conn
+
+
+def _make_engine(url: str):
+    engine = create_async_engine(
+        url,
+        echo=False,
+        poolclass=TimedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={"prepared_statement_cache_size": settings.db_statement_cache_size},
+    )
+    instrument_engine(engine)
+    return engine
 
-engine = create_async_engine(settings.database_url, echo=False)
+
+engine = _make_engine(settings.database_url)
 
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Optional streaming replica for read-only routes
+replica_engine = _make_engine(settings.database_replica_url) if settings.database_replica_url else None
+ReplicaSessionLocal = (
+    sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False) if replica_engine else None
+)
+
+# Replay lag in seconds; 0 when the replica has applied everything it received
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaHealth:
+    """Periodically probes the replica and decides whether reads may use it."""
+
+    def __init__(self):
+        self.healthy = False
+        self.lag_seconds: float | None = None
+        self.checked_at = 0.0
+
+    async def usable(self) -> bool:
+        now = time.monotonic()
+        if now - self.checked_at >= settings.replica_check_interval:
+            self.checked_at = now  # claim the probe so concurrent requests don't stampede
+            await self._probe()
+        return self.healthy
+
+    async def _probe(self) -> None:
+        try:
+            # Bounded: this runs inside a request, and an unreachable host would otherwise hang it
+            lag = await asyncio.wait_for(self._lag(), timeout=settings.replica_probe_timeout)
+            self.lag_seconds = float(lag or 0)
+            self.healthy = self.lag_seconds <= settings.replica_max_lag_seconds
+        except Exception:
+            logger.warning("Read replica unavailable, routing reads to primary", exc_info=True)
+            self.lag_seconds = None
+            self.healthy = False
+
+    async def _lag(self):
+        async with replica_engine.connect() as conn:
+            return (await conn.execute(_REPLICA_LAG_SQL)).scalar()
+
+
+replica_health = ReplicaHealth()
+
 
 class Base(DeclarativeBase):
     pass
@@ -20,3 +137,46 @@ async def get_db():
             yield session
         finally:
             await session.close()
+
+
+async def read_session_factory():
+    """Session factory for read-only work: the replica when healthy, else the primary."""
+    if ReplicaSessionLocal is not None and await replica_health.usable():
+        return ReplicaSessionLocal
+    return AsyncSessionLocal
+
+
+async def get_read_db():
+    """Like get_db, but for read-only routes that tolerate replica lag.
+
+    Never use this on a path that must see its own writes.
+    """
+    session_factory = await read_session_factory()
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def _pool_status(pool) -> dict:
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.db_max_overflow,
+        "timeout": settings.db_pool_timeout,
+        **pool.wait_stats.snapshot(),
+    }
+
+
+def pool_status() -> dict:
+    status = _pool_status(engine.pool)
+    if replica_engine is not None:
+        status["replica"] = {
+            **_pool_status(replica_engine.pool),
+            "healthy": replica_health.healthy,
+            "lag_seconds": replica_health.lag_seconds,
+        }
+    return status
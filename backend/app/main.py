@@ -1,25 +1,42 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.routers import router as auth_router
+from app.routers.analytics import router as analytics_router
 from app.routers.branches import router as branch_router
 from app.routers.customers import router as customer_router
+from app.routers.dashboard import router as dashboard_router
 from app.routers.employees import dept_router, emp_router
+from app.routers.export import router as export_router
+from app.routers.imports import router as import_router
 from app.routers.orders import router as order_router, ship_router
 from app.routers.products import cat_router, disc_router, router as product_router
 from app.routers.stores import store_router, supply_router
+from app.routers.system import router as system_router
 from app.routers.users import router as user_router
+from app.utils import shutdown_hash_executor
+from app.utils.conditional import ETAG_HEADER
+from app.utils.dashboard import run_refresher
+from app.utils.metrics import MetricsMiddleware, metrics
+from app.utils.negotiation import CompressionMiddleware, MessagePackMiddleware
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.sqlprofile import N_PLUS_ONE_HEADER, QUERY_COUNT_HEADER, QUERY_TIME_HEADER, SQLProfilerMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Database schema is initialised from database/init.sql via Docker
     # (mounted at /docker-entrypoint-initdb.d/init.sql) for local development.
-    # For production, apply schema changes manually before deploying.
+    # For production, run `alembic upgrade head` before deploying.
+    refresher = asyncio.create_task(run_refresher())
     yield
+    refresher.cancel()
+    shutdown_hash_executor()
 
 
 app = FastAPI(
@@ -35,7 +52,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        NEXT_CURSOR_HEADER,
+        ETAG_HEADER,
+        "Last-Modified",
+        QUERY_COUNT_HEADER,
+        QUERY_TIME_HEADER,
+        N_PLUS_ONE_HEADER,
+    ],
 )
+if settings.sql_profiling:
+    app.add_middleware(SQLProfilerMiddleware)
+# Compression wraps MessagePack so packed bodies are compressed too
+app.add_middleware(MessagePackMiddleware)
+app.add_middleware(
+    CompressionMiddleware, minimum_size=settings.compression_min_size, brotli_quality=settings.brotli_quality
+)
+if settings.metrics_enabled:
+    # Outermost, so latency covers every middleware and sizes are bytes on the wire
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
 
 PREFIX = "/api"
 app.include_router(auth_router, prefix=PREFIX)
@@ -51,8 +86,20 @@ app.include_router(order_router, prefix=PREFIX)
 app.include_router(ship_router, prefix=PREFIX)
 app.include_router(store_router, prefix=PREFIX)
 app.include_router(supply_router, prefix=PREFIX)
+app.include_router(export_router, prefix=PREFIX)
+app.include_router(import_router, prefix=PREFIX)
+app.include_router(dashboard_router, prefix=PREFIX)
+app.include_router(analytics_router, prefix=PREFIX)
+app.include_router(system_router, prefix=PREFIX)
 
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+if settings.metrics_enabled:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
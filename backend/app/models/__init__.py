@@ -6,13 +6,16 @@ from sqlalchemy import (
     Column,
     Date,
     DateTime,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
     func,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -65,8 +68,8 @@ class Employee(Base):
     salary = Column(Numeric(10, 2))
     commission_pct = Column(Numeric(4, 2))
     job_title = Column(String(100))
-    department_id = Column(Integer, ForeignKey("departments.id"))
-    manager_id = Column(Integer, ForeignKey("employees.id"))
+    department_id = Column(Integer, ForeignKey("departments.id"), index=True)
+    manager_id = Column(Integer, ForeignKey("employees.id"), index=True)
     branch_id = Column(Integer, ForeignKey("branches.id"))
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -105,13 +108,14 @@ class Category(Base):
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (Index("ix_products_stock_quantity", "stock_quantity", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
     description = Column(Text)
     price = Column(Numeric(10, 2), nullable=False)
     stock_quantity = Column(Integer, nullable=False, default=0)
-    category_id = Column(Integer, ForeignKey("categories.id"))
+    category_id = Column(Integer, ForeignKey("categories.id"), index=True)
     image_url = Column(String(500))
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -127,7 +131,7 @@ class Discount(Base):
     __tablename__ = "discounts"
 
     id = Column(Integer, primary_key=True, index=True)
-    product_id = Column(Integer, ForeignKey("products.id"))
+    product_id = Column(Integer, ForeignKey("products.id"), index=True)
     discount_pct = Column(Numeric(4, 2), nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
@@ -154,6 +158,7 @@ class Store(Base):
 
 class StoreInventory(Base):
     __tablename__ = "store_inventory"
+    __table_args__ = (Index("ux_store_inventory_store_product", "store_id", "product_id", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     store_id = Column(Integer, ForeignKey("stores.id"))
@@ -170,7 +175,7 @@ class Supply(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"))
-    store_id = Column(Integer, ForeignKey("stores.id"))
+    store_id = Column(Integer, ForeignKey("stores.id"), index=True)
     quantity = Column(Integer, nullable=False)
     supply_date = Column(Date, nullable=False)
     supplier_name = Column(String(100))
@@ -182,6 +187,10 @@ class Supply(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_customer_id", "customer_id", "id"),
+        Index("ix_orders_order_date", "order_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     customer_id = Column(Integer, ForeignKey("customers.id"))
@@ -203,11 +212,13 @@ class OrderItem(Base):
     __tablename__ = "order_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"))
-    product_id = Column(Integer, ForeignKey("products.id"))
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), index=True)
     quantity = Column(Integer, nullable=False)
     unit_price = Column(Numeric(10, 2), nullable=False)
     discount_pct = Column(Numeric(4, 2), default=0)
+    # Product category at checkout, so analytics rows stay attributable after recategorisation
+    category_id = Column(Integer)
 
     order = relationship("Order", back_populates="items")
     product = relationship("Product", back_populates="order_items")
@@ -217,7 +228,7 @@ class Shipment(Base):
     __tablename__ = "shipments"
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"))
+    order_id = Column(Integer, ForeignKey("orders.id"), index=True)
     shipped_date = Column(DateTime)
     estimated_delivery = Column(Date)
     actual_delivery = Column(Date)
@@ -227,3 +238,54 @@ class Shipment(Base):
     created_at = Column(DateTime, server_default=func.now())
 
     order = relationship("Order", back_populates="shipment")
+
+
+class DashboardSummary(Base):
+    """Single-row rollup behind /api/dashboard/summary (see app.utils.dashboard)."""
+
+    __tablename__ = "dashboard_summary"
+
+    id = Column(Integer, primary_key=True)
+    products = Column(Integer, nullable=False, default=0)
+    customers = Column(Integer, nullable=False, default=0)
+    employees = Column(Integer, nullable=False, default=0)
+    orders = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+    orders_by_status = Column(JSONB, nullable=False, default=dict)
+    low_stock = Column(JSONB, nullable=False, default=list)
+    refreshed_at = Column(DateTime, server_default=func.now())
+
+
+class SalesDaily(Base):
+    """Daily units/revenue facts maintained by app.utils.analytics; 0 ids mean unassigned."""
+
+    __tablename__ = "sales_daily"
+    __table_args__ = (Index("ix_sales_daily_product_day", "product_id", "day"),)
+
+    day = Column(Date, primary_key=True)
+    branch_id = Column(Integer, primary_key=True, default=0)
+    category_id = Column(Integer, primary_key=True, default=0)
+    product_id = Column(Integer, primary_key=True)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+
+
+class SalesOrdersDaily(Base):
+    """Daily order counts per branch (0 = unassigned), kept apart so multi-product orders count once."""
+
+    __tablename__ = "sales_orders_daily"
+
+    day = Column(Date, primary_key=True)
+    branch_id = Column(Integer, primary_key=True, default=0)
+    orders = Column(Integer, nullable=False, default=0)
+
+
+class RateLimitBucket(Base):
+    """Shared auth token bucket (app.utils.ratelimit.PostgresBuckets); an unlogged table."""
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key = Column(String(200), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
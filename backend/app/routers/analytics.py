@@ -0,0 +1,129 @@
+"""Sales analytics served from the sales_daily / sales_orders_daily rollups (see app.utils.analytics)."""
+from datetime import date, timedelta
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.models import Branch, Category, Product, SalesDaily, SalesOrdersDaily
+from app.schemas import SalesPoint, TopSeller
+from app.routers.deps import require_admin
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+MAX_RANGE_DAYS = 366 * 5
+
+# dimension -> (rollup column, table holding the display name)
+_DIMENSIONS = {
+    "product": (SalesDaily.product_id, Product),
+    "category": (SalesDaily.category_id, Category),
+    "branch": (SalesDaily.branch_id, Branch),
+}
+
+
+class SalesFilter:
+    """Shared date range and dimension filters; ``end`` is inclusive."""
+
+    def __init__(
+        self,
+        start: Optional[date] = Query(None, description="defaults to 30 days before end"),
+        end: Optional[date] = Query(None, description="defaults to today"),
+        branch_id: Optional[int] = Query(None),
+        category_id: Optional[int] = Query(None),
+        product_id: Optional[int] = Query(None),
+    ):
+        self.end = end or date.today()
+        self.start = start or self.end - timedelta(days=29)
+        if self.start > self.end:
+            raise HTTPException(status_code=400, detail="start must not be after end")
+        if (self.end - self.start).days >= MAX_RANGE_DAYS:
+            raise HTTPException(status_code=400, detail=f"Range must be under {MAX_RANGE_DAYS} days")
+        self.branch_id = branch_id
+        self.category_id = category_id
+        self.product_id = product_id
+
+    @property
+    def counts_orders(self) -> bool:
+        # Order counts exist per (day, branch) only; an order is not split by category/product
+        return self.category_id is None and self.product_id is None
+
+    def apply(self, q):
+        q = q.where(SalesDaily.day >= self.start, SalesDaily.day <= self.end)
+        if self.branch_id is not None:
+            q = q.where(SalesDaily.branch_id == self.branch_id)
+        if self.category_id is not None:
+            q = q.where(SalesDaily.category_id == self.category_id)
+        if self.product_id is not None:
+            q = q.where(SalesDaily.product_id == self.product_id)
+        return q
+
+    def apply_orders(self, q):
+        q = q.where(SalesOrdersDaily.day >= self.start, SalesOrdersDaily.day <= self.end)
+        if self.branch_id is not None:
+            q = q.where(SalesOrdersDaily.branch_id == self.branch_id)
+        return q
+
+
+def _totals():
+    return (
+        func.sum(SalesDaily.units).label("units"),
+        func.sum(SalesDaily.revenue).label("revenue"),
+    )
+
+
+@router.get("/sales", response_model=list[SalesPoint])
+async def sales_timeseries(
+    filters: SalesFilter = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    _=Depends(require_admin),
+):
+    """Daily totals over the range; days without sales are omitted."""
+    result = await db.execute(
+        filters.apply(select(SalesDaily.day, *_totals())).group_by(SalesDaily.day).order_by(SalesDaily.day)
+    )
+    orders: dict[date, int] = {}
+    if filters.counts_orders:
+        counted = await db.execute(
+            filters.apply_orders(select(SalesOrdersDaily.day, func.sum(SalesOrdersDaily.orders)))
+            .group_by(SalesOrdersDaily.day)
+        )
+        orders = {day: n for day, n in counted.all()}
+    return [
+        SalesPoint(day=r.day, orders=orders.get(r.day, 0) if filters.counts_orders else None, units=r.units,
+                   revenue=float(r.revenue))
+        for r in result.all()
+    ]
+
+
+@router.get("/top", response_model=list[TopSeller])
+async def top_sellers(
+    dimension: Literal["product", "category", "branch"] = Query("product"),
+    by: Literal["revenue", "units"] = Query("revenue"),
+    limit: int = Query(10, ge=1, le=100),
+    filters: SalesFilter = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    _=Depends(require_admin),
+):
+    """Orders are reported for the branch dimension only: an order spans products and categories."""
+    key, named = _DIMENSIONS[dimension]
+    totals = filters.apply(select(key.label("id"), *_totals())).group_by(key).subquery()
+    columns = [totals, named.name]
+    q = select(*columns)
+    if dimension == "branch" and filters.counts_orders:
+        orders = (
+            filters.apply_orders(
+                select(SalesOrdersDaily.branch_id.label("id"), func.sum(SalesOrdersDaily.orders).label("orders"))
+            )
+            .group_by(SalesOrdersDaily.branch_id)
+            .subquery()
+        )
+        q = select(*columns, orders.c.orders).outerjoin(orders, orders.c.id == totals.c.id)
+    result = await db.execute(
+        q.outerjoin(named, named.id == totals.c.id).order_by(totals.c[by].desc(), totals.c.id).limit(limit)
+    )
+    return [
+        TopSeller(id=r.id, name=r.name, orders=getattr(r, "orders", None), units=r.units, revenue=float(r.revenue))
+        for r in result.all()
+    ]
@@ -2,18 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import Branch
 from app.schemas import BranchCreate, BranchResponse
+from app.utils.pagination import Page
 from app.routers.deps import require_admin
 
 router = APIRouter(prefix="/branches", tags=["branches"])
 
 
 @router.get("/", response_model=list[BranchResponse])
-async def list_branches(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    result = await db.execute(select(Branch))
-    return result.scalars().all()
+async def list_branches(page: Page = Depends(), db: AsyncSession = Depends(get_read_db), _=Depends(require_admin)):
+    result = await db.execute(page.apply(select(Branch), Branch.id))
+    return page.paginate(result.scalars().all())
 
 
 @router.post("/", response_model=BranchResponse, status_code=status.HTTP_201_CREATED)
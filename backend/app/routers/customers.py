@@ -2,10 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import Customer
 from app.schemas import CustomerCreate, CustomerResponse, CustomerUpdate, ChangePassword
-from app.utils import hash_password, verify_password
+from app.utils import hash_password_async, verify_password_async
+from app.utils.conditional import Conditional
+from app.utils.pagination import Page
+from app.utils.ratelimit import Admission, auth_guard
+from app.utils.search import ranked_search
 from app.routers.deps import require_admin, require_customer
 
 router = APIRouter(prefix="/customers", tags=["customers"])
@@ -16,22 +20,35 @@ router = APIRouter(prefix="/customers", tags=["customers"])
 @router.get("/", response_model=list[CustomerResponse])
 async def list_customers(
     search: str = Query(None),
-    db: AsyncSession = Depends(get_db),
+    page: Page = Depends(),
+    cond: Conditional = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     _=Depends(require_admin),
 ):
     q = select(Customer)
     if search:
-        q = q.where(
-            Customer.first_name.ilike(f"%{search}%")
-            | Customer.last_name.ilike(f"%{search}%")
-            | Customer.email.ilike(f"%{search}%")
-        )
-    result = await db.execute(q)
-    return result.scalars().all()
+        columns = [Customer.first_name, Customer.last_name, Customer.email]
+        ids, id_keys = ranked_search(select(Customer.id, Customer.updated_at), search, columns, Customer.id)
+        not_modified = await cond.collection(db, page.apply(ids, *id_keys))
+        if not_modified:
+            return not_modified
+        q, keys = ranked_search(q, search, columns, Customer.id)
+        result = await db.execute(page.apply(q, *keys))
+        return [row[0] for row in page.paginate(result.all())]
+    not_modified = await cond.collection(db, page.apply(select(Customer.id, Customer.updated_at), Customer.id))
+    if not_modified:
+        return not_modified
+    result = await db.execute(page.apply(q, Customer.id))
+    return page.paginate(result.scalars().all())
 
 
 @router.get("/{customer_id}", response_model=CustomerResponse)
-async def get_customer(customer_id: int, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+async def get_customer(
+    customer_id: int, cond: Conditional = Depends(), db: AsyncSession = Depends(get_db), _=Depends(require_admin)
+):
+    not_modified = await cond.item(db, select(Customer.updated_at).where(Customer.id == customer_id))
+    if not_modified:
+        return not_modified
     result = await db.execute(select(Customer).where(Customer.id == customer_id))
     customer = result.scalar_one_or_none()
     if not customer:
@@ -42,16 +59,21 @@ async def get_customer(customer_id: int, db: AsyncSession = Depends(get_db), _=D
 # ── Customer self-service ─────────────────────────────────────────────────────
 
 @router.post("/register", response_model=CustomerResponse, status_code=status.HTTP_201_CREATED)
-async def register_customer(payload: CustomerCreate, db: AsyncSession = Depends(get_db)):
+async def register_customer(
+    payload: CustomerCreate, db: AsyncSession = Depends(get_db), guard: Admission = Depends(auth_guard)
+):
+    await guard.account("customer", payload.username)
     existing = await db.execute(select(Customer).where(Customer.username == payload.username))
     if existing.scalar_one_or_none():
+        await guard.failed()
         raise HTTPException(status_code=400, detail="Username already exists")
     existing_email = await db.execute(select(Customer).where(Customer.email == payload.email))
     if existing_email.scalar_one_or_none():
+        await guard.failed()
         raise HTTPException(status_code=400, detail="Email already exists")
     customer = Customer(
         username=payload.username,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
         first_name=payload.first_name,
         last_name=payload.last_name,
         email=payload.email,
@@ -95,11 +117,14 @@ async def change_customer_password(
     data: ChangePassword,
     db: AsyncSession = Depends(get_db),
     current=Depends(require_customer),
+    guard: Admission = Depends(auth_guard),
 ):
+    await guard.account("customer", f"id:{current['user_id']}")
     result = await db.execute(select(Customer).where(Customer.id == current["user_id"]))
     customer = result.scalar_one_or_none()
-    if not customer or not verify_password(data.current_password, customer.password_hash):
+    if not customer or not await verify_password_async(data.current_password, customer.password_hash):
+        await guard.failed()
         raise HTTPException(status_code=400, detail="Current password is incorrect")
-    customer.password_hash = hash_password(data.new_password)
+    customer.password_hash = await hash_password_async(data.new_password)
     await db.commit()
     return {"message": "Password changed successfully"}
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models import DashboardSummary, Order
+from app.schemas import DashboardSummaryResponse
+from app.routers.deps import require_admin
+from app.routers.orders import build_order_responses
+from app.utils.dashboard import refresh_summary
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+RECENT_ORDERS = 5
+
+
+@router.get("/summary", response_model=DashboardSummaryResponse)
+async def dashboard_summary(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    summary = await db.get(DashboardSummary, 1)
+    if summary is None:
+        # First boot before the background refresher has run
+        await refresh_summary(db, force=True)
+        summary = await db.get(DashboardSummary, 1)
+        if summary is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Dashboard summary is being computed",
+                headers={"Retry-After": "5"},
+            )
+    result = await db.execute(select(Order).order_by(Order.id.desc()).limit(RECENT_ORDERS))
+    recent = await build_order_responses(result.scalars().all(), db)
+    return DashboardSummaryResponse(
+        products=summary.products,
+        customers=summary.customers,
+        employees=summary.employees,
+        orders=summary.orders,
+        revenue=float(summary.revenue),
+        orders_by_status=summary.orders_by_status,
+        low_stock=summary.low_stock,
+        recent_orders=recent,
+        refreshed_at=summary.refreshed_at,
+    )
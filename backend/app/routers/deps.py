@@ -2,17 +2,31 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from app.config import settings
 from app.utils import decode_token
+from app.utils.cache import LRUCache
 
 # Use HTTPBearer to accurately reflect JSON-body login (not OAuth2 password flow)
 _bearer = HTTPBearer(auto_error=False)
 
+# Verified claims keyed by the raw token; each entry expires at the token's exp
+token_cache = LRUCache(settings.token_cache_size)
+
+
+def _decode_cached(token: str) -> dict | None:
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_token(token)
+        if payload and "exp" in payload:
+            token_cache.set(token, payload, expires_at=float(payload["exp"]))
+    return payload
+
 
 def _get_current(credentials: HTTPAuthorizationCredentials | None, expected_type: str) -> dict:
     token = credentials.credentials if credentials else None
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
-    payload = decode_token(token)
+    payload = _decode_cached(token)
     if not payload or payload.get("type") != expected_type:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
     return {"user_id": int(payload["sub"]), "role": payload.get("role")}
@@ -29,7 +43,7 @@ def require_customer(credentials: HTTPAuthorizationCredentials = Depends(_bearer
 def optional_customer(credentials: HTTPAuthorizationCredentials = Depends(_bearer)):
     if not credentials:
         return None
-    payload = decode_token(credentials.credentials)
+    payload = _decode_cached(credentials.credentials)
     if not payload or payload.get("type") != "customer":
         return None
     return {"user_id": int(payload["sub"]), "role": "customer"}
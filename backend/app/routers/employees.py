@@ -1,20 +1,36 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from sqlalchemy import func, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import Department, Employee
-from app.schemas import DepartmentCreate, DepartmentResponse, EmployeeCreate, EmployeeResponse, EmployeeUpdate
+from app.schemas import (
+    DepartmentCreate,
+    DepartmentResponse,
+    EmployeeCreate,
+    EmployeeResponse,
+    EmployeeUpdate,
+    OrgLevel,
+    OrgMember,
+    OrgSubtreeResponse,
+)
+from app.utils.conditional import Conditional
+from app.utils.pagination import Page
 from app.routers.deps import require_admin
 
 dept_router = APIRouter(prefix="/departments")
 emp_router = APIRouter(prefix="/employees")
 
+# Bounds the recursive walks; deeper than any real org chart and a guard against cycles
+MAX_ORG_DEPTH = 64
+
 
 # ── Departments ───────────────────────────────────────────────────────────────
 
 @dept_router.get("/", response_model=list[DepartmentResponse])
-async def list_departments(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+async def list_departments(db: AsyncSession = Depends(get_read_db), _=Depends(require_admin)):
     result = await db.execute(select(Department))
     return result.scalars().all()
 
@@ -57,16 +73,106 @@ async def delete_department(dept_id: int, db: AsyncSession = Depends(get_db), _=
 async def list_employees(
     department_id: int = Query(None),
     manager_id: int = Query(None),
-    db: AsyncSession = Depends(get_db),
+    page: Page = Depends(),
+    cond: Conditional = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     _=Depends(require_admin),
 ):
     q = select(Employee)
+    ids = select(Employee.id, Employee.updated_at)
     if department_id:
         q = q.where(Employee.department_id == department_id)
+        ids = ids.where(Employee.department_id == department_id)
     if manager_id:
         q = q.where(Employee.manager_id == manager_id)
-    result = await db.execute(q)
-    return result.scalars().all()
+        ids = ids.where(Employee.manager_id == manager_id)
+    not_modified = await cond.collection(db, page.apply(ids, Employee.id))
+    if not_modified:
+        return not_modified
+    result = await db.execute(page.apply(q, Employee.id))
+    return page.paginate(result.scalars().all())
+
+
+# ── Org chart (recursive CTEs over the indexed manager_id) ───────────────────
+
+def _subtree_cte(root_id: int, max_depth: int):
+    tree = select(Employee.id, literal(0).label("depth")).where(Employee.id == root_id).cte("subtree", recursive=True)
+    return tree.union_all(
+        select(Employee.id, tree.c.depth + 1)
+        .join(tree, Employee.manager_id == tree.c.id)
+        .where(tree.c.depth < max_depth)
+    )
+
+
+def _chain_cte(emp_id: int):
+    chain = select(Employee.id, Employee.manager_id, literal(0).label("depth")).where(Employee.id == emp_id).cte(
+        "chain", recursive=True
+    )
+    return chain.union_all(
+        select(Employee.id, Employee.manager_id, chain.c.depth + 1)
+        .join(chain, Employee.id == chain.c.manager_id)
+        .where(chain.c.depth < MAX_ORG_DEPTH)
+    )
+
+
+def _org_member(emp: Employee, depth: int) -> OrgMember:
+    return OrgMember(**EmployeeResponse.model_validate(emp).model_dump(), depth=depth)
+
+
+@emp_router.get("/{emp_id}/subtree", response_model=OrgSubtreeResponse)
+async def employee_subtree(
+    emp_id: int,
+    max_depth: int = Query(MAX_ORG_DEPTH, ge=1, le=MAX_ORG_DEPTH),
+    include_employees: bool = Query(True, description="false returns only the headcount aggregates"),
+    db: AsyncSession = Depends(get_read_db),
+    _=Depends(require_admin),
+):
+    """Everyone reporting to an employee, directly or indirectly, with per-level headcounts."""
+    tree = _subtree_cte(emp_id, max_depth)
+    counts = (
+        await db.execute(select(tree.c.depth, func.count()).group_by(tree.c.depth).order_by(tree.c.depth))
+    ).all()
+    if not counts:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    levels = [OrgLevel(depth=d, headcount=n) for d, n in counts if d > 0]
+    members = []
+    if include_employees:
+        result = await db.execute(
+            select(Employee, tree.c.depth).join(tree, Employee.id == tree.c.id).where(tree.c.depth > 0)
+            .order_by(tree.c.depth, Employee.id)
+        )
+        members = [_org_member(emp, depth) for emp, depth in result.all()]
+    return OrgSubtreeResponse(
+        root_id=emp_id,
+        headcount=sum(level.headcount for level in levels),
+        depth=levels[-1].depth if levels else 0,
+        levels=levels,
+        employees=members,
+    )
+
+
+@emp_router.get("/{emp_id}/chain", response_model=list[OrgMember])
+async def employee_chain(emp_id: int, db: AsyncSession = Depends(get_read_db), _=Depends(require_admin)):
+    """The employee followed by each manager up to the top; depth counts levels above the employee."""
+    chain = _chain_cte(emp_id)
+    result = await db.execute(
+        select(Employee, chain.c.depth).join(chain, Employee.id == chain.c.id).order_by(chain.c.depth)
+    )
+    rows = result.all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return [_org_member(emp, depth) for emp, depth in rows]
+
+
+async def _check_manager(db: AsyncSession, emp_id: int, manager_id: Optional[int]) -> None:
+    """Reject a manager change that would put an employee under their own subtree."""
+    if manager_id is None:
+        return
+    if manager_id == emp_id:
+        raise HTTPException(status_code=400, detail="An employee cannot manage themselves")
+    chain = _chain_cte(manager_id)
+    if await db.scalar(select(chain.c.id).where(chain.c.id == emp_id).limit(1)):
+        raise HTTPException(status_code=400, detail=f"Employee {manager_id} reports to employee {emp_id}")
 
 
 @emp_router.post("/", response_model=EmployeeResponse, status_code=status.HTTP_201_CREATED)
@@ -79,7 +185,12 @@ async def create_employee(payload: EmployeeCreate, db: AsyncSession = Depends(ge
 
 
 @emp_router.get("/{emp_id}", response_model=EmployeeResponse)
-async def get_employee(emp_id: int, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+async def get_employee(
+    emp_id: int, cond: Conditional = Depends(), db: AsyncSession = Depends(get_db), _=Depends(require_admin)
+):
+    not_modified = await cond.item(db, select(Employee.updated_at).where(Employee.id == emp_id))
+    if not_modified:
+        return not_modified
     result = await db.execute(select(Employee).where(Employee.id == emp_id))
     emp = result.scalar_one_or_none()
     if not emp:
@@ -93,7 +204,10 @@ async def update_employee(emp_id: int, payload: EmployeeUpdate, db: AsyncSession
     emp = result.scalar_one_or_none()
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
-    for k, v in payload.model_dump(exclude_unset=True).items():
+    changes = payload.model_dump(exclude_unset=True)
+    if "manager_id" in changes:
+        await _check_manager(db, emp_id, changes["manager_id"])
+    for k, v in changes.items():
         setattr(emp, k, v)
     await db.commit()
     await db.refresh(emp)
@@ -106,5 +220,12 @@ async def delete_employee(emp_id: int, db: AsyncSession = Depends(get_db), _=Dep
     emp = result.scalar_one_or_none()
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
+    # Direct reports move up to the departing employee's manager instead of dangling
+    await db.execute(
+        update(Employee)
+        .where(Employee.manager_id == emp_id)
+        .values(manager_id=emp.manager_id)
+        .execution_options(synchronize_session=False)
+    )
     await db.delete(emp)
     await db.commit()
@@ -0,0 +1,107 @@
+"""Streaming bulk export for finance/BI pulls (NDJSON or CSV)."""
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import AsyncIterator, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.database import read_session_factory
+from app.models import Customer, Order, OrderItem, Product
+from app.routers.deps import require_admin
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+# Rows are pulled from the server-side cursor in batches of this size
+_YIELD_PER = 1000
+
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _export_query(entity: str, since: datetime | None):
+    if entity == "products":
+        q = select(
+            Product.id, Product.name, Product.description, Product.price, Product.stock_quantity,
+            Product.category_id, Product.image_url, Product.created_at, Product.updated_at,
+        )
+        if since:
+            q = q.where(Product.updated_at >= since)
+        return q.order_by(Product.id)
+    if entity == "customers":
+        q = select(
+            Customer.id, Customer.username, Customer.first_name, Customer.last_name, Customer.email,
+            Customer.phone, Customer.address, Customer.created_at, Customer.updated_at,
+        )
+        if since:
+            q = q.where(Customer.updated_at >= since)
+        return q.order_by(Customer.id)
+    if entity == "orders":
+        q = select(
+            Order.id, Order.customer_id, Order.order_date, Order.status, Order.total_amount,
+            Order.shipping_address, Order.branch_id, Order.updated_at,
+        )
+        if since:
+            q = q.where(Order.order_date >= since)
+        return q.order_by(Order.id)
+    if entity == "order_items":
+        q = select(
+            OrderItem.id, OrderItem.order_id, OrderItem.product_id, OrderItem.quantity,
+            OrderItem.unit_price, OrderItem.discount_pct,
+        )
+        if since:
+            q = q.join(Order, Order.id == OrderItem.order_id).where(Order.order_date >= since)
+        return q.order_by(OrderItem.id)
+    raise HTTPException(status_code=404, detail="Unknown export entity")
+
+
+def _plain(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+async def _stream_rows(q, fmt: str) -> AsyncIterator[str]:
+    # A dedicated session: the request-scoped one from get_db is closed
+    # before a StreamingResponse body has finished sending.
+    session_factory = await read_session_factory()
+    async with session_factory() as session:
+        result = await session.stream(q.execution_options(yield_per=_YIELD_PER))
+        keys = list(result.keys())
+        if fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(keys)
+            async for partition in result.partitions():
+                for row in partition:
+                    writer.writerow([_plain(v) for v in row])
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+            if buf.tell():
+                yield buf.getvalue()
+        else:
+            async for partition in result.partitions():
+                yield "".join(
+                    json.dumps(dict(zip(keys, (_plain(v) for v in row)))) + "\n" for row in partition
+                )
+
+
+@router.get("/{entity}")
+async def export_entity(
+    entity: Literal["orders", "order_items", "customers", "products"],
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    since: datetime = Query(None),
+    _=Depends(require_admin),
+):
+    q = _export_query(entity, since)
+    return StreamingResponse(
+        _stream_rows(q, format),
+        media_type=_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{format}"'},
+    )
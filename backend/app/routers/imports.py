@@ -0,0 +1,287 @@
+"""Admin bulk import: streaming validation, COPY into a staging table, set-based merge."""
+import codecs
+import csv
+import json
+from decimal import Decimal
+from typing import Iterator, Literal
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import BigInteger, Integer, Numeric, SmallInteger, String, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models import Customer, Employee, Product, Supply
+from app.routers.deps import require_admin
+from app.routers.products import catalogue_cache
+from app.schemas import CustomerImport, EmployeeImport, ProductCreate, SupplyCreate
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+_BATCH_SIZE = 5000
+_MAX_REPORTED_ERRORS = 1000
+_STAGING = "import_staging"
+_PARSE_ERRORS = (UnicodeDecodeError, json.JSONDecodeError, csv.Error)
+_INT_BITS = {SmallInteger: 16, Integer: 32, BigInteger: 64}
+
+
+class _ImportSpec:
+    def __init__(
+        self,
+        model,
+        schema: type[BaseModel],
+        foreign_keys: dict[str, str],
+        unique_columns: tuple[str, ...] = (),
+        parent: tuple[str, str] | None = None,
+        after_merge: str | None = None,
+    ):
+        self.table = model.__table__
+        self.schema = schema
+        self.columns = list(schema.model_fields)
+        self.foreign_keys = foreign_keys  # staging column -> referenced table
+        self.unique_columns = unique_columns  # rows clashing with the file or the table are skipped
+        # (staging column, id column): a reference by the first unique column to a row of
+        # the same table, possibly one in this upload; rows are then merged parents first
+        self.parent = parent
+        self.insert_columns = [c for c in self.columns if parent is None or c != parent[0]]
+        self.after_merge = after_merge  # extra SQL run against the staging table before commit
+
+    def column_type(self, name: str):
+        if self.parent and name == self.parent[0]:
+            return self.table.c[self.unique_columns[0]].type
+        return self.table.c[name].type
+
+
+_SPECS = {
+    "products": _ImportSpec(Product, ProductCreate, {"category_id": "categories"}),
+    "employees": _ImportSpec(
+        Employee,
+        EmployeeImport,
+        {"department_id": "departments", "manager_id": "employees", "branch_id": "branches"},
+        unique_columns=("email",),
+        parent=("manager_email", "manager_id"),
+    ),
+    "customers": _ImportSpec(Customer, CustomerImport, {}, unique_columns=("username", "email")),
+    "supply": _ImportSpec(
+        Supply,
+        SupplyCreate,
+        {"product_id": "products", "store_id": "stores"},
+        after_merge=(
+            "INSERT INTO store_inventory (store_id, product_id, quantity) "
+            f"SELECT store_id, product_id, sum(quantity) FROM {_STAGING} GROUP BY store_id, product_id "
+            "ON CONFLICT (store_id, product_id) "
+            "DO UPDATE SET quantity = store_inventory.quantity + EXCLUDED.quantity, updated_at = now()"
+        ),
+    ),
+}
+
+
+def _read_rows(upload: UploadFile, fmt: str) -> Iterator[dict]:
+    lines = codecs.iterdecode(upload.file, "utf-8-sig")
+    if fmt == "csv":
+        for row in csv.DictReader(lines):
+            # Empty CSV cells mean "not provided" so Optional fields fall back to None
+            yield {k: v for k, v in row.items() if v not in ("", None)}
+    else:
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _next_rows(rows: Iterator[dict], n: int) -> tuple[list[dict], Exception | None]:
+    """Up to ``n`` parsed rows, plus the parse error that stopped reading early, if any.
+
+    Reads the spooled upload synchronously, so callers run it in the threadpool.
+    """
+    out: list[dict] = []
+    try:
+        for row in rows:
+            out.append(row)
+            if len(out) >= n:
+                break
+    except _PARSE_ERRORS as exc:
+        return out, exc
+    return out, None
+
+
+def _column_errors(spec: _ImportSpec, obj: BaseModel) -> list[str]:
+    """Values pydantic accepts but the column types would reject (and fail the whole COPY)."""
+    messages = []
+    for name in spec.columns:
+        value = getattr(obj, name)
+        if value is None:
+            continue
+        col_type = spec.column_type(name)
+        if isinstance(value, str):
+            if "\x00" in value:
+                messages.append(f"{name}: NUL characters are not allowed")
+            elif isinstance(col_type, String) and col_type.length and len(value) > col_type.length:
+                messages.append(f"{name}: at most {col_type.length} characters")
+        elif isinstance(col_type, Numeric) and col_type.precision is not None:
+            scale = col_type.scale or 0
+            limit = Decimal(10) ** (col_type.precision - scale)
+            if abs(round(Decimal(str(value)), scale)) >= limit:
+                messages.append(f"{name}: must be below {limit} in magnitude")
+        elif type(col_type) in _INT_BITS:
+            bound = 2 ** (_INT_BITS[type(col_type)] - 1)
+            if not -bound <= value < bound:
+                messages.append(f"{name}: out of range")
+    return messages
+
+
+def _to_record(spec: _ImportSpec, row_no: int, obj: BaseModel) -> tuple:
+    values = [row_no]
+    for name in spec.columns:
+        value = getattr(obj, name)
+        if isinstance(spec.column_type(name), Numeric) and value is not None:
+            value = Decimal(str(value))
+        values.append(value)
+    return tuple(values)
+
+
+def _staging_ddl(spec: _ImportSpec) -> str:
+    dialect = postgresql.dialect()
+    cols = ", ".join(f"{name} {spec.column_type(name).compile(dialect=dialect)}" for name in spec.columns)
+    return f"CREATE TEMP TABLE {_STAGING} (row_no integer PRIMARY KEY, {cols}) ON COMMIT DROP"
+
+
+async def _merge_unique(db: AsyncSession, spec: _ImportSpec, report) -> None:
+    """Insert staged rows, skipping clashes on the unique columns; consumes the staging table."""
+    table, key = spec.table.name, spec.unique_columns[0]
+    for column in spec.unique_columns:
+        # Duplicates within the file: keep the first occurrence
+        dup = await db.execute(
+            text(
+                f"DELETE FROM {_STAGING} s USING {_STAGING} f "
+                f"WHERE s.{column} = f.{column} AND s.row_no > f.row_no RETURNING s.row_no, s.{column}"
+            )
+        )
+        for row_no, value in dup.all():
+            report(row_no, [f"{column}: duplicate {value} in upload"])
+
+    ready = "TRUE"
+    if spec.parent:
+        ref, id_column = spec.parent
+        resolve = text(
+            f"UPDATE {_STAGING} s SET {id_column} = t.id FROM {table} t "
+            f"WHERE s.{ref} IS NOT NULL AND s.{id_column} IS NULL AND t.{key} = s.{ref}"
+        )
+        await db.execute(resolve)
+        unknown = await db.execute(
+            text(
+                f"DELETE FROM {_STAGING} s WHERE s.{ref} IS NOT NULL AND s.{id_column} IS NULL "
+                f"AND NOT EXISTS (SELECT 1 FROM {_STAGING} f WHERE f.{key} = s.{ref}) RETURNING s.row_no, s.{ref}"
+            )
+        )
+        for row_no, value in unknown.all():
+            report(row_no, [f"{ref}: {table} {value} does not exist"])
+        ready = f"{ref} IS NULL OR {id_column} IS NOT NULL"
+
+    # One round per level of the hierarchy in the file: rows whose parent exists go in, then their children
+    cols = ", ".join(spec.insert_columns)
+    while True:
+        merged = (
+            await db.execute(
+                text(
+                    f"WITH ready AS (DELETE FROM {_STAGING} WHERE {ready} RETURNING *), "
+                    f"ins AS (INSERT INTO {table} ({cols}) SELECT {cols} FROM ready ORDER BY row_no "
+                    f"ON CONFLICT DO NOTHING RETURNING {key}) "
+                    f"SELECT r.row_no, r.{key}, ins.{key} IS NOT NULL FROM ready r LEFT JOIN ins ON ins.{key} = r.{key}"
+                )
+            )
+        ).all()
+        for row_no, value, inserted in merged:
+            if not inserted:
+                report(row_no, [f"{'/'.join(spec.unique_columns)}: {value} already exists"])
+        if not merged or not spec.parent:
+            break
+        await db.execute(resolve)
+    if spec.parent:
+        cycles = await db.execute(text(f"DELETE FROM {_STAGING} RETURNING row_no, {spec.parent[0]}"))
+        for row_no, value in cycles.all():
+            report(row_no, [f"{spec.parent[0]}: {value} is part of a reporting cycle"])
+
+
+@router.post("/{entity}")
+async def bulk_import(
+    entity: Literal["products", "employees", "customers", "supply"],
+    file: UploadFile = File(...),
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    db: AsyncSession = Depends(get_db),
+    _=Depends(require_admin),
+):
+    spec = _SPECS[entity]
+    errors: list[dict] = []
+    error_count = 0
+
+    def report(row_no: int, messages: list[str]) -> None:
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < _MAX_REPORTED_ERRORS:
+            errors.append({"row": row_no, "errors": messages})
+
+    await db.execute(text(_staging_ddl(spec)))
+    raw = await (await db.connection()).get_raw_connection()
+    pg = raw.driver_connection
+
+    received = 0
+    rows = _read_rows(file, format)
+    while True:
+        chunk, parse_error = await run_in_threadpool(_next_rows, rows, _BATCH_SIZE)
+        batch: list[tuple] = []
+        for row in chunk:
+            received += 1
+            try:
+                obj = spec.schema.model_validate(row)
+            except ValidationError as exc:
+                report(received, [f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()])
+                continue
+            messages = _column_errors(spec, obj)
+            if messages:
+                report(received, messages)
+                continue
+            batch.append(_to_record(spec, received, obj))
+        if batch:
+            await pg.copy_records_to_table(_STAGING, records=batch, columns=["row_no", *spec.columns])
+        if parse_error is not None:
+            raise HTTPException(
+                status_code=400, detail=f"Unreadable {format} upload at row {received + 1}: {parse_error}"
+            )
+        if not chunk:
+            break
+
+    # Drop rows whose foreign keys point nowhere, reporting each one
+    for column, ref_table in spec.foreign_keys.items():
+        bad = await db.execute(
+            text(
+                f"DELETE FROM {_STAGING} s WHERE s.{column} IS NOT NULL "
+                f"AND NOT EXISTS (SELECT 1 FROM {ref_table} r WHERE r.id = s.{column}) "
+                f"RETURNING s.row_no, s.{column}"
+            )
+        )
+        for row_no, value in bad.all():
+            report(row_no, [f"{column}: {ref_table} {value} does not exist"])
+
+    if spec.unique_columns:
+        await _merge_unique(db, spec, report)
+    else:
+        cols = ", ".join(spec.insert_columns)
+        await db.execute(
+            text(f"INSERT INTO {spec.table.name} ({cols}) SELECT {cols} FROM {_STAGING} ORDER BY row_no")
+        )
+
+    if spec.after_merge:
+        await db.execute(text(spec.after_merge))
+    await db.commit()
+    if entity == "products":
+        catalogue_cache.invalidate()
+    return {
+        "entity": entity,
+        "received": received,
+        "imported": received - error_count,
+        "failed": error_count,
+        "errors": sorted(errors, key=lambda e: e["row"]),
+        "errors_truncated": error_count > len(errors),
+    }
@@ -1,8 +1,12 @@
+from collections import defaultdict
+from typing import Sequence
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import Integer, column, func, insert, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_read_db
 from app.models import Order, OrderItem, Product, Shipment
 from app.schemas import (
     OrderCreate,
@@ -13,6 +17,12 @@ from app.schemas import (
     ShipmentResponse,
     ShipmentUpdate,
 )
+from app.utils.analytics import record_order, record_status_change
+from app.utils.conditional import Conditional
+from app.utils.discounts import discount_index
+from app.utils.inventory import withdraw_inventory
+from app.utils.pagination import Page
+from app.utils.serialization import FastJSONResponse
 from app.routers.deps import require_admin, require_customer
 
 router = APIRouter(prefix="/orders", tags=["orders"])
@@ -22,14 +32,36 @@ ship_router = APIRouter(prefix="/shipments", tags=["shipments"])
 # ── Admin: list all orders ────────────────────────────────────────────────────
 
 @router.get("/", response_model=list[OrderResponse])
-async def list_orders(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    result = await db.execute(select(Order))
-    orders = result.scalars().all()
-    return [await _build_order_response(o, db) for o in orders]
+async def list_orders(
+    page: Page = Depends(),
+    cond: Conditional = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    _=Depends(require_admin),
+):
+    not_modified = await cond.collection(db, page.apply(select(Order.id, Order.updated_at), Order.id))
+    if not_modified:
+        return not_modified
+    if settings.fast_serialization:
+        result = await db.execute(page.apply(select(*_ORDER_COLUMNS), Order.id))
+        payloads = await _order_payloads(page.paginate(result.all()), db)
+        return FastJSONResponse(payloads, headers={**page.headers, **cond.headers})
+    result = await db.execute(page.apply(select(Order), Order.id))
+    orders = page.paginate(result.scalars().all())
+    return await build_order_responses(orders, db)
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
-async def get_order(order_id: int, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+async def get_order(
+    order_id: int, cond: Conditional = Depends(), db: AsyncSession = Depends(get_db), _=Depends(require_admin)
+):
+    not_modified = await cond.item(db, select(Order.updated_at).where(Order.id == order_id))
+    if not_modified:
+        return not_modified
+    if settings.fast_serialization:
+        row = (await db.execute(select(*_ORDER_COLUMNS).where(Order.id == order_id))).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Order not found")
+        return FastJSONResponse((await _order_payloads([row], db))[0], headers=cond.headers)
     result = await db.execute(select(Order).where(Order.id == order_id))
     order = result.scalar_one_or_none()
     if not order:
@@ -44,10 +76,23 @@ async def update_order_status(
     db: AsyncSession = Depends(get_db),
     _=Depends(require_admin),
 ):
-    result = await db.execute(select(Order).where(Order.id == order_id))
+    # Row lock so concurrent transitions see a consistent previous status for the sales rollup
+    result = await db.execute(select(Order).where(Order.id == order_id).with_for_update())
     order = result.scalar_one_or_none()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
+    if payload.store_id is not None and payload.status == "shipped" and order.status != "shipped":
+        items = await db.execute(
+            select(OrderItem.product_id, func.sum(OrderItem.quantity))
+            .where(OrderItem.order_id == order.id)
+            .group_by(OrderItem.product_id)
+        )
+        short = await withdraw_inventory(db, payload.store_id, dict(items.all()))
+        if short:
+            raise HTTPException(
+                status_code=409, detail=f"Store {payload.store_id} has insufficient stock for product {min(short)}"
+            )
+    await record_status_change(db, order.id, order.status, payload.status)
     order.status = payload.status
     await db.commit()
     await db.refresh(order)
@@ -62,45 +107,106 @@ async def place_order(
     db: AsyncSession = Depends(get_db),
     current=Depends(require_customer),
 ):
-    total = 0.0
-    order = Order(
-        customer_id=current["user_id"],
-        shipping_address=payload.shipping_address,
-        branch_id=payload.branch_id,
-        total_amount=0.0,
-        status="pending",
-    )
-    db.add(order)
-    await db.flush()  # get order.id
+    if not payload.items:
+        raise HTTPException(status_code=400, detail="Order must contain at least one item")
+    wanted: dict[int, int] = defaultdict(int)
+    for item in payload.items:
+        wanted[item.product_id] += item.quantity
 
+    # Discounts are resolved server-side; a client-sent value must match the active one
+    await discount_index.ensure_fresh(db)
+    discounts = {pid: discount_index.resolve(pid) for pid in wanted}
     for item in payload.items:
-        product_result = await db.execute(select(Product).where(Product.id == item.product_id))
-        product = product_result.scalar_one_or_none()
-        if not product:
-            raise HTTPException(status_code=404, detail=f"Product {item.product_id} not found")
-        unit_price = float(product.price)
-        total += unit_price * item.quantity * (1 - item.discount_pct / 100)
-        db.add(
-            OrderItem(
-                order_id=order.id,
-                product_id=item.product_id,
-                quantity=item.quantity,
-                unit_price=unit_price,
-                discount_pct=item.discount_pct,
+        if "discount_pct" in item.model_fields_set and item.discount_pct != discounts[item.product_id]:
+            raise HTTPException(
+                status_code=400, detail=f"Discount for product {item.product_id} does not match the active discount"
             )
+
+    # Lock every product in the cart in id order (deadlock-free across concurrent checkouts)
+    product_result = await db.execute(
+        select(Product.id, Product.name, Product.price, Product.category_id)
+        .where(Product.id.in_(list(wanted)))
+        .order_by(Product.id)
+        .with_for_update()
+    )
+    products = {row.id: row for row in product_result.all()}
+    missing = [pid for pid in wanted if pid not in products]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Product {missing[0]} not found")
+
+    cart = values(column("product_id", Integer), column("quantity", Integer), name="cart").data(
+        list(wanted.items())
+    )
+    decremented = await db.execute(
+        update(Product)
+        .where(Product.id == cart.c.product_id, Product.stock_quantity >= cart.c.quantity)
+        .values(stock_quantity=Product.stock_quantity - cart.c.quantity)
+        .returning(Product.id)
+        .execution_options(synchronize_session=False)
+    )
+    short = set(wanted) - set(decremented.scalars().all())
+    if short:
+        raise HTTPException(status_code=409, detail=f"Insufficient stock for product {min(short)}")
+
+    total = 0.0
+    item_rows = []
+    for item in payload.items:
+        unit_price = float(products[item.product_id].price)
+        discount_pct = discounts[item.product_id]
+        total += unit_price * item.quantity * (1 - discount_pct / 100)
+        item_rows.append(
+            {
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "unit_price": unit_price,
+                "discount_pct": discount_pct,
+                "category_id": products[item.product_id].category_id,
+            }
         )
 
-    order.total_amount = round(total, 2)
+    order = await db.scalar(
+        insert(Order)
+        .values(
+            customer_id=current["user_id"],
+            shipping_address=payload.shipping_address,
+            branch_id=payload.branch_id,
+            total_amount=round(total, 2),
+            status="pending",
+        )
+        .returning(Order)
+    )
+    for row in item_rows:
+        row["order_id"] = order.id
+    order_items = (await db.scalars(insert(OrderItem).returning(OrderItem), item_rows)).all()
+    await record_order(db, order.id)
     await db.commit()
-    await db.refresh(order)
-    return await _build_order_response(order, db)
+
+    items = []
+    for oi in order_items:
+        ir = OrderItemResponse.model_validate(oi)
+        ir.product_name = products[oi.product_id].name
+        items.append(ir)
+    return _order_response(order, items)
 
 
 @router.get("/me/orders", response_model=list[OrderResponse])
-async def my_orders(db: AsyncSession = Depends(get_db), current=Depends(require_customer)):
-    result = await db.execute(select(Order).where(Order.customer_id == current["user_id"]))
-    orders = result.scalars().all()
-    return [await _build_order_response(o, db) for o in orders]
+async def my_orders(
+    page: Page = Depends(),
+    cond: Conditional = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current=Depends(require_customer),
+):
+    mine = Order.customer_id == current["user_id"]
+    not_modified = await cond.collection(db, page.apply(select(Order.id, Order.updated_at).where(mine), Order.id))
+    if not_modified:
+        return not_modified
+    if settings.fast_serialization:
+        result = await db.execute(page.apply(select(*_ORDER_COLUMNS).where(mine), Order.id))
+        payloads = await _order_payloads(page.paginate(result.all()), db)
+        return FastJSONResponse(payloads, headers={**page.headers, **cond.headers})
+    result = await db.execute(page.apply(select(Order).where(mine), Order.id))
+    orders = page.paginate(result.scalars().all())
+    return await build_order_responses(orders, db)
 
 
 # ── Shipments ─────────────────────────────────────────────────────────────────
@@ -144,18 +250,29 @@ async def update_shipment(
 # ── Helper ────────────────────────────────────────────────────────────────────
 
 async def _build_order_response(order: Order, db: AsyncSession) -> OrderResponse:
-    items_result = await db.execute(
-        select(OrderItem, Product.name.label("product_name"))
-        .outerjoin(Product)
-        .where(OrderItem.order_id == order.id)
-    )
-    item_rows = items_result.all()
-    items = []
-    for oi, prod_name in item_rows:
-        ir = OrderItemResponse.model_validate(oi)
-        ir.product_name = prod_name
-        items.append(ir)
+    return (await build_order_responses([order], db))[0]
+
+
+async def build_order_responses(orders: Sequence[Order], db: AsyncSession) -> list[OrderResponse]:
+    """Hydrate many orders with their items using a single OrderItem query."""
+    items_by_order: dict[int, list[OrderItemResponse]] = defaultdict(list)
+    order_ids = [o.id for o in orders]
+    if order_ids:
+        items_result = await db.execute(
+            select(OrderItem, Product.name.label("product_name"))
+            .outerjoin(Product)
+            .where(OrderItem.order_id.in_(order_ids))
+            .order_by(OrderItem.order_id, OrderItem.id)
+        )
+        for oi, prod_name in items_result.all():
+            ir = OrderItemResponse.model_validate(oi)
+            ir.product_name = prod_name
+            items_by_order[oi.order_id].append(ir)
+
+    return [_order_response(order, items_by_order.get(order.id, [])) for order in orders]
+
 
+def _order_response(order: Order, items: list[OrderItemResponse]) -> OrderResponse:
     return OrderResponse(
         id=order.id,
         customer_id=order.customer_id,
@@ -166,3 +283,64 @@ async def _build_order_response(order: Order, db: AsyncSession) -> OrderResponse
         branch_id=order.branch_id,
         items=items,
     )
+
+
+# ── Fast path (settings.fast_serialization) ───────────────────────────────────
+
+_ORDER_COLUMNS = (
+    Order.id,
+    Order.customer_id,
+    Order.order_date,
+    Order.status,
+    Order.total_amount,
+    Order.shipping_address,
+    Order.branch_id,
+)
+
+
+async def _order_payloads(orders: Sequence, db: AsyncSession) -> list[dict]:
+    """build_order_responses from Core rows: OrderResponse-shaped dicts without model validation."""
+    items_by_order: dict[int, list[dict]] = defaultdict(list)
+    order_ids = [o.id for o in orders]
+    if order_ids:
+        items_result = await db.execute(
+            select(
+                OrderItem.order_id,
+                OrderItem.id,
+                OrderItem.product_id,
+                Product.name.label("product_name"),
+                OrderItem.quantity,
+                OrderItem.unit_price,
+                OrderItem.discount_pct,
+            )
+            .outerjoin(Product, OrderItem.product_id == Product.id)
+            .where(OrderItem.order_id.in_(order_ids))
+            .order_by(OrderItem.order_id, OrderItem.id)
+        )
+        for r in items_result.all():
+            items_by_order[r.order_id].append(_order_item_payload(r))
+    return [_order_payload(o, items_by_order.get(o.id, [])) for o in orders]
+
+
+def _order_item_payload(r) -> dict:
+    return {
+        "id": r.id,
+        "product_id": r.product_id,
+        "product_name": r.product_name,
+        "quantity": r.quantity,
+        "unit_price": float(r.unit_price),
+        "discount_pct": float(r.discount_pct),
+    }
+
+
+def _order_payload(o, items: list[dict]) -> dict:
+    return {
+        "id": o.id,
+        "customer_id": o.customer_id,
+        "order_date": o.order_date,
+        "status": o.status,
+        "total_amount": float(o.total_amount) if o.total_amount else None,
+        "shipping_address": o.shipping_address,
+        "branch_id": o.branch_id,
+        "items": items,
+    }
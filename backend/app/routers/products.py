@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import settings
+from app.database import AsyncSessionLocal, get_db, get_read_db, read_session_factory
 from app.models import Category, Discount, Product
 from app.schemas import (
     CategoryCreate,
@@ -13,19 +18,118 @@ from app.schemas import (
     ProductResponse,
     ProductUpdate,
 )
+from app.utils.cache import ResponseCache
+from app.utils.conditional import ETAG_HEADER, Conditional
+from app.utils.discounts import discount_index, discounted_price
+from app.utils.pagination import Page
+from app.utils.search import ranked_search
+from app.utils.serialization import FastJSONResponse
 from app.routers.deps import require_admin
 
 router = APIRouter(prefix="/products", tags=["products"])
 cat_router = APIRouter(prefix="/categories", tags=["categories"])
 disc_router = APIRouter(prefix="/discounts", tags=["discounts"])
 
+# Rendered JSON for the public catalogue routes; invalidated on every catalogue write
+catalogue_cache = ResponseCache(settings.catalogue_cache_max_bytes, settings.catalogue_cache_ttl)
+
+
+async def get_catalogue_db():
+    """Session for the cached catalogue reads.
+
+    Like get_read_db, but uses the primary for a while after a catalogue
+    write on this worker: a replica may not have replayed the write yet, and
+    whatever the refill reads is cached for the TTL. A replica is only used
+    while its lag, probed at most REPLICA_CHECK_INTERVAL ago, is within
+    REPLICA_MAX_LAG_SECONDS, so that sum bounds how stale it can be.
+    """
+    window = settings.replica_max_lag_seconds + settings.replica_check_interval
+    if catalogue_cache.invalidated_within(window):
+        session_factory = AsyncSessionLocal
+    else:
+        session_factory = await read_session_factory()
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def _cached_response(key: tuple) -> Response | None:
+    hit = catalogue_cache.get(key)
+    if hit is None:
+        return None
+    body, headers = hit
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _cache_response(key: tuple, version: int, content, headers: dict | None = None) -> Response:
+    if settings.fast_serialization:
+        response = FastJSONResponse(content, headers=headers)
+    else:
+        response = JSONResponse(content=jsonable_encoder(content), headers=headers)
+    catalogue_cache.set(key, response.body, headers, version=version)
+    return response
+
+
+def _apply_discount(p: ProductResponse) -> ProductResponse:
+    p.discount_pct = discount_index.resolve(p.id)
+    p.discounted_price = discounted_price(p.price, p.discount_pct)
+    return p
+
+
+async def _written_product(db: AsyncSession, product: Product) -> ProductResponse:
+    """Response for a product just created or updated, shaped like the read paths."""
+    await discount_index.ensure_fresh(db)
+    p = ProductResponse.model_validate(product)
+    if product.category_id is not None:
+        p.category_name = await db.scalar(select(Category.name).where(Category.id == product.category_id))
+    return _apply_discount(p)
+
+
+# Core columns for the fast path, selected instead of the Product entity
+_PRODUCT_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.description,
+    Product.price,
+    Product.stock_quantity,
+    Product.category_id,
+    Category.name.label("category_name"),
+    Product.image_url,
+)
+
+
+def _product_payload(row) -> dict:
+    """ProductResponse as a plain dict (same keys, order and values) from a Core row."""
+    price = float(row.price)
+    discount_pct = discount_index.resolve(row.id)
+    return {
+        "id": row.id,
+        "name": row.name,
+        "description": row.description,
+        "price": price,
+        "stock_quantity": row.stock_quantity,
+        "category_id": row.category_id,
+        "category_name": row.category_name,
+        "image_url": row.image_url,
+        "discount_pct": discount_pct,
+        "discounted_price": discounted_price(price, discount_pct),
+    }
+
 
 # ── Categories ────────────────────────────────────────────────────────────────
 
 @cat_router.get("/", response_model=list[CategoryResponse])
-async def list_categories(db: AsyncSession = Depends(get_db)):
+async def list_categories(db: AsyncSession = Depends(get_catalogue_db)):
+    key = ("categories",)
+    cached = _cached_response(key)
+    if cached:
+        return cached
+    version = catalogue_cache.version
     result = await db.execute(select(Category))
-    return result.scalars().all()
+    categories = [CategoryResponse.model_validate(c) for c in result.scalars().all()]
+    return _cache_response(key, version, categories)
 
 
 @cat_router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
@@ -34,6 +138,7 @@ async def create_category(payload: CategoryCreate, db: AsyncSession = Depends(ge
     db.add(cat)
     await db.commit()
     await db.refresh(cat)
+    catalogue_cache.invalidate()
     return cat
 
 
@@ -43,21 +148,47 @@ async def create_category(payload: CategoryCreate, db: AsyncSession = Depends(ge
 async def list_products(
     category_id: int = Query(None),
     search: str = Query(None),
-    db: AsyncSession = Depends(get_db),
+    page: Page = Depends(),
+    cond: Conditional = Depends(),
+    db: AsyncSession = Depends(get_catalogue_db),
 ):
-    q = select(Product, Category.name.label("category_name")).outerjoin(Category)
+    # Keyed by day too: discounted prices change when the date rolls over
+    key = ("products", date.today(), category_id, search, page.limit, page.cursor)
+    cached = _cached_response(key)
+    if cached:
+        return cond.not_modified(cached.headers.get(ETAG_HEADER)) or cached
+    version = catalogue_cache.version
+    await discount_index.ensure_fresh(db)
+    fast = settings.fast_serialization
+    if fast:
+        q = select(*_PRODUCT_COLUMNS).outerjoin(Category, Product.category_id == Category.id)
+    else:
+        q = select(Product, Category.name.label("category_name")).outerjoin(Category)
+    ids = select(Product.id, Product.updated_at)
     if category_id:
         q = q.where(Product.category_id == category_id)
+        ids = ids.where(Product.category_id == category_id)
+    keys = id_keys = (Product.id,)
     if search:
-        q = q.where(Product.name.ilike(f"%{search}%"))
-    result = await db.execute(q)
-    rows = result.all()
+        columns = [Product.name, Product.description]
+        q, keys = ranked_search(q, search, columns, Product.id)
+        ids, id_keys = ranked_search(ids, search, columns, Product.id)
+    not_modified = await cond.collection(
+        db, page.apply(ids, *id_keys), date.today(), discount_index.fingerprint, private=False
+    )
+    if not_modified:
+        return not_modified
+    result = await db.execute(page.apply(q, *keys))
+    rows = page.paginate(result.all(), entity=(lambda r: r) if fast or search else (lambda r: r[0]))
+    headers = {**page.headers, **cond.headers}
+    if fast:
+        return _cache_response(key, version, [_product_payload(r) for r in rows], headers)
     products = []
-    for product, cat_name in rows:
+    for product, cat_name, *_ in rows:
         p = ProductResponse.model_validate(product)
         p.category_name = cat_name
-        products.append(p)
-    return products
+        products.append(_apply_discount(p))
+    return _cache_response(key, version, products, headers)
 
 
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
@@ -66,11 +197,34 @@ async def create_product(payload: ProductCreate, db: AsyncSession = Depends(get_
     db.add(product)
     await db.commit()
     await db.refresh(product)
-    return product
+    catalogue_cache.invalidate()
+    return await _written_product(db, product)
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
-async def get_product(product_id: int, db: AsyncSession = Depends(get_db)):
+async def get_product(product_id: int, cond: Conditional = Depends(), db: AsyncSession = Depends(get_catalogue_db)):
+    key = ("product", date.today(), product_id)
+    cached = _cached_response(key)
+    if cached:
+        return cond.not_modified(cached.headers.get(ETAG_HEADER)) or cached
+    version = catalogue_cache.version
+    await discount_index.ensure_fresh(db)
+    not_modified = await cond.item(
+        db, select(Product.updated_at).where(Product.id == product_id),
+        date.today(), discount_index.fingerprint, private=False,
+    )
+    if not_modified:
+        return not_modified
+    if settings.fast_serialization:
+        result = await db.execute(
+            select(*_PRODUCT_COLUMNS)
+            .outerjoin(Category, Product.category_id == Category.id)
+            .where(Product.id == product_id)
+        )
+        row = result.first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return _cache_response(key, version, _product_payload(row), cond.headers)
     result = await db.execute(
         select(Product, Category.name.label("category_name"))
         .outerjoin(Category)
@@ -82,7 +236,7 @@ async def get_product(product_id: int, db: AsyncSession = Depends(get_db)):
     product, cat_name = row
     p = ProductResponse.model_validate(product)
     p.category_name = cat_name
-    return p
+    return _cache_response(key, version, _apply_discount(p), cond.headers)
 
 
 @router.put("/{product_id}", response_model=ProductResponse)
@@ -95,7 +249,8 @@ async def update_product(product_id: int, payload: ProductUpdate, db: AsyncSessi
         setattr(product, k, v)
     await db.commit()
     await db.refresh(product)
-    return product
+    catalogue_cache.invalidate()
+    return await _written_product(db, product)
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -106,14 +261,15 @@ async def delete_product(product_id: int, db: AsyncSession = Depends(get_db), _=
         raise HTTPException(status_code=404, detail="Product not found")
     await db.delete(product)
     await db.commit()
+    catalogue_cache.invalidate()
 
 
 # ── Discounts ─────────────────────────────────────────────────────────────────
 
 @disc_router.get("/", response_model=list[DiscountResponse])
-async def list_discounts(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    result = await db.execute(select(Discount))
-    return result.scalars().all()
+async def list_discounts(page: Page = Depends(), db: AsyncSession = Depends(get_read_db), _=Depends(require_admin)):
+    result = await db.execute(page.apply(select(Discount), Discount.id))
+    return page.paginate(result.scalars().all())
 
 
 @disc_router.post("/", response_model=DiscountResponse, status_code=status.HTTP_201_CREATED)
@@ -122,6 +278,8 @@ async def create_discount(payload: DiscountCreate, db: AsyncSession = Depends(ge
     db.add(disc)
     await db.commit()
     await db.refresh(disc)
+    discount_index.invalidate()
+    catalogue_cache.invalidate()
     return disc
 
 
@@ -133,3 +291,5 @@ async def delete_discount(disc_id: int, db: AsyncSession = Depends(get_db), _=De
         raise HTTPException(status_code=404, detail="Discount not found")
     await db.delete(disc)
     await db.commit()
+    discount_index.invalidate()
+    catalogue_cache.invalidate()
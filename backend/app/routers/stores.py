@@ -1,10 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models import Store, Supply
-from app.schemas import StoreCreate, StoreResponse, SupplyCreate, SupplyResponse
+from app.database import get_db, get_read_db
+from app.models import Store, StoreInventory, Supply
+from app.schemas import (
+    StockTake,
+    StockTakeResult,
+    StoreCreate,
+    StoreInventoryResponse,
+    StoreResponse,
+    SupplyCreate,
+    SupplyResponse,
+)
+from app.utils.inventory import apply_inventory_deltas, reconcile_stocktake, withdraw_inventory
+from app.utils.pagination import Page
 from app.routers.deps import require_admin
 
 store_router = APIRouter(prefix="/stores", tags=["stores"])
@@ -14,9 +25,9 @@ supply_router = APIRouter(prefix="/supply", tags=["supply"])
 # ── Stores ────────────────────────────────────────────────────────────────────
 
 @store_router.get("/", response_model=list[StoreResponse])
-async def list_stores(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    result = await db.execute(select(Store))
-    return result.scalars().all()
+async def list_stores(page: Page = Depends(), db: AsyncSession = Depends(get_read_db), _=Depends(require_admin)):
+    result = await db.execute(page.apply(select(Store), Store.id))
+    return page.paginate(result.scalars().all())
 
 
 @store_router.post("/", response_model=StoreResponse, status_code=status.HTTP_201_CREATED)
@@ -60,28 +71,97 @@ async def delete_store(store_id: int, db: AsyncSession = Depends(get_db), _=Depe
     await db.commit()
 
 
+# ── Store inventory ───────────────────────────────────────────────────────────
+
+@store_router.get("/{store_id}/inventory", response_model=list[StoreInventoryResponse])
+async def list_store_inventory(
+    store_id: int,
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    _=Depends(require_admin),
+):
+    q = select(StoreInventory).where(StoreInventory.store_id == store_id)
+    result = await db.execute(page.apply(q, StoreInventory.product_id))
+    return page.paginate(result.scalars().all())
+
+
+@store_router.get("/{store_id}/inventory/{product_id}", response_model=StoreInventoryResponse)
+async def get_store_inventory(store_id: int, product_id: int, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    result = await db.execute(
+        select(StoreInventory).where(StoreInventory.store_id == store_id, StoreInventory.product_id == product_id)
+    )
+    row = result.scalar_one_or_none()
+    if not row:
+        return StoreInventoryResponse(store_id=store_id, product_id=product_id, quantity=0)
+    return row
+
+
+@store_router.post("/{store_id}/stocktake", response_model=StockTakeResult)
+async def stocktake(store_id: int, payload: StockTake, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    result = await db.execute(select(Store.id).where(Store.id == store_id))
+    if not result.scalar_one_or_none():
+        raise HTTPException(status_code=404, detail="Store not found")
+    counts = {c.product_id: c.quantity for c in payload.counts}
+    if len(counts) != len(payload.counts):
+        raise HTTPException(status_code=400, detail="Each product may appear only once in a stock-take")
+    try:
+        counted, zeroed = await reconcile_stocktake(db, store_id, counts)
+        await db.commit()
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail="Stock-take references an unknown product")
+    return StockTakeResult(store_id=store_id, counted=counted, zeroed=zeroed)
+
+
 # ── Supply ────────────────────────────────────────────────────────────────────
 
 @supply_router.get("/", response_model=list[SupplyResponse])
-async def list_supply(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    result = await db.execute(select(Supply))
-    return result.scalars().all()
+async def list_supply(page: Page = Depends(), db: AsyncSession = Depends(get_read_db), _=Depends(require_admin)):
+    result = await db.execute(page.apply(select(Supply), Supply.id))
+    return page.paginate(result.scalars().all())
 
 
 @supply_router.post("/", response_model=SupplyResponse, status_code=status.HTTP_201_CREATED)
 async def create_supply(payload: SupplyCreate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     supply = Supply(**payload.model_dump())
     db.add(supply)
+    await apply_inventory_deltas(db, [(supply.store_id, supply.product_id, supply.quantity)])
     await db.commit()
     await db.refresh(supply)
     return supply
 
 
+@supply_router.post("/batch", response_model=list[SupplyResponse], status_code=status.HTTP_201_CREATED)
+async def ingest_supply_batch(
+    payload: list[SupplyCreate],
+    db: AsyncSession = Depends(get_db),
+    _=Depends(require_admin),
+):
+    """Record a delivery manifest: one bulk insert plus one inventory upsert."""
+    if not payload:
+        return []
+    try:
+        result = await db.scalars(insert(Supply).returning(Supply), [p.model_dump() for p in payload])
+        supplies = result.all()
+        await apply_inventory_deltas(db, [(p.store_id, p.product_id, p.quantity) for p in payload])
+        await db.commit()
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail="Manifest references an unknown product or store")
+    return supplies
+
+
 @supply_router.delete("/{supply_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_supply(supply_id: int, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    result = await db.execute(select(Supply).where(Supply.id == supply_id))
+    # Row lock so two deletes of the same delivery cannot both take its stock back out
+    result = await db.execute(select(Supply).where(Supply.id == supply_id).with_for_update())
     supply = result.scalar_one_or_none()
     if not supply:
         raise HTTPException(status_code=404, detail="Supply record not found")
+    if await withdraw_inventory(db, supply.store_id, {supply.product_id: supply.quantity}):
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"Store {supply.store_id} no longer holds the {supply.quantity} units of product "
+            f"{supply.product_id} this delivery added",
+        )
     await db.delete(supply)
     await db.commit()
@@ -0,0 +1,24 @@
+"""Operational telemetry for sizing and monitoring the API workers."""
+from fastapi import APIRouter, Depends
+
+from app.database import pool_status
+from app.routers.deps import require_admin, token_cache
+from app.routers.products import catalogue_cache
+from app.utils.ratelimit import admission_stats
+
+router = APIRouter(prefix="/system", tags=["system"])
+
+
+@router.get("/db-pool")
+async def db_pool(_=Depends(require_admin)):
+    return pool_status()
+
+
+@router.get("/caches")
+async def caches(_=Depends(require_admin)):
+    return {"token": token_cache.stats(), "catalogue": catalogue_cache.stats()}
+
+
+@router.get("/admission")
+async def admission(_=Depends(require_admin)):
+    return admission_stats()
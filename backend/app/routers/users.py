@@ -2,19 +2,21 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import User
 from app.schemas import UserCreate, UserResponse, ChangePassword
-from app.utils import hash_password, verify_password
+from app.utils import hash_password_async, verify_password_async
+from app.utils.pagination import Page
+from app.utils.ratelimit import Admission, auth_guard
 from app.routers.deps import require_admin
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/", response_model=list[UserResponse])
-async def list_users(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    result = await db.execute(select(User))
-    return result.scalars().all()
+async def list_users(page: Page = Depends(), db: AsyncSession = Depends(get_read_db), _=Depends(require_admin)):
+    result = await db.execute(page.apply(select(User), User.id))
+    return page.paginate(result.scalars().all())
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -27,7 +29,7 @@ async def create_user(payload: UserCreate, db: AsyncSession = Depends(get_db), _
         raise HTTPException(status_code=400, detail="Email already exists")
     user = User(
         username=payload.username,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
         email=payload.email,
         role=payload.role,
     )
@@ -52,11 +54,14 @@ async def change_password(
     data: ChangePassword,
     db: AsyncSession = Depends(get_db),
     current=Depends(require_admin),
+    guard: Admission = Depends(auth_guard),
 ):
+    await guard.account("admin", f"id:{current['user_id']}")
     result = await db.execute(select(User).where(User.id == current["user_id"]))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(data.current_password, user.password_hash):
+    if not user or not await verify_password_async(data.current_password, user.password_hash):
+        await guard.failed()
         raise HTTPException(status_code=400, detail="Current password is incorrect")
-    user.password_hash = hash_password(data.new_password)
+    user.password_hash = await hash_password_async(data.new_password)
     await db.commit()
     return {"message": "Password changed successfully"}
@@ -1,7 +1,10 @@
+import re
 from datetime import date, datetime
 from typing import Literal, Optional
 
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, EmailStr, field_validator, model_validator
+
+_BCRYPT_HASH = re.compile(r"\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}")
 
 
 # ── Auth ──────────────────────────────────────────────────────────────────────
@@ -113,6 +116,17 @@ class EmployeeCreate(BaseModel):
     branch_id: Optional[int] = None
 
 
+class EmployeeImport(EmployeeCreate):
+    # A manager in the same upload has no id yet, so it can be named by email instead
+    manager_email: Optional[EmailStr] = None
+
+    @model_validator(mode='after')
+    def one_manager_reference(self) -> 'EmployeeImport':
+        if self.manager_id is not None and self.manager_email is not None:
+            raise ValueError('Give manager_id or manager_email, not both')
+        return self
+
+
 class EmployeeUpdate(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
@@ -144,6 +158,23 @@ class EmployeeResponse(BaseModel):
         from_attributes = True
 
 
+class OrgMember(EmployeeResponse):
+    depth: int
+
+
+class OrgLevel(BaseModel):
+    depth: int
+    headcount: int
+
+
+class OrgSubtreeResponse(BaseModel):
+    root_id: int
+    headcount: int  # everyone below the root
+    depth: int  # deepest level below the root
+    levels: list[OrgLevel]
+    employees: list[OrgMember]
+
+
 # ── Customer ──────────────────────────────────────────────────────────────────
 
 class CustomerCreate(BaseModel):
@@ -163,6 +194,24 @@ class CustomerCreate(BaseModel):
         return v
 
 
+class CustomerImport(BaseModel):
+    username: str
+    password_hash: str
+    first_name: str
+    last_name: str
+    email: EmailStr
+    phone: Optional[str] = None
+    address: Optional[str] = None
+
+    @field_validator('password_hash')
+    @classmethod
+    def bcrypt_hash(cls, v: str) -> str:
+        # Imports carry hashes exported from the old system; hashing plaintext here would cost ~250 ms a row
+        if not _BCRYPT_HASH.fullmatch(v):
+            raise ValueError('Must be a bcrypt hash ($2b$...)')
+        return v
+
+
 class CustomerUpdate(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
@@ -230,6 +279,8 @@ class ProductResponse(BaseModel):
     category_id: Optional[int] = None
     category_name: Optional[str] = None
     image_url: Optional[str] = None
+    discount_pct: float = 0.0
+    discounted_price: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -297,6 +348,40 @@ class SupplyResponse(BaseModel):
         from_attributes = True
 
 
+# ── Store inventory ───────────────────────────────────────────────────────────
+
+class StoreInventoryResponse(BaseModel):
+    store_id: int
+    product_id: int
+    quantity: int
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class StockCount(BaseModel):
+    product_id: int
+    quantity: int
+
+    @field_validator('quantity')
+    @classmethod
+    def quantity_non_negative(cls, v: int) -> int:
+        if v < 0:
+            raise ValueError('Quantity cannot be negative')
+        return v
+
+
+class StockTake(BaseModel):
+    counts: list[StockCount]
+
+
+class StockTakeResult(BaseModel):
+    store_id: int
+    counted: int
+    zeroed: int
+
+
 # ── Order ─────────────────────────────────────────────────────────────────────
 
 class OrderItemCreate(BaseModel):
@@ -304,6 +389,13 @@ class OrderItemCreate(BaseModel):
     quantity: int
     discount_pct: float = 0.0
 
+    @field_validator('quantity')
+    @classmethod
+    def quantity_positive(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError('Quantity must be at least 1')
+        return v
+
 
 class OrderItemResponse(BaseModel):
     id: int
@@ -325,6 +417,8 @@ class OrderCreate(BaseModel):
 
 class OrderStatusUpdate(BaseModel):
     status: Literal['pending', 'confirmed', 'shipped', 'delivered', 'cancelled']
+    # Fulfilling store: its inventory is drawn down when the order moves to 'shipped'
+    store_id: Optional[int] = None
 
 
 class OrderResponse(BaseModel):
@@ -370,3 +464,40 @@ class ShipmentResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# ── Dashboard ─────────────────────────────────────────────────────────────────
+
+class LowStockProduct(BaseModel):
+    id: int
+    name: str
+    stock_quantity: int
+
+
+class DashboardSummaryResponse(BaseModel):
+    products: int
+    customers: int
+    employees: int
+    orders: int
+    revenue: float
+    orders_by_status: dict[str, int]
+    low_stock: list[LowStockProduct]
+    recent_orders: list[OrderResponse]
+    refreshed_at: Optional[datetime] = None
+
+
+# ── Analytics ─────────────────────────────────────────────────────────────────
+
+class SalesPoint(BaseModel):
+    day: date
+    orders: Optional[int] = None  # only without category/product filters
+    units: int
+    revenue: float
+
+
+class TopSeller(BaseModel):
+    id: int
+    name: Optional[str] = None
+    orders: Optional[int] = None  # branch dimension only, without category/product filters
+    units: int
+    revenue: float
@@ -0,0 +1,112 @@
+"""Incremental maintenance and backfill of the sales rollups.
+
+Every order that is not cancelled contributes units and revenue to one
+sales_daily row per (day, branch, category, product), and one to the order
+count in sales_orders_daily per (day, branch); orders are counted there so
+an order with several products is never counted twice. The category is the
+one snapshotted on order_items at checkout, so a later recategorisation
+cannot make a cancel subtract from a different row than checkout added to.
+
+Checkout adds its order's contribution in the same transaction, a move into
+or out of ``cancelled`` subtracts or re-adds it, and ``rebuild_range``
+recomputes whole days from orders/order_items for backfills (see
+scripts/rebuild_sales_rollup.py). Both hold a per-day advisory lock until
+commit, shared for the increments and exclusive for a rebuild, so a rebuild
+waits for in-flight orders of that day and is never undone by one.
+"""
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_FACTS_SELECT = """
+    SELECT o.order_date::date AS day,
+           COALESCE(o.branch_id, 0) AS branch_id,
+           COALESCE(oi.category_id, 0) AS category_id,
+           oi.product_id,
+           {sign} * sum(oi.quantity) AS units,
+           {sign} * sum(round(oi.unit_price * oi.quantity * (1 - COALESCE(oi.discount_pct, 0) / 100), 2)) AS revenue
+    FROM orders o
+    JOIN order_items oi ON oi.order_id = o.id
+    WHERE {where}
+    GROUP BY 1, 2, 3, 4
+"""
+
+_UPSERT = """
+    INSERT INTO sales_daily (day, branch_id, category_id, product_id, units, revenue)
+    {select}
+    ON CONFLICT (day, branch_id, category_id, product_id) DO UPDATE SET
+        units = sales_daily.units + EXCLUDED.units,
+        revenue = sales_daily.revenue + EXCLUDED.revenue
+"""
+
+_ORDERS_UPSERT = """
+    INSERT INTO sales_orders_daily (day, branch_id, orders)
+    SELECT o.order_date::date, COALESCE(o.branch_id, 0), {sign} * count(*)
+    FROM orders o
+    WHERE {where}
+    GROUP BY 1, 2
+    ON CONFLICT (day, branch_id) DO UPDATE SET orders = sales_orders_daily.orders + EXCLUDED.orders
+"""
+
+# Arbitrary constant identifying the rollup among advisory locks; the second key is the day
+_ADVISORY_LOCK_KEY = 727_002
+_DAY_NUMBER = "{day} - DATE '2000-01-01'"
+
+_LOCK_ORDER_DAY = text(
+    "SELECT pg_advisory_xact_lock_shared(:key, "
+    f"(SELECT {_DAY_NUMBER.format(day='order_date::date')} FROM orders WHERE id = :order_id))"
+)
+_LOCK_DAY = text(f"SELECT pg_advisory_xact_lock(:key, {_DAY_NUMBER.format(day='CAST(:start AS date)')})")
+
+_ONE_ORDER = "o.id = :order_id"
+_LIVE_IN_RANGE = "o.order_date >= :start AND o.order_date < :end AND o.status <> 'cancelled'"
+
+_ADD_ORDER = (
+    text(_UPSERT.format(select=_FACTS_SELECT.format(sign=1, where=_ONE_ORDER))),
+    text(_ORDERS_UPSERT.format(sign=1, where=_ONE_ORDER)),
+)
+_REMOVE_ORDER = (
+    text(_UPSERT.format(select=_FACTS_SELECT.format(sign=-1, where=_ONE_ORDER))),
+    text(_ORDERS_UPSERT.format(sign=-1, where=_ONE_ORDER)),
+)
+_REBUILD_RANGE = (
+    text("DELETE FROM sales_daily WHERE day >= :start AND day < :end"),
+    text("DELETE FROM sales_orders_daily WHERE day >= :start AND day < :end"),
+    text(_UPSERT.format(select=_FACTS_SELECT.format(sign=1, where=_LIVE_IN_RANGE))),
+    text(_ORDERS_UPSERT.format(sign=1, where=_LIVE_IN_RANGE)),
+)
+
+
+async def record_order(db: AsyncSession, order_id: int) -> None:
+    """Add an order's lines to the rollup; call before the order's transaction commits."""
+    await db.execute(_LOCK_ORDER_DAY, {"key": _ADVISORY_LOCK_KEY, "order_id": order_id})
+    for statement in _ADD_ORDER:
+        await db.execute(statement, {"order_id": order_id})
+
+
+async def record_status_change(db: AsyncSession, order_id: int, old_status: str, new_status: str) -> None:
+    if old_status == new_status:
+        return
+    if new_status == "cancelled":
+        statements = _REMOVE_ORDER
+    elif old_status == "cancelled":
+        statements = _ADD_ORDER
+    else:
+        return
+    await db.execute(_LOCK_ORDER_DAY, {"key": _ADVISORY_LOCK_KEY, "order_id": order_id})
+    for statement in statements:
+        await db.execute(statement, {"order_id": order_id})
+
+
+async def rebuild_range(db: AsyncSession, start: date, end: date) -> int:
+    """Recompute [start, end) one day per transaction so locks stay short; returns days rebuilt."""
+    day = start
+    while day < end:
+        params = {"start": day, "end": day + timedelta(days=1)}
+        await db.execute(_LOCK_DAY, {"key": _ADVISORY_LOCK_KEY, "start": day})
+        for statement in _REBUILD_RANGE:
+            await db.execute(statement, params)
+        await db.commit()
+        day += timedelta(days=1)
+    return (end - start).days
@@ -0,0 +1,138 @@
+"""Small in-process caches: an expiring LRU and a versioned response-body cache."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """Bounded LRU mapping; entries may carry an absolute expiry (epoch seconds).
+
+    Safe to share between the event loop and FastAPI's threadpool, which is
+    where sync dependencies run.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[Any, Optional[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.time():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class ResponseCache:
+    """Versioned cache of rendered response bodies, bounded by total bytes.
+
+    ``invalidate()`` bumps the version and drops every entry, so a write can
+    never be followed by a stale read on this worker. Entries also expire
+    after ``ttl`` seconds, which bounds staleness across workers/replicas
+    that did not see the write. ``invalidated_within`` tells callers that a
+    write happened recently, e.g. to fill from the primary while a replica
+    may still be replaying it.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version = 0
+        self.invalidated_at: Optional[float] = None
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[Hashable, tuple[bytes, dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[tuple[bytes, dict]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                body, headers, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return body, headers
+                self._drop(key)
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, body: bytes, headers: Optional[dict] = None, version: Optional[int] = None) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            # A write that raced with this read already bumped the version
+            if version is not None and version != self.version:
+                return
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (body, headers or {}, time.monotonic() + self.ttl)
+            self.bytes_used += len(body)
+            while self.bytes_used > self.max_bytes:
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.version += 1
+            self.invalidated_at = time.monotonic()
+            self._data.clear()
+            self.bytes_used = 0
+
+    def invalidated_within(self, seconds: float) -> bool:
+        return self.invalidated_at is not None and time.monotonic() - self.invalidated_at < seconds
+
+    def _drop(self, key: Hashable) -> None:
+        body, _, _ = self._data.pop(key)
+        self.bytes_used -= len(body)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "version": self.version,
+            "entries": len(self._data),
+            "bytes_used": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,80 @@
+"""Conditional GET: ETag / Last-Modified validators from one aggregate over the rows a request returns."""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ETAG_HEADER = "ETag"
+
+
+class Conditional:
+    """FastAPI dependency evaluating conditional request headers for one GET."""
+
+    def __init__(self, request: Request, response: Response):
+        self.request = request
+        self.response = response
+        self.headers: dict[str, str] = {}
+
+    async def collection(
+        self, db: AsyncSession, q: Select, *extra: Any, private: bool = True
+    ) -> Optional[Response]:
+        """``q`` selects ``(id, updated_at)`` with the endpoint's filters and paging applied."""
+        rows = q.subquery()
+        count, last_modified, id_sum = (
+            await db.execute(select(func.count(), func.max(rows.c.updated_at), func.sum(rows.c.id)))
+        ).one()
+        return self._evaluate((count, last_modified, id_sum, *extra), last_modified, private, item=False)
+
+    async def item(self, db: AsyncSession, q: Select, *extra: Any, private: bool = True) -> Optional[Response]:
+        """``q`` selects the row's ``updated_at``; a missing row is left to the endpoint's 404."""
+        row = (await db.execute(q)).first()
+        if row is None:
+            return None
+        return self._evaluate((row[0], *extra), row[0], private, item=True)
+
+    def not_modified(self, etag: Optional[str]) -> Optional[Response]:
+        """304 for a cached body whose stored ETag the client already holds."""
+        if etag and self._matches(etag):
+            return Response(status_code=304, headers={ETAG_HEADER: etag})
+        return None
+
+    def _matches(self, etag: str) -> bool:
+        header = self.request.headers.get("if-none-match")
+        if header is None:
+            return False
+        if header.strip() == "*":
+            return True
+        # Weak comparison (RFC 9110 §13.1.2): ignore the W/ prefix on both sides
+        wanted = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+    def _evaluate(
+        self, parts: tuple, last_modified: Optional[datetime], private: bool, item: bool
+    ) -> Optional[Response]:
+        digest = hashlib.blake2b(
+            repr((self.request.url.path, str(self.request.query_params), *parts)).encode(), digest_size=12
+        ).hexdigest()
+        etag = f'W/"{digest}"'
+        headers = {ETAG_HEADER: etag, "Cache-Control": "private, no-cache" if private else "no-cache"}
+        if last_modified is not None:
+            # DateTime columns are naive and written by the database in UTC
+            last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+        self.headers = headers
+        self.response.headers.update(headers)
+
+        if "if-none-match" in self.request.headers:
+            if self._matches(etag):
+                return Response(status_code=304, headers=headers)
+        elif item and last_modified is not None:
+            since = self.request.headers.get("if-modified-since")
+            try:
+                if since and last_modified <= parsedate_to_datetime(since):
+                    return Response(status_code=304, headers=headers)
+            except (TypeError, ValueError):
+                pass
+        return None
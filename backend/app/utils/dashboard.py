@@ -0,0 +1,88 @@
+"""Scheduled refresh of the dashboard_summary rollup.
+
+Counting millions of rows per dashboard open is what made the admin
+dashboard slow, so the aggregates are recomputed in one statement every
+``dashboard_refresh_seconds`` by a background task and the endpoint reads
+a single row. A transaction-level advisory lock plus a freshness check
+keep replicas and workers from refreshing concurrently.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant identifying the refresh job among advisory locks
+_ADVISORY_LOCK_KEY = 727_001
+
+_REFRESH_SQL = text(
+    """
+    INSERT INTO dashboard_summary
+        (id, products, customers, employees, orders, revenue, orders_by_status, low_stock, refreshed_at)
+    SELECT
+        1,
+        (SELECT count(*) FROM products),
+        (SELECT count(*) FROM customers),
+        (SELECT count(*) FROM employees),
+        (SELECT count(*) FROM orders),
+        (SELECT COALESCE(sum(total_amount), 0) FROM orders WHERE status <> 'cancelled'),
+        (SELECT COALESCE(jsonb_object_agg(status, n), '{}'::jsonb)
+           FROM (SELECT status, count(*) AS n FROM orders GROUP BY status) s),
+        (SELECT COALESCE(jsonb_agg(jsonb_build_object('id', id, 'name', name, 'stock_quantity', stock_quantity)
+                                   ORDER BY stock_quantity, id), '[]'::jsonb)
+           FROM (SELECT id, name, stock_quantity FROM products
+                 WHERE stock_quantity <= :threshold ORDER BY stock_quantity, id LIMIT :low_stock_limit) p),
+        now()
+    ON CONFLICT (id) DO UPDATE SET
+        products = EXCLUDED.products,
+        customers = EXCLUDED.customers,
+        employees = EXCLUDED.employees,
+        orders = EXCLUDED.orders,
+        revenue = EXCLUDED.revenue,
+        orders_by_status = EXCLUDED.orders_by_status,
+        low_stock = EXCLUDED.low_stock,
+        refreshed_at = EXCLUDED.refreshed_at
+    """
+)
+
+
+async def refresh_summary(db: AsyncSession, force: bool = False) -> bool:
+    """Recompute the rollup unless another worker holds the lock or did it recently."""
+    locked = (await db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})).scalar()
+    if not locked:
+        await db.rollback()
+        return False
+    if not force:
+        fresh = (
+            await db.execute(
+                text("SELECT 1 FROM dashboard_summary WHERE refreshed_at > now() - make_interval(secs => :secs)"),
+                {"secs": settings.dashboard_refresh_seconds / 2},
+            )
+        ).scalar()
+        if fresh:
+            await db.rollback()
+            return False
+    await db.execute(
+        _REFRESH_SQL,
+        {"threshold": settings.low_stock_threshold, "low_stock_limit": settings.low_stock_limit},
+    )
+    await db.commit()
+    return True
+
+
+async def run_refresher() -> None:
+    """Background loop started from the app lifespan."""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await refresh_summary(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Dashboard summary refresh failed")
+        await asyncio.sleep(settings.dashboard_refresh_seconds)
@@ -0,0 +1,90 @@
+"""In-memory interval index of product discounts used by checkout and the catalogue."""
+import asyncio
+import hashlib
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Discount
+
+
+class DiscountIndex:
+    """Per-product timeline of the effective discount, resolved by binary search.
+
+    Each product maps to sorted breakpoints and the discount in force from
+    that day until the next breakpoint (the highest pct when discounts
+    overlap, 0 in gaps). The index is rebuilt on the next lookup after
+    ``invalidate()``, after the date rolls over, or after ``ttl`` seconds so
+    workers that did not see a discount write still converge.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._starts: dict[int, list[date]] = {}
+        self._pcts: dict[int, list[float]] = {}
+        self._built_on: date | None = None
+        self._built_at = 0.0
+        self.fingerprint = ""  # content hash, identical on every worker that loaded the same rows
+        self._stale = True
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def _needs_rebuild(self) -> bool:
+        return self._stale or self._built_on != date.today() or time.monotonic() - self._built_at > self.ttl
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        if not self._needs_rebuild():
+            return
+        async with self._lock:
+            if self._needs_rebuild():
+                await self._rebuild(db)
+
+    async def _rebuild(self, db: AsyncSession) -> None:
+        today = date.today()
+        self._stale = False
+        try:
+            result = await db.execute(
+                select(Discount.product_id, Discount.start_date, Discount.end_date, Discount.discount_pct)
+                .where(Discount.end_date >= today)
+            )
+        except Exception:
+            self._stale = True
+            raise
+        by_product: dict[int, list[tuple[date, date, float]]] = defaultdict(list)
+        for product_id, start, end, pct in result.all():
+            by_product[product_id].append((start, end, float(pct)))
+
+        starts: dict[int, list[date]] = {}
+        pcts: dict[int, list[float]] = {}
+        for product_id, intervals in by_product.items():
+            # end dates are inclusive, so a discount stops applying the day after
+            bounds = sorted({s for s, _, _ in intervals} | {e + timedelta(days=1) for _, e, _ in intervals})
+            starts[product_id] = bounds
+            pcts[product_id] = [
+                max((p for s, e, p in intervals if s <= b <= e), default=0.0) for b in bounds
+            ]
+        self._starts, self._pcts = starts, pcts
+        self.fingerprint = hashlib.blake2b(repr(sorted(pcts.items())).encode() + repr(sorted(starts.items())).encode(), digest_size=8).hexdigest()
+        self._built_on = today
+        self._built_at = time.monotonic()
+
+    def resolve(self, product_id: int, day: date | None = None) -> float:
+        starts = self._starts.get(product_id)
+        if not starts:
+            return 0.0
+        i = bisect_right(starts, day or date.today()) - 1
+        return self._pcts[product_id][i] if i >= 0 else 0.0
+
+
+def discounted_price(price: float, discount_pct: float) -> float:
+    return round(price * (1 - discount_pct / 100), 2)
+
+
+discount_index = DiscountIndex(settings.discount_index_ttl)
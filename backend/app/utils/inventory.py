@@ -0,0 +1,87 @@
+"""Incremental maintenance of store_inventory (one row per store and product)."""
+from collections import defaultdict
+from typing import Iterable
+
+from sqlalchemy import Integer, column, func, text, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import StoreInventory
+
+
+async def apply_inventory_deltas(db: AsyncSession, deltas: Iterable[tuple[int, int, int]]) -> None:
+    """Add ``(store_id, product_id, quantity)`` deltas in one upsert, inside the caller's transaction."""
+    totals: dict[tuple[int, int], int] = defaultdict(int)
+    for store_id, product_id, quantity in deltas:
+        totals[(store_id, product_id)] += quantity
+    if not totals:
+        return
+    # ON CONFLICT may touch each row once per statement, hence the aggregation above
+    stmt = insert(StoreInventory).values(
+        [{"store_id": s, "product_id": p, "quantity": q} for (s, p), q in sorted(totals.items())]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StoreInventory.store_id, StoreInventory.product_id],
+        set_={"quantity": StoreInventory.quantity + stmt.excluded.quantity, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
+
+
+async def withdraw_inventory(db: AsyncSession, store_id: int, quantities: dict[int, int]) -> set[int]:
+    """Atomically take stock out of one store; returns the product ids that were short.
+
+    Nothing is decremented for a short product, and the caller is expected
+    to roll back the transaction when the returned set is non-empty.
+    """
+    if not quantities:
+        return set()
+    wanted = values(column("product_id", Integer), column("quantity", Integer), name="wanted").data(
+        sorted(quantities.items())
+    )
+    result = await db.execute(
+        update(StoreInventory)
+        .where(
+            StoreInventory.store_id == store_id,
+            StoreInventory.product_id == wanted.c.product_id,
+            StoreInventory.quantity >= wanted.c.quantity,
+        )
+        .values(quantity=StoreInventory.quantity - wanted.c.quantity, updated_at=func.now())
+        .returning(StoreInventory.product_id)
+        .execution_options(synchronize_session=False)
+    )
+    return set(quantities) - set(result.scalars().all())
+
+
+_STOCKTAKE_SQL = text(
+    """
+    WITH counted AS (
+        INSERT INTO store_inventory (store_id, product_id, quantity)
+        SELECT :store_id, c.product_id, c.quantity
+        FROM unnest(CAST(:product_ids AS integer[]), CAST(:quantities AS integer[])) AS c(product_id, quantity)
+        ON CONFLICT (store_id, product_id)
+        DO UPDATE SET quantity = EXCLUDED.quantity, updated_at = now()
+        RETURNING product_id
+    ), zeroed AS (
+        UPDATE store_inventory SET quantity = 0, updated_at = now()
+        WHERE store_id = :store_id AND quantity <> 0
+          AND product_id <> ALL (CAST(:product_ids AS integer[]))
+        RETURNING product_id
+    )
+    SELECT (SELECT count(*) FROM counted) AS counted, (SELECT count(*) FROM zeroed) AS zeroed
+    """
+)
+
+
+async def reconcile_stocktake(db: AsyncSession, store_id: int, counts: dict[int, int]) -> tuple[int, int]:
+    """Replace a store's inventory with a full physical count in a single statement.
+
+    Products missing from ``counts`` are set to zero. Returns (counted, zeroed).
+    """
+    product_ids = list(counts)
+    row = (
+        await db.execute(
+            _STOCKTAKE_SQL,
+            {"store_id": store_id, "product_ids": product_ids, "quantities": [counts[p] for p in product_ids]},
+        )
+    ).one()
+    return row.counted, row.zeroed
@@ -0,0 +1,162 @@
+"""Per-route request metrics rendered in the Prometheus text exposition format.
+
+``MetricsMiddleware`` is a plain ASGI middleware: per request it does one
+``perf_counter`` pair, a bisect into the latency buckets and a few integer
+additions on a per-route record, with no locks (the event loop is single
+threaded). Routes are labelled by their path template (``/api/orders/{order_id}``),
+so label cardinality is bounded by the route table; requests that match no
+route share the ``unmatched`` label.
+"""
+import time
+from bisect import bisect_left
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import database
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED = "unmatched"
+
+
+class _RouteStats:
+    __slots__ = ("buckets", "duration_sum", "count", "errors", "statuses", "bytes_sum")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot is +Inf
+        self.duration_sum = 0.0
+        self.count = 0
+        self.errors = 0
+        self.statuses: dict[str, int] = {}
+        self.bytes_sum = 0
+
+
+class Metrics:
+    def __init__(self):
+        self.routes: dict[tuple[str, str], _RouteStats] = {}
+        self.in_flight = 0
+
+    def observe(self, method: str, route: str, status: int, seconds: float, size: int) -> None:
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[(method, route)] = _RouteStats()
+        stats.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        stats.duration_sum += seconds
+        stats.count += 1
+        status_class = f"{status // 100}xx"
+        stats.statuses[status_class] = stats.statuses.get(status_class, 0) + 1
+        if status >= 500:
+            stats.errors += 1
+        stats.bytes_sum += size
+
+    def render(self) -> str:
+        lines = [
+            "# HELP http_requests_total Requests handled, by route and status class.",
+            "# TYPE http_requests_total counter",
+        ]
+        routes = sorted(self.routes.items())
+        for (method, route), s in routes:
+            for status_class, n in sorted(s.statuses.items()):
+                lines.append(f'http_requests_total{{{_labels(method, route)},status="{status_class}"}} {n}')
+        lines += [
+            "# HELP http_request_errors_total Requests that failed with a 5xx or an unhandled exception.",
+            "# TYPE http_request_errors_total counter",
+        ]
+        lines += [f"http_request_errors_total{{{_labels(m, r)}}} {s.errors}" for (m, r), s in routes]
+        lines += [
+            "# HELP http_request_duration_seconds Time to the last response byte.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), s in routes:
+            labels = _labels(method, route)
+            cumulative = 0
+            for bound, n in zip((*LATENCY_BUCKETS, "+Inf"), s.buckets):
+                cumulative += n
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {s.duration_sum:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {s.count}")
+        lines += [
+            "# HELP http_response_size_bytes Response body bytes sent.",
+            "# TYPE http_response_size_bytes summary",
+        ]
+        for (method, route), s in routes:
+            labels = _labels(method, route)
+            lines.append(f"http_response_size_bytes_sum{{{labels}}} {s.bytes_sum}")
+            lines.append(f"http_response_size_bytes_count{{{labels}}} {s.count}")
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+        lines += _pool_lines()
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, route: str) -> str:
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}"'
+
+
+_POOL_GAUGES = (
+    ("db_pool_size", "gauge", "Configured pool size.", "size"),
+    ("db_pool_checked_out", "gauge", "Connections currently checked out.", "checked_out"),
+    ("db_pool_checked_in", "gauge", "Idle connections in the pool.", "checked_in"),
+    ("db_pool_overflow", "gauge", "Connections open beyond the pool size.", "overflow"),
+    ("db_pool_checkouts_total", "counter", "Pool checkouts.", "checkouts"),
+    ("db_pool_checkout_timeouts_total", "counter", "Checkouts that hit the pool timeout.", "timeouts"),
+)
+
+
+def _pool_lines() -> list[str]:
+    pools = {"primary": database.engine.pool}
+    if database.replica_engine is not None:
+        pools["replica"] = database.replica_engine.pool
+    statuses = {pool_name: database._pool_status(pool) for pool_name, pool in pools.items()}
+    lines = []
+    for name, kind, help_text, key in _POOL_GAUGES:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for pool_name, status in statuses.items():
+            lines.append(f'{name}{{pool="{pool_name}"}} {status[key]}')
+    lines += [
+        "# HELP db_pool_wait_seconds_total Time spent waiting for a pool checkout.",
+        "# TYPE db_pool_wait_seconds_total counter",
+    ]
+    for pool_name, pool in pools.items():
+        lines.append(f'db_pool_wait_seconds_total{{pool="{pool_name}"}} {pool.wait_stats.total_seconds:.6f}')
+    return lines
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        metrics = self.metrics
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            status = 500
+            raise
+        finally:
+            metrics.in_flight -= 1
+            route = getattr(scope.get("route"), "path", UNMATCHED)
+            metrics.observe(scope["method"], route, status, time.perf_counter() - start, size)
+
+
+metrics = Metrics()
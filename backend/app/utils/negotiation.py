@@ -0,0 +1,222 @@
+"""Response content negotiation: MessagePack bodies and gzip/brotli encoding.
+
+Both are plain ASGI middlewares so they also cover responses that bypass
+FastAPI's encoder (cached catalogue bytes, FastJSONResponse, streaming
+exports). ``MessagePackMiddleware`` re-encodes JSON bodies for clients that
+prefer ``application/msgpack``; the document structure is unchanged, so the
+response schemas are the same in both formats. ``CompressionMiddleware``
+runs outside it and compresses any compressible body above a size threshold.
+"""
+import gzip
+import json
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - JSON only
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+_COMPRESSIBLE = ("application/json", "application/x-ndjson", "application/msgpack", "text/")
+
+
+def _qvalues(header: str) -> dict[str, float]:
+    """Parse an Accept / Accept-Encoding header into {token: q}."""
+    values: dict[str, float] = {}
+    for part in header.split(","):
+        token, *params = (p.strip() for p in part.split(";"))
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        values[token.lower()] = q
+    return values
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported content coding, preferring brotli over gzip at equal q."""
+    offered = _qvalues(accept_encoding)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = offered.get(coding, offered.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def wants_msgpack(accept: str) -> bool:
+    if msgpack is None or not accept:
+        return False
+    offered = _qvalues(accept)
+    packed = max((offered.get(t, 0.0) for t in MSGPACK_TYPES), default=0.0)
+    return packed > 0 and packed >= offered.get("application/json", 0.0)
+
+
+def json_to_msgpack(body: bytes) -> bytes:
+    return msgpack.packb(orjson.loads(body) if orjson is not None else json.loads(body), use_bin_type=True)
+
+
+def _add_vary(headers: MutableHeaders, value: str) -> None:
+    existing = headers.get("vary")
+    if not existing:
+        headers["Vary"] = value
+    elif value.lower() not in existing.lower():
+        headers["Vary"] = f"{existing}, {value}"
+
+
+class MessagePackMiddleware:
+    """Re-encode buffered JSON responses as MessagePack when the client asks for it."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        packed = wants_msgpack(Headers(scope=scope).get("accept", ""))
+        start: Optional[Message] = None
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if headers.get("content-type", "").startswith("application/json"):
+                    _add_vary(headers, "Accept")
+                    if packed:
+                        start = message
+                        return
+                passthrough = True
+                await send(message)
+                return
+            if passthrough or start is None:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = json_to_msgpack(b"".join(chunks)) if any(chunks) else b""
+            headers = MutableHeaders(scope=start)
+            headers["Content-Type"] = MSGPACK_TYPES[0]
+            headers["Content-Length"] = str(len(body))
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class _Encoder:
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int):
+        if coding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+            self._gz = None
+        else:
+            self._br = None
+            # wbits 16 + MAX_WBITS writes a gzip header and trailer
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self._br is not None:
+            return self._br.process(data) + self._br.flush()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self._br is not None:
+            return self._br.process(data) + self._br.finish()
+        return self._gz.compress(data) + self._gz.flush()
+
+
+def compress(body: bytes, coding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    """gzip/brotli per Accept-Encoding for compressible bodies of at least ``minimum_size`` bytes.
+
+    Single-body responses are compressed in one call; streaming responses
+    (exports) are compressed chunk by chunk with a flush per chunk so
+    clients still receive rows as they are produced.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+
+        start: Optional[Message] = None
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                compressible = headers.get("content-type", "").startswith(_COMPRESSIBLE)
+                if compressible:
+                    # Caches must key on Accept-Encoding even when this client got identity
+                    _add_vary(headers, "Accept-Encoding")
+                if coding is None or "content-encoding" in headers or not compressible:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            if passthrough or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(scope=start)
+            if encoder is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                headers["Content-Encoding"] = coding
+                if not more_body:
+                    body = compress(body, coding, self.gzip_level, self.brotli_quality)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    passthrough = True
+                    return
+                del headers["Content-Length"]
+                encoder = _Encoder(coding, self.gzip_level, self.brotli_quality)
+                await send(start)
+            data = encoder.chunk(body) if more_body else encoder.finish(body)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
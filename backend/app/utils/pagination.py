@@ -0,0 +1,97 @@
+"""Keyset (cursor) pagination shared by the list endpoints."""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import Select, tuple_
+
+from app.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values], default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _coerce(value: Any, column) -> Any:
+    python_type = column.type.python_type
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type in (date, datetime):
+        return python_type.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(str(value))
+    return python_type(value)
+
+
+class Page:
+    """FastAPI dependency carrying ``limit``/``cursor`` for a keyset-paginated list.
+
+    Rows are ordered on the given key columns (the last one must be unique,
+    normally the primary key) and each page starts strictly after the cursor,
+    so page N is an index range scan just like page 1. The opaque cursor for
+    the following page is returned in the ``X-Next-Cursor`` response header.
+    Omitting ``limit`` returns ``DEFAULT_PAGE_SIZE`` rows, so no request
+    scans a whole table.
+    """
+
+    def __init__(
+        self,
+        response: Response,
+        limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+        cursor: Optional[str] = Query(None),
+    ):
+        self.response = response
+        self.limit = limit
+        self.cursor = cursor
+        self._keys: tuple = ()
+
+    def apply(self, q: Select, *keys) -> Select:
+        self._keys = keys
+        if self.cursor:
+            values = decode_cursor(self.cursor)
+            if len(values) != len(keys):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            try:
+                values = [_coerce(v, col) for v, col in zip(values, keys)]
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            if len(keys) == 1:
+                q = q.where(keys[0] > values[0])
+            else:
+                q = q.where(tuple_(*keys) > tuple_(*values))
+        return q.order_by(*keys).limit(self.limit + 1)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Cursor header for endpoints that return a Response object directly."""
+        cursor = self.response.headers.get(NEXT_CURSOR_HEADER)
+        return {NEXT_CURSOR_HEADER: cursor} if cursor else {}
+
+    def paginate(self, rows: Sequence, entity: Callable[[Any], Any] = lambda r: r) -> list:
+        """Trim the look-ahead row and publish the next cursor, if any."""
+        rows = list(rows)
+        if len(rows) <= self.limit:
+            return rows
+        rows = rows[: self.limit]
+        last = entity(rows[-1])
+        self.response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(last, col.key) for col in self._keys]
+        )
+        return rows
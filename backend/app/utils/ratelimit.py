@@ -0,0 +1,194 @@
+"""Admission control for the bcrypt-backed auth routes: IP and account token buckets, a concurrency cap."""
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Optional, Protocol
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import text
+
+from app import database
+from app.config import settings
+
+
+class BucketBackend(Protocol):
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Take one token: 0.0 if granted, else seconds until one is available."""
+
+    async def wait(self, key: str, rate: float, burst: int) -> float:
+        """Seconds until a token is available (0.0 if one is), without taking it."""
+
+
+class MemoryBuckets:
+    """Token buckets in an LRU dict; no locking, the event loop is single threaded."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        entry = self._buckets.get(key)
+        if entry is None:
+            tokens = float(burst)
+        else:
+            tokens, updated = entry
+            tokens = min(float(burst), tokens + (now - updated) * rate)
+            self._buckets.move_to_end(key)
+        wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+        self._buckets[key] = (tokens - 1 if wait == 0.0 else tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    async def wait(self, key: str, rate: float, burst: int) -> float:
+        entry = self._buckets.get(key)
+        if entry is None:
+            return 0.0
+        tokens, updated = entry
+        tokens = min(float(burst), tokens + (time.monotonic() - updated) * rate)
+        return 0.0 if tokens >= 1 else (1 - tokens) / rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Tokens in a stored bucket after refilling up to now
+_REFILLED = (
+    "LEAST(CAST(:burst AS float8), "
+    "b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * CAST(:rate AS float8))"
+)
+# Refill and take in one statement; a denied take updates nothing and returns no row
+_PG_TAKE = text(
+    f"""
+    INSERT INTO rate_limit_buckets AS b (key, tokens, updated_at)
+    VALUES (:key, CAST(:burst AS float8) - 1, clock_timestamp())
+    ON CONFLICT (key) DO UPDATE SET tokens = {_REFILLED} - 1, updated_at = clock_timestamp()
+    WHERE {_REFILLED} >= 1
+    RETURNING b.tokens
+    """
+)
+_PG_WAIT = text(f"SELECT (1 - {_REFILLED}) / CAST(:rate AS float8) FROM rate_limit_buckets AS b WHERE b.key = :key")
+# Rows idle this long have refilled completely and are equivalent to no row
+_PG_PRUNE = text(
+    "DELETE FROM rate_limit_buckets WHERE updated_at < clock_timestamp() - make_interval(secs => CAST(:idle AS float8))"
+)
+
+
+class PostgresBuckets:
+    """Token buckets shared by every worker and replica on the primary database."""
+
+    def __init__(self, prune_interval: float = 60.0):
+        self.prune_interval = prune_interval
+        self._next_prune = 0.0
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        params = {"key": key, "rate": rate, "burst": burst}
+        async with database.engine.begin() as conn:
+            if (await conn.execute(_PG_TAKE, params)).first() is not None:
+                wait = 0.0
+            else:
+                wait = max(0.0, float((await conn.execute(_PG_WAIT, params)).scalar() or 0.0))
+            if time.monotonic() >= self._next_prune:
+                self._next_prune = time.monotonic() + self.prune_interval
+                idle = max(settings.auth_ip_burst / settings.auth_ip_rate,
+                           settings.auth_account_burst / settings.auth_account_rate)
+                await conn.execute(_PG_PRUNE, {"idle": idle})
+        return wait
+
+    async def wait(self, key: str, rate: float, burst: int) -> float:
+        async with database.engine.connect() as conn:
+            wait = (await conn.execute(_PG_WAIT, {"key": key, "rate": rate, "burst": burst})).scalar()
+        return max(0.0, float(wait or 0.0))
+
+
+def _make_backend() -> BucketBackend:
+    if settings.rate_limit_backend == "postgres":
+        return PostgresBuckets()
+    return MemoryBuckets(settings.rate_limit_max_keys)
+
+
+buckets: BucketBackend = _make_backend()
+_in_flight = 0
+
+
+def _too_many(wait: float, detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, int(wait + 0.999)))},
+    )
+
+
+def client_ip(request: Request) -> str:
+    if settings.rate_limit_client_ip_header:
+        forwarded = request.headers.get(settings.rate_limit_client_ip_header)
+        if forwarded:
+            # X-Forwarded-For style lists: only the right-most entry, appended by our proxy, is trustworthy
+            return forwarded.rsplit(",", 1)[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class Admission:
+    """Handed to a guarded route, which reports the account it acts on and any failed attempt."""
+
+    def __init__(self, ip: str):
+        self.ip = ip
+        self.key: Optional[str] = None
+        self.ceiling_key: Optional[str] = None
+
+    async def account(self, kind: str, name: str) -> None:
+        """Reject early if this client, or all clients together, have no attempts left for the account."""
+        if not settings.rate_limit_enabled:
+            return
+        # Case and padding variants of one username share a bucket; cap key size
+        name = name.strip().lower()[:150]
+        self.key = f"auth:{kind}:{self.ip}:{name}"
+        # Failures from any address, so guessing spread over many IPs is still bounded
+        self.ceiling_key = f"auth:{kind}:*:{name}"
+        wait = max(
+            await buckets.wait(self.key, settings.auth_account_rate, settings.auth_account_burst),
+            await buckets.wait(
+                self.ceiling_key, settings.auth_account_ceiling_rate, settings.auth_account_ceiling_burst
+            ),
+        )
+        if wait:
+            raise _too_many(wait, "Too many attempts for this account, please retry later")
+
+    async def failed(self) -> None:
+        """Debit the account buckets after a failed verification."""
+        if settings.rate_limit_enabled and self.key is not None:
+            await buckets.take(self.key, settings.auth_account_rate, settings.auth_account_burst)
+            await buckets.take(
+                self.ceiling_key, settings.auth_account_ceiling_rate, settings.auth_account_ceiling_burst
+            )
+
+
+async def auth_guard(request: Request) -> AsyncIterator[Admission]:
+    """Dependency for bcrypt-backed routes: per-IP bucket, then a per-worker concurrency slot."""
+    global _in_flight
+    ip = client_ip(request)
+    if not settings.rate_limit_enabled:
+        yield Admission(ip)
+        return
+    wait = await buckets.take(f"auth:ip:{ip}", settings.auth_ip_rate, settings.auth_ip_burst)
+    if wait:
+        raise _too_many(wait, "Too many attempts, please retry later")
+    if _in_flight >= settings.auth_max_concurrent:
+        raise _too_many(1.0, "Server busy, please retry")
+    _in_flight += 1
+    try:
+        yield Admission(ip)
+    finally:
+        _in_flight -= 1
+
+
+def admission_stats() -> dict:
+    stats = {
+        "enabled": settings.rate_limit_enabled,
+        "backend": settings.rate_limit_backend,
+        "in_flight": _in_flight,
+        "max_concurrent": settings.auth_max_concurrent,
+    }
+    if isinstance(buckets, MemoryBuckets):
+        stats["keys"] = len(buckets)
+    return stats
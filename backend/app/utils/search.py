@@ -0,0 +1,20 @@
+"""Ranked, typo-tolerant text search backed by pg_trgm GIN indexes."""
+from sqlalchemy import Float, Select, func, or_
+
+
+def ranked_search(q: Select, term: str, columns: list, id_column) -> tuple[Select, tuple]:
+    """Filter ``q`` to substring or pg_trgm word-similarity matches, best first.
+
+    Returns the query and the keyset keys to hand to ``Page.apply``.
+    """
+    term = term.strip()
+    similarities = [func.word_similarity(term, c, type_=Float) for c in columns]
+    rank = similarities[0] if len(similarities) == 1 else func.greatest(*similarities)
+    # Keys sort ascending, so order on the negated rank to get best matches first
+    search_rank = (-rank).label("search_rank")
+    search_id = id_column.label("search_id")
+    match = or_(
+        *(c.ilike(f"%{term}%") for c in columns),
+        *(c.op("%>")(term) for c in columns),
+    )
+    return q.add_columns(search_rank, search_id).where(match), (search_rank, search_id)
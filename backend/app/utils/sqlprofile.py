@@ -0,0 +1,150 @@
+"""Per-request SQL profiling, N+1 detection, the slow-query log and query budgets for tests."""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger("app.sql")
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time"
+N_PLUS_ONE_HEADER = "X-DB-N-Plus-One"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM_LIST = re.compile(r"\(\s*(?:\$\d+|\?|%\(\w+\)s)(?:\s*,\s*(?:\$\d+|\?|%\(\w+\)s))*\s*\)")
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Statement shape: literals and parameters as ``?``, IN-lists collapsed, whitespace squeezed."""
+    shape = _STRING.sub("?", statement)
+    shape = _PARAM_LIST.sub("(...)", shape)
+    shape = _PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+class QueryProfile:
+    def __init__(self, parent: Optional["QueryProfile"] = None, keep_statements: bool = False):
+        self.parent = parent
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter[str] = Counter()
+        # (statement, parameters) as sent to the driver; executemany keeps its first parameter set
+        self.statements: Optional[list[tuple[str, Any]]] = [] if keep_statements else None
+
+    def record(self, statement: str, seconds: float, parameters: Any = None) -> None:
+        profile: Optional[QueryProfile] = self
+        shape = normalize_sql(statement)
+        while profile is not None:
+            profile.count += 1
+            profile.seconds += seconds
+            profile.shapes[shape] += 1
+            if profile.statements is not None:
+                profile.statements.append((statement, parameters))
+            profile = profile.parent
+
+    def n_plus_one(self, threshold: Optional[int] = None) -> dict[str, int]:
+        """Shapes executed at least ``threshold`` times, most repeated first."""
+        threshold = threshold or settings.n_plus_one_threshold
+        return {shape: n for shape, n in self.shapes.most_common() if n >= threshold}
+
+
+_current: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    profile = _current.get()
+    if profile is not None:
+        profile.record(statement, elapsed, parameters[0] if executemany and parameters else parameters)
+    if elapsed * 1000 >= settings.slow_query_ms:
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, normalize_sql(statement))
+
+
+def _handle_error(exception_context):
+    # Keep the start-time stack balanced when a statement fails
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine) -> None:
+    """Attach the profiling listeners to an AsyncEngine (or a sync Engine)."""
+    target = getattr(engine, "sync_engine", engine)
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    event.listen(target, "handle_error", _handle_error)
+
+
+@contextmanager
+def capture_queries(keep_statements: bool = False) -> Iterator[QueryProfile]:
+    """Collect statements run in this context (and tasks it starts) into a profile."""
+    profile = QueryProfile(parent=_current.get(), keep_statements=keep_statements)
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryProfile]:
+    with capture_queries() as profile:
+        yield profile
+    if profile.count > limit:
+        shapes = "\n".join(f"  {n}x {shape}" for shape, n in profile.shapes.most_common())
+        raise AssertionError(f"{profile.count} queries executed, expected at most {limit}:\n{shapes}")
+
+
+class SQLProfilerMiddleware:
+    """Per-request profile reported in response headers (single-chunk bodies only); N+1 suspects are logged."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with capture_queries() as profile:
+            start: Optional[Message] = None
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal start
+                if message["type"] == "http.response.start":
+                    # Held back until the first body chunk shows whether the response streams
+                    start = message
+                    return
+                if start is not None:
+                    if message["type"] == "http.response.body" and not message.get("more_body", False):
+                        headers = MutableHeaders(scope=start)
+                        headers[QUERY_COUNT_HEADER] = str(profile.count)
+                        headers[QUERY_TIME_HEADER] = f"{profile.seconds * 1000:.3f}"
+                        suspects = profile.n_plus_one()
+                        if suspects:
+                            headers[N_PLUS_ONE_HEADER] = str(len(suspects))
+                    await send(start)
+                    start = None
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        for shape, n in profile.n_plus_one().items():
+            logger.warning("N+1 suspect on %s %s: %dx %s", scope["method"], scope["path"], n, shape)
@@ -0,0 +1,58 @@
+"""Payload size and encode time of the negotiated response formats.
+
+Uses the same synthetic product and order lists as bench_serialization and
+reports JSON and MessagePack bodies, each uncompressed, gzip and brotli, at
+the levels CompressionMiddleware applies:
+
+    cd backend && python -m scripts.bench_formats --rows 10000
+"""
+import argparse
+import timeit
+
+from app.config import settings
+from app.routers.orders import _order_item_payload, _order_payload
+from app.routers.products import _product_payload
+from app.utils.negotiation import brotli, compress, json_to_msgpack
+from app.utils.serialization import dumps
+from scripts.bench_serialization import _order_rows, _product_rows
+
+
+def _formats() -> dict:
+    formats = {
+        "json": lambda body: body,
+        "json+gzip": lambda body: compress(body, "gzip"),
+        "msgpack": json_to_msgpack,
+        "msgpack+gzip": lambda body: compress(json_to_msgpack(body), "gzip"),
+    }
+    if brotli is not None:
+        formats["json+br"] = lambda body: compress(body, "br", brotli_quality=settings.brotli_quality)
+        formats["msgpack+br"] = lambda body: compress(
+            json_to_msgpack(body), "br", brotli_quality=settings.brotli_quality
+        )
+    return formats
+
+
+def main(n: int, repeat: int) -> None:
+    orders, items = _order_rows(n)
+    payloads = {
+        "list_products": [_product_payload(r) for r in _product_rows(n)],
+        "list_orders": [
+            _order_payload(o, [_order_item_payload(r) for r in order_items]) for o, order_items in zip(orders, items)
+        ],
+    }
+    print(f"{'endpoint':<15}{'format':<14}{'bytes':>12}{'vs json':>9}{'encode ms':>11}")
+    for name, payload in payloads.items():
+        body = dumps(payload)
+        for fmt, encode in _formats().items():
+            size = len(encode(body))
+            # Time includes producing the JSON body, as the middleware sees it
+            ms = min(timeit.repeat(lambda: encode(dumps(payload)), number=1, repeat=repeat)) * 1000
+            print(f"{name:<15}{fmt:<14}{size:>12,}{size / len(body):>8.0%}{ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
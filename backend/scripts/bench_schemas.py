@@ -0,0 +1,226 @@
+"""Microbenchmarks for every model in app.schemas, with a tracked history.
+
+For each schema and batch size this times, per item:
+
+* ``validate`` - ``model_validate`` of decoded JSON, as for a request body
+* ``serialize`` - ``model_dump(mode="json")``, as for a response
+* ``from_orm`` - ``model_validate`` of attribute objects (``from_attributes``
+  schemas only), as the routers do with ORM rows
+
+Samples are generated from each model's field annotations, so new schemas
+are picked up without changes here. Runs need no database:
+
+    cd backend && python -m scripts.bench_schemas --save             # append to the history
+    python -m scripts.bench_schemas --compare --match Order Product  # diff against the last run
+
+``--save`` appends one JSON line per run (label, git commit, versions and
+results) to ``--history``. ``--compare`` diffs against the most recent
+entry, or the one labelled ``--against``, and exits 1 when an operation got
+slower than ``--tolerance``.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+import timeit
+import types
+import typing
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Callable, Literal, Optional, Union
+
+import pydantic
+from pydantic import BaseModel, EmailStr
+
+from app import schemas
+from app.config import settings
+
+DEFAULT_HISTORY = "benchmarks/schemas.jsonl"
+NESTED_ITEMS = 3  # e.g. items per order
+# Changes below this many microseconds per item are timer noise
+NOISE_FLOOR_US = 0.2
+
+# Field names whose generic sample would fail a validator or look unrealistic
+_STR_SAMPLES = {
+    "password": "correct-horse-7",
+    "current_password": "correct-horse-7",
+    "new_password": "battery-staple-9",
+    "status": "pending",
+    "role": "admin",
+    "token_type": "bearer",
+}
+
+
+def _schema_models() -> dict[str, type[BaseModel]]:
+    return {
+        name: obj for name, obj in vars(schemas).items()
+        if isinstance(obj, type) and issubclass(obj, BaseModel) and obj.__module__ == schemas.__name__
+    }
+
+
+def _sample(annotation: Any, name: str, i: int, orm: bool) -> Any:
+    """A realistic value for one field; Decimal for floats in ORM mode, as Numeric columns return."""
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+    if origin in (Union, types.UnionType):
+        return _sample(next(a for a in args if a is not type(None)), name, i, orm)
+    if origin is Literal:
+        return args[0]
+    if origin is list:
+        return [_sample(args[0], name, i * NESTED_ITEMS + k, orm) for k in range(NESTED_ITEMS)]
+    if origin is dict:
+        return {f"{name}_{k}": k + i for k in range(NESTED_ITEMS)}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _instance(annotation, i, orm)
+    if annotation is EmailStr:
+        return f"user{i}@example.com"
+    if annotation is bool:
+        return i % 2 == 0
+    if annotation is int:
+        return i + 1
+    if annotation is float:
+        value = Decimal(f"{i % 1000}.99")
+        return value if orm else float(value)
+    if annotation is datetime:
+        return datetime(2026, 1, 1, 12, 30, tzinfo=timezone.utc) - timedelta(minutes=i)
+    if annotation is date:
+        return date(2026, 1, 1) - timedelta(days=i % 3650)
+    if annotation is str:
+        return _STR_SAMPLES.get(name, f"{name.replace('_', ' ').title()} {i} – café")
+    raise TypeError(f"No sample for {name}: {annotation!r}")
+
+
+def _instance(model: type[BaseModel], i: int, orm: bool) -> Any:
+    # Optional fields are filled too: full rows are the realistic (and slower) case
+    fields = {name: _sample(f.annotation, name, i, orm) for name, f in model.model_fields.items()}
+    return SimpleNamespace(**fields) if orm else fields
+
+
+def _json_input(model: type[BaseModel], i: int) -> dict:
+    # Round-trip through JSON so dates arrive as strings, as they do in a request body
+    return json.loads(json.dumps(_instance(model, i, orm=False), default=str))
+
+
+def _operations(model: type[BaseModel], batch: int) -> dict[str, Callable[[], Any]]:
+    inputs = [_json_input(model, i) for i in range(batch)]
+    built = [model.model_validate(d) for d in inputs]
+    ops = {
+        "validate": lambda: [model.model_validate(d) for d in inputs],
+        "serialize": lambda: [m.model_dump(mode="json") for m in built],
+    }
+    if model.model_config.get("from_attributes"):
+        rows = [_instance(model, i, orm=True) for i in range(batch)]
+        model.model_validate(rows[0])
+        ops["from_orm"] = lambda: [model.model_validate(r) for r in rows]
+    return ops
+
+
+def run(models: dict[str, type[BaseModel]], batches: list[int], repeat: int) -> dict:
+    """``{schema: {op: {batch: us_per_item}}}``"""
+    results: dict = {}
+    for name, model in sorted(models.items()):
+        for batch in batches:
+            # Small batches loop more per timing so the clock resolution does not dominate
+            number = max(1, 1000 // batch)
+            for op, fn in _operations(model, batch).items():
+                best = min(timeit.repeat(fn, number=number, repeat=repeat))
+                us = best / number / batch * 1e6
+                results.setdefault(name, {}).setdefault(op, {})[str(batch)] = round(us, 3)
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _load_history(path: str) -> list[dict]:
+    try:
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def _compare(current: dict, baseline: dict, tolerance: float) -> int:
+    regressions = 0
+    print(f"\nvs {baseline['label']} ({baseline['timestamp']}), us/item")
+    for name, ops in current.items():
+        for op, by_batch in ops.items():
+            for batch, now in by_batch.items():
+                before = baseline["results"].get(name, {}).get(op, {}).get(batch)
+                if before is None:
+                    continue
+                change = now / before - 1 if before else 0.0
+                bad = change > tolerance and now - before > NOISE_FLOOR_US
+                regressions += bad
+                if bad or abs(change) > tolerance:
+                    print(f"  {name:<26}{op:<11}{batch:>6}{before:>10.2f} -> {now:<9.2f}{change:>+7.0%}"
+                          f"{'  REGRESSION' if bad else ''}")
+    print(f"{regressions} regression(s) beyond {tolerance:.0%}")
+    return regressions
+
+
+def main(args) -> int:
+    models = _schema_models()
+    if args.match:
+        pattern = re.compile("|".join(args.match))
+        models = {name: m for name, m in models.items() if pattern.search(name)}
+    history = _load_history(args.history)
+
+    results = run(models, args.batch, args.repeat)
+    print(f"{'schema':<26}{'op':<11}" + "".join(f"{'n=' + str(b):>10}" for b in args.batch) + "   (us/item)")
+    for name, ops in results.items():
+        for op, by_batch in ops.items():
+            print(f"{name:<26}{op:<11}" + "".join(f"{by_batch[str(b)]:>10.2f}" for b in args.batch))
+
+    entry = {
+        "label": args.label or _git_commit() or "unlabelled",
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pydantic": pydantic.VERSION,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    status = 0
+    if args.compare:
+        candidates = [e for e in history if args.against in (None, e["label"])]
+        if not candidates:
+            print(f"\nNothing to compare against in {args.history}")
+        else:
+            baseline = candidates[-1]
+            if (baseline["python"], baseline["pydantic"]) != (entry["python"], entry["pydantic"]):
+                print(f"\nNote: baseline ran on Python {baseline['python']} / pydantic {baseline['pydantic']}")
+            status = 1 if _compare(results, baseline, args.tolerance) else 0
+    if args.save:
+        os.makedirs(os.path.dirname(args.history) or ".", exist_ok=True)
+        with open(args.history, "a") as f:
+            f.write(json.dumps(entry, sort_keys=True) + "\n")
+        print(f"\nAppended run {entry['label']} to {args.history}")
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--match", nargs="*", help="only schemas whose name matches one of these regexes")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, settings.default_page_size, settings.max_page_size],
+                        help="items per batch: a request body, a default page, a full page")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON-lines file of past runs")
+    parser.add_argument("--save", action="store_true", help="append this run to the history")
+    parser.add_argument("--label", help="name for this run (default: git commit)")
+    parser.add_argument("--compare", action="store_true", help="diff against a previous run; exit 1 on regressions")
+    parser.add_argument("--against", help="label of the run to compare against (default: most recent)")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown (fraction)")
+    started = time.perf_counter()
+    code = main(parser.parse_args())
+    print(f"done in {time.perf_counter() - started:.1f}s")
+    sys.exit(code)
@@ -0,0 +1,101 @@
+"""Time ranked product search at catalogue scale and fail above a latency budget.
+
+Runs the ``GET /api/products/?search=`` query for a mix of prefixes, whole
+words, typos and misses, ``--repeat`` times each after a warm-up, and
+reports the server-side execution time from ``EXPLAIN ANALYZE`` with the
+plan's index usage. ``--products`` first tops the catalogue up to that many
+rows with the seed_data generator:
+
+    docker compose up -d db
+    cd backend && python -m scripts.bench_search --products 1000000 --max-ms 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.config import settings
+from app.models import Category, Product
+from app.routers.products import _PRODUCT_COLUMNS
+from app.utils.search import ranked_search
+from scripts.seed_data import _copy, _ids, _next_id, _products
+
+# prefix as typed, whole word, typo, and a term nothing matches
+TERMS = ["lap", "lapto", "headph", "coffee", "wireless", "cmaera", "sneekers", "notebok", "zzqxv"]
+
+
+def _search_sql(term: str, limit: int) -> str:
+    q = select(*_PRODUCT_COLUMNS).outerjoin(Category, Product.category_id == Category.id)
+    q, keys = ranked_search(q, term, [Product.name, Product.description], Product.id)
+    # Page.apply fetches limit + 1
+    q = q.order_by(*keys).limit(limit + 1)
+    return str(q.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def _indexes(plan: dict):
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", []):
+        yield from _indexes(child)
+
+
+async def _top_up(db: AsyncSession, target: int, seed: int) -> None:
+    have = (await db.execute(select(func.count()).select_from(Product))).scalar()
+    if have >= target:
+        return
+    categories = await _ids(db, "categories")
+    if not categories:
+        raise SystemExit("Seed categories first (database/init.sql)")
+    started = time.perf_counter()
+    rows = _products(random.Random(seed), await _next_id(db, "products"), target - have, categories)
+    n = await _copy(db, "products", ["id", "name", "description", "price", "stock_quantity", "category_id",
+                                     "image_url"], rows)
+    await db.execute(text("ANALYZE products"))
+    await db.commit()
+    print(f"added {n:,} products in {time.perf_counter() - started:.0f}s")
+
+
+async def main(args) -> int:
+    engine = create_async_engine(settings.database_url)
+    failures = 0
+    async with AsyncSession(engine) as db:
+        if args.products:
+            await _top_up(db, args.products, args.seed)
+        total = (await db.execute(select(func.count()).select_from(Product))).scalar()
+        print(f"{total:,} products, limit {args.limit}, {args.repeat} runs per term, budget {args.max_ms} ms\n")
+        print(f"{'term':<12}{'rows':>6}{'p50 ms':>9}{'max ms':>9}  indexes")
+        for term in args.terms:
+            sql = _search_sql(term, args.limit)
+            await db.execute(text(sql))  # warm the buffer cache
+            times, plan = [], None
+            for _ in range(args.repeat):
+                raw = (await db.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"))).scalar()
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+                times.append(plan["Execution Time"])
+            p50 = statistics.median(times)
+            over = p50 > args.max_ms
+            failures += over
+            print(f"{term:<12}{plan['Plan']['Actual Rows']:>6}{p50:>9.2f}{max(times):>9.2f}  "
+                  f"{', '.join(sorted(set(_indexes(plan['Plan'])))) or 'none (seq scan)'}"
+                  f"{'  OVER BUDGET' if over else ''}")
+    await engine.dispose()
+    print(f"\n{failures} term(s) over {args.max_ms} ms")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=0, help="top the catalogue up to this many products first")
+    parser.add_argument("--seed", type=int, default=42, help="seed_data RNG seed for generated products")
+    parser.add_argument("--terms", nargs="+", default=TERMS)
+    parser.add_argument("--limit", type=int, default=settings.default_page_size, help="page size, as ?limit")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-ms", type=float, default=10.0, help="median execution time budget per term")
+    sys.exit(1 if asyncio.run(main(parser.parse_args())) else 0)
@@ -0,0 +1,105 @@
+"""Compare the standard and fast (FAST_SERIALIZATION) response paths per endpoint.
+
+Runs without a database: synthetic rows stand in for the ORM objects and
+Core rows each path receives, so only validation and encoding are timed.
+Each case also checks that both paths produce byte-identical bodies.
+
+    cd backend && python -m scripts.bench_serialization --rows 1000
+"""
+import argparse
+import sys
+import timeit
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.routers.orders import _order_item_payload, _order_payload, _order_response
+from app.routers.products import _apply_discount, _product_payload
+from app.schemas import OrderItemResponse, ProductResponse
+from app.utils.serialization import FastJSONResponse
+
+ProductRow = namedtuple(
+    "ProductRow", "id name description price stock_quantity category_id category_name image_url"
+)
+ItemRow = namedtuple("ItemRow", "order_id id product_id product_name quantity unit_price discount_pct")
+OrderRow = namedtuple("OrderRow", "id customer_id order_date status total_amount shipping_address branch_id")
+
+
+def _product_rows(n: int) -> list[ProductRow]:
+    return [
+        ProductRow(i, f"Product {i} – café", f"Description {i}", Decimal(f"{i % 500}.99"), i % 40, i % 4 + 1,
+                   "Electronics", None)
+        for i in range(1, n + 1)
+    ]
+
+
+def _order_rows(n: int, items_per_order: int = 3) -> tuple[list[OrderRow], list[list[ItemRow]]]:
+    orders, items = [], []
+    for i in range(1, n + 1):
+        orders.append(OrderRow(i, i % 97 + 1, datetime(2026, 1, 1, 12, 30, 15, i % 1000 * 1000), "pending",
+                               Decimal(f"{i}.50"), f"{i} Main St", None))
+        items.append([
+            ItemRow(i, i * 10 + k, k + 1, f"Product {k + 1}", k + 1, Decimal("9.99"), Decimal("0.00"))
+            for k in range(items_per_order)
+        ])
+    return orders, items
+
+
+def _standard_products(rows: list[ProductRow]) -> bytes:
+    products = []
+    for r in rows:
+        p = ProductResponse.model_validate(SimpleNamespace(**r._asdict()))
+        products.append(_apply_discount(p))
+    return JSONResponse(content=jsonable_encoder(products)).body
+
+
+def _fast_products(rows: list[ProductRow]) -> bytes:
+    return FastJSONResponse([_product_payload(r) for r in rows]).body
+
+
+def _standard_orders(orders: list[OrderRow], items: list[list[ItemRow]]) -> bytes:
+    responses = []
+    for o, order_items in zip(orders, items):
+        built = []
+        for r in order_items:
+            ir = OrderItemResponse.model_validate(SimpleNamespace(**r._asdict()))
+            built.append(ir)
+        responses.append(_order_response(SimpleNamespace(**o._asdict()), built))
+    # FastAPI re-validates the returned models against response_model before encoding
+    return JSONResponse(content=jsonable_encoder([r.model_dump() for r in responses])).body
+
+
+def _fast_orders(orders: list[OrderRow], items: list[list[ItemRow]]) -> bytes:
+    return FastJSONResponse(
+        [_order_payload(o, [_order_item_payload(r) for r in order_items]) for o, order_items in zip(orders, items)]
+    ).body
+
+
+def main(n: int, repeat: int) -> int:
+    products = _product_rows(n)
+    orders, items = _order_rows(n)
+    cases = {
+        "list_products": (lambda: _standard_products(products), lambda: _fast_products(products)),
+        "list_orders": (lambda: _standard_orders(orders, items), lambda: _fast_orders(orders, items)),
+    }
+    mismatches = 0
+    print(f"{'endpoint':<16}{'rows':>8}{'standard ms':>14}{'fast ms':>10}{'speedup':>9}  identical")
+    for name, (standard, fast) in cases.items():
+        same = standard() == fast()
+        mismatches += not same
+        slow_ms = min(timeit.repeat(standard, number=1, repeat=repeat)) * 1000
+        fast_ms = min(timeit.repeat(fast, number=1, repeat=repeat)) * 1000
+        print(f"{name:<16}{n:>8}{slow_ms:>14.2f}{fast_ms:>10.2f}{slow_ms / fast_ms:>8.1f}x  {'yes' if same else 'NO'}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(1 if main(args.rows, args.repeat) else 0)
@@ -0,0 +1,263 @@
+"""EXPLAIN every statement the routers issue and fail if any seq-scans a large table.
+
+Calls each endpoint in-process against a database loaded to realistic size,
+captures the SQL it runs and EXPLAINs that. Everything runs in one
+transaction that is rolled back, so writes leave no trace. Small tables are
+always seq-scanned by the planner, so they are ignored below ``--min-rows``:
+
+    cd backend && python -m scripts.explain_check --min-rows 10000
+"""
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from datetime import date, timedelta
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import database
+from app.main import app
+from app.routers import export, products
+from app.utils import create_access_token
+from app.utils.sqlprofile import capture_queries, normalize_sql
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+# Ids of existing rows the scenarios below refer to
+_FIXTURES = {
+    "admin": "SELECT id FROM users ORDER BY id LIMIT 1",
+    "customer": "SELECT COALESCE((SELECT customer_id FROM orders ORDER BY id DESC LIMIT 1), "
+                "(SELECT id FROM customers ORDER BY id LIMIT 1))",
+    "product": "SELECT id FROM products ORDER BY id LIMIT 1",
+    "category": "SELECT id FROM categories ORDER BY id LIMIT 1",
+    "branch": "SELECT id FROM branches ORDER BY id LIMIT 1",
+    "department": "SELECT id FROM departments ORDER BY id LIMIT 1",
+    "employee": "SELECT COALESCE((SELECT id FROM employees WHERE manager_id IS NOT NULL ORDER BY id DESC LIMIT 1), "
+                "(SELECT id FROM employees ORDER BY id LIMIT 1))",
+    "store": "SELECT id FROM stores ORDER BY id LIMIT 1",
+    "order": "SELECT id FROM orders ORDER BY id DESC LIMIT 1",
+    "last_sale": "SELECT COALESCE(max(day), CURRENT_DATE) FROM sales_daily",
+}
+
+# (method, path, json body, caller, fixture to store the response's id in); run in order
+_SCENARIOS = [
+    ("GET", "/api/products/?limit=50", None, None, None),
+    ("GET", "/api/products/?limit=50&category_id={category}", None, None, None),
+    ("GET", "/api/products/?limit=50&search=lapto", None, None, None),
+    ("GET", "/api/products/{product}", None, None, None),
+    ("GET", "/api/categories/", None, None, None),
+    ("POST", "/api/customers/register", {"username": "explain-{tag}", "password": "explain-check-1",
+                                         "first_name": "Ex", "last_name": "Plain",
+                                         "email": "explain-{tag}@example.test"}, None, None),
+    ("GET", "/api/customers/me/profile", None, "customer", None),
+    ("PUT", "/api/customers/me/profile", {"phone": "555-0100"}, "customer", None),
+    ("POST", "/api/orders/", {"items": [{"product_id": "{product}", "quantity": 1}]}, "customer", "new_order"),
+    ("GET", "/api/orders/me/orders?limit=50", None, "customer", None),
+    ("GET", "/api/users/?limit=50", None, "admin", None),
+    ("GET", "/api/branches/?limit=50", None, "admin", None),
+    ("GET", "/api/branches/{branch}", None, "admin", None),
+    ("POST", "/api/branches/", {"name": "Explain {tag}"}, "admin", "new_branch"),
+    ("PUT", "/api/branches/{new_branch}", {"name": "Explain {tag} 2"}, "admin", None),
+    ("DELETE", "/api/branches/{new_branch}", None, "admin", None),
+    ("GET", "/api/departments/", None, "admin", None),
+    ("POST", "/api/departments/", {"name": "Explain {tag}"}, "admin", "new_department"),
+    ("PUT", "/api/departments/{new_department}", {"name": "Explain {tag} 2"}, "admin", None),
+    ("DELETE", "/api/departments/{new_department}", None, "admin", None),
+    ("GET", "/api/employees/?limit=50", None, "admin", None),
+    ("GET", "/api/employees/?limit=50&department_id={department}", None, "admin", None),
+    ("GET", "/api/employees/?limit=50&manager_id={employee}", None, "admin", None),
+    ("GET", "/api/employees/{employee}", None, "admin", None),
+    ("GET", "/api/employees/{employee}/subtree", None, "admin", None),
+    ("GET", "/api/employees/{employee}/chain", None, "admin", None),
+    ("POST", "/api/employees/", {"first_name": "Ex", "last_name": "Plain", "email": "explain-{tag}@example.test",
+                                 "hire_date": "2026-01-01", "manager_id": "{employee}"}, "admin", "new_employee"),
+    ("PUT", "/api/employees/{new_employee}", {"job_title": "Auditor"}, "admin", None),
+    ("DELETE", "/api/employees/{new_employee}", None, "admin", None),
+    ("GET", "/api/customers/?limit=50", None, "admin", None),
+    ("GET", "/api/customers/?limit=50&search=smth", None, "admin", None),
+    ("GET", "/api/customers/{customer}", None, "admin", None),
+    ("POST", "/api/categories/", {"name": "Explain {tag}"}, "admin", None),
+    ("POST", "/api/products/", {"name": "Explain {tag}", "price": 1, "category_id": "{category}"}, "admin",
+     "new_product"),
+    ("PUT", "/api/products/{new_product}", {"price": 2}, "admin", None),
+    ("GET", "/api/discounts/?limit=50", None, "admin", None),
+    ("POST", "/api/discounts/", {"product_id": "{new_product}", "discount_pct": 10, "start_date": "{today}",
+                                 "end_date": "{today}"}, "admin", "new_discount"),
+    ("DELETE", "/api/discounts/{new_discount}", None, "admin", None),
+    ("DELETE", "/api/products/{new_product}", None, "admin", None),
+    ("GET", "/api/orders/?limit=50", None, "admin", None),
+    ("GET", "/api/orders/{order}", None, "admin", None),
+    ("GET", "/api/stores/?limit=50", None, "admin", None),
+    ("GET", "/api/stores/{store}", None, "admin", None),
+    ("POST", "/api/stores/", {"name": "Explain {tag}", "branch_id": "{branch}"}, "admin", "new_store"),
+    ("PUT", "/api/stores/{new_store}", {"name": "Explain {tag} 2"}, "admin", None),
+    ("DELETE", "/api/stores/{new_store}", None, "admin", None),
+    ("GET", "/api/stores/{store}/inventory?limit=50", None, "admin", None),
+    ("GET", "/api/stores/{store}/inventory/{product}", None, "admin", None),
+    ("GET", "/api/supply/?limit=50", None, "admin", None),
+    ("POST", "/api/supply/", {"product_id": "{product}", "store_id": "{store}", "quantity": 5,
+                              "supply_date": "{today}"}, "admin", "new_supply"),
+    ("DELETE", "/api/supply/{new_supply}", None, "admin", None),
+    ("POST", "/api/supply/batch", [{"product_id": "{product}", "store_id": "{store}", "quantity": 5,
+                                    "supply_date": "{today}"}], "admin", None),
+    ("PATCH", "/api/orders/{new_order}/status", {"status": "shipped", "store_id": "{store}"}, "admin", None),
+    ("PATCH", "/api/orders/{new_order}/status", {"status": "cancelled"}, "admin", None),
+    ("POST", "/api/shipments/", {"order_id": "{new_order}", "carrier": "Explain"}, "admin", "new_shipment"),
+    ("PATCH", "/api/shipments/{new_shipment}", {"status": "in_transit"}, "admin", None),
+    ("GET", "/api/shipments/{new_order}", None, "admin", None),
+    ("POST", "/api/stores/{store}/stocktake", {"counts": [{"product_id": "{product}", "quantity": 3}]}, "admin",
+     None),
+    ("GET", "/api/dashboard/summary", None, "admin", None),
+    ("GET", "/api/analytics/sales?start={month_ago}&end={last_sale}", None, "admin", None),
+    ("GET", "/api/analytics/sales?start={month_ago}&end={last_sale}&category_id={category}", None, "admin", None),
+    ("GET", "/api/analytics/top?dimension=product&start={month_ago}&end={last_sale}", None, "admin", None),
+    ("GET", "/api/analytics/top?dimension=category&start={month_ago}&end={last_sale}", None, "admin", None),
+    ("GET", "/api/analytics/top?dimension=branch&start={month_ago}&end={last_sale}", None, "admin", None),
+    ("GET", "/api/export/orders?since={month_ago}T00:00:00", None, "admin", None),
+    ("GET", "/api/export/order_items?format=csv", None, "admin", None),
+    ("GET", "/api/export/customers", None, "admin", None),
+    ("GET", "/api/export/products", None, "admin", None),
+]
+
+# entity -> one-row CSV upload for POST /api/import/{entity}
+_IMPORTS = {
+    "products": "name,price,category_id\nExplain {tag},1.50,{category}\n",
+    "employees": "first_name,last_name,email,hire_date,manager_id,manager_email\n"
+                 "Ex,Plain,explain-imp-{tag}@example.test,2026-01-01,{employee},\n"
+                 "Ex,Report,explain-rep-{tag}@example.test,2026-01-01,,explain-imp-{tag}@example.test\n",
+    "customers": "username,password_hash,first_name,last_name,email\nexplain-imp-{tag},"
+                 "$2b$12$" + "a" * 53 + ",Ex,Plain,explain-cust-{tag}@example.test\n",
+    "supply": "product_id,store_id,quantity,supply_date\n{product},{store},2,{today}\n",
+}
+
+
+def _fill(value, fixtures: dict):
+    """Substitute fixtures into a scenario's path or body; a lone placeholder keeps the fixture's type."""
+    if isinstance(value, str):
+        if value.startswith("{") and value.endswith("}") and value[1:-1] in fixtures:
+            return fixtures[value[1:-1]]
+        return value.format(**fixtures)
+    if isinstance(value, list):
+        return [_fill(v, fixtures) for v in value]
+    if isinstance(value, dict):
+        return {k: _fill(v, fixtures) for k, v in value.items()}
+    return value
+
+
+def _seq_scans(plan: dict):
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+def _bind_app(conn) -> None:
+    """Route every session the app opens onto ``conn``; their commits become savepoints."""
+
+    def session() -> AsyncSession:
+        return AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+
+    async def get_session():
+        async with session() as s:
+            yield s
+
+    async def session_factory():
+        return session
+
+    for dependency in (database.get_db, database.get_read_db, products.get_catalogue_db):
+        app.dependency_overrides[dependency] = get_session
+    export.read_session_factory = session_factory
+
+
+async def _explain(pg, statements: list, sizes: dict, min_rows: int, seen: set) -> list[str]:
+    """EXPLAIN each new statement shape; returns a problem line per statement that seq-scans a big table."""
+    problems = []
+    for statement, parameters in statements:
+        shape = normalize_sql(statement)
+        if shape in seen or not shape.upper().startswith(_EXPLAINABLE):
+            continue
+        seen.add(shape)
+        try:
+            # A savepoint, so a statement that cannot be explained does not abort the transaction
+            async with pg.transaction():
+                raw = await pg.fetchval(f"EXPLAIN (FORMAT JSON) {statement}", *(parameters or ()))
+        except Exception as exc:
+            problems.append(f"cannot EXPLAIN ({exc.__class__.__name__}: {exc}): {shape[:160]}")
+            continue
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+        big = sorted({t for t in _seq_scans(plan) if sizes.get(t, 0) >= min_rows})
+        if big:
+            problems.append(f"seq scan on {', '.join(big)}: {shape[:160]}")
+    return problems
+
+
+async def main(min_rows: int) -> int:
+    failures = 0
+    async with database.engine.connect() as conn:
+        outer = await conn.begin()
+        pg = (await conn.get_raw_connection()).driver_connection
+        sizes = dict(
+            (await conn.execute(text("SELECT relname, reltuples FROM pg_class WHERE relkind = 'r'"))).all()
+        )
+        fixtures = {name: (await conn.execute(text(sql))).scalar() for name, sql in _FIXTURES.items()}
+        missing = [name for name, value in fixtures.items() if value is None]
+        if missing:
+            raise SystemExit(f"Seed the database first (no rows for: {', '.join(missing)})")
+        last_sale = fixtures["last_sale"]
+        fixtures.update(tag=uuid.uuid4().hex[:8], today=date.today().isoformat(), last_sale=last_sale.isoformat(),
+                        month_ago=(last_sale - timedelta(days=30)).isoformat())
+        tokens = {
+            "admin": create_access_token({"sub": str(fixtures["admin"]), "role": "admin", "type": "admin"}),
+            "customer": create_access_token({"sub": str(fixtures["customer"]), "role": "customer",
+                                             "type": "customer"}),
+        }
+        _bind_app(conn)
+
+        requests = _SCENARIOS + [("POST", f"/api/import/{entity}", csv, "admin", None) for entity, csv in _IMPORTS.items()]
+        seen: set[str] = set()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://explain") as client:
+            for method, path, body, caller, save in requests:
+                label = f"{method} {path.split('?')[0]}"
+                try:
+                    url = _fill(path, fixtures)
+                    kwargs = {"headers": {"Authorization": f"Bearer {tokens[caller]}"} if caller else {}}
+                    if path.startswith("/api/import/"):
+                        kwargs["files"] = {"file": ("upload.csv", _fill(body, fixtures).encode())}
+                    elif body is not None:
+                        kwargs["json"] = _fill(body, fixtures)
+                except KeyError as exc:
+                    print(f"skip {label}: no {exc.args[0]} (an earlier step failed)")
+                    continue
+                with capture_queries(keep_statements=True) as profile:
+                    response = await client.request(method, url, **kwargs)
+                    # Keyset pages after the first use a different predicate
+                    cursor = response.headers.get("X-Next-Cursor")
+                    if method == "GET" and cursor:
+                        await client.get(url, params={"cursor": cursor}, headers=kwargs["headers"])
+                if save and response.status_code < 300:
+                    fixtures[save] = response.json()["id"]
+                problems = await _explain(pg, profile.statements, sizes, min_rows, seen)
+                if response.status_code >= 500:
+                    problems.append(f"HTTP {response.status_code}")
+                # Each upload stages into the same ON COMMIT DROP table, and the outer transaction never commits
+                await conn.execute(text("DROP TABLE IF EXISTS pg_temp.import_staging"))
+                print(f"{'FAIL' if problems else 'ok  '} {label} [{response.status_code}, "
+                      f"{profile.count} statements]")
+                for problem in problems:
+                    print(f"       {problem}")
+                failures += bool(problems)
+        app.dependency_overrides.clear()
+        await outer.rollback()
+    await database.engine.dispose()
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--min-rows", type=int, default=10_000, help="ignore seq scans on tables smaller than this")
+    args = parser.parse_args()
+    sys.exit(1 if asyncio.run(main(args.min_rows)) else 0)
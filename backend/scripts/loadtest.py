@@ -0,0 +1,296 @@
+"""End-to-end load test: storefront, checkout and admin scenario mix.
+
+Drives a running API with async httpx virtual users for a fixed duration and
+reports throughput, errors and p50/p95/p99 latency per endpoint. Results
+can be saved as a baseline and later runs diffed against it, failing when
+p95 or throughput regress beyond ``--tolerance``:
+
+    docker compose up -d db backend
+    cd backend && python -m scripts.seed_data
+    python -m scripts.loadtest --users 50 --duration 60 --save loadtest-baseline.json
+    # ... change something ...
+    python -m scripts.loadtest --users 50 --duration 60 --baseline loadtest-baseline.json
+
+``--login-storm N`` adds N clients that do nothing but customer logins (a
+full bcrypt verify each, on the hashing pool) and reports the storefront's
+``GET /api/products/`` p99 under that load; ``--max-products-p99-ms`` turns
+it into a pass/fail check. Compare against a run without the storm:
+
+    python -m scripts.loadtest --users 50 --duration 60 --save quiet.json
+    python -m scripts.loadtest --users 50 --duration 60 --login-storm 50 --baseline quiet.json
+
+Customers log in as the ``loadcust<N>`` accounts created by seed_data.
+Every virtual user logs in from the same IP, so start the API with
+``RATE_LIMIT_ENABLED=false`` (or a large ``AUTH_IP_BURST``); otherwise
+logins are spread out by the auth rate limiter. A virtual user whose login
+still fails would skip checkout and my_orders without a trace, so the run
+stops after setup when any session is missing, unless
+``--allow-sessionless`` is given; the count is reported either way.
+Scenario choices come from a seeded RNG per virtual user, so a run's
+request mix is reproducible.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+# Shared with seed_data, which generates the accounts and product names used here
+LOADTEST_PASSWORD = "loadtest123"
+ADJECTIVES = ["Classic", "Compact", "Deluxe", "Eco", "Ultra", "Smart", "Portable", "Premium", "Rugged", "Wireless"]
+NOUNS = ["Laptop", "Headphones", "Jacket", "Coffee", "Notebook", "Monitor", "Sneakers", "Tea", "Stapler", "Camera"]
+
+# scenario -> weight; roughly a storefront-heavy day with a few admins
+SCENARIOS = {
+    "browse": 40,
+    "search": 20,
+    "checkout": 10,
+    "my_orders": 15,
+    "admin": 15,
+}
+
+
+@dataclass
+class Samples:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+class Recorder:
+    def __init__(self):
+        self.endpoints: dict[str, Samples] = defaultdict(Samples)
+
+    async def call(self, label: str, request: Awaitable[httpx.Response], ok: tuple[int, ...] = (200, 201, 304)):
+        start = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.endpoints[label].errors += 1
+            return None
+        self.endpoints[label].latencies.append(time.perf_counter() - start)
+        if response.status_code not in ok:
+            self.endpoints[label].errors += 1
+            return None
+        return response
+
+    def report(self, seconds: float) -> dict:
+        results = {}
+        for label, s in sorted(self.endpoints.items()):
+            lat = sorted(s.latencies)
+            results[label] = {
+                "requests": len(lat),
+                "errors": s.errors,
+                "rps": round(len(lat) / seconds, 2),
+                "p50_ms": _percentile(lat, 0.50),
+                "p95_ms": _percentile(lat, 0.95),
+                "p99_ms": _percentile(lat, 0.99),
+            }
+        return results
+
+
+def _percentile(sorted_values: list[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return round(sorted_values[index] * 1000, 2)
+
+
+async def login(client: httpx.AsyncClient, rec: Recorder, path: str, username: str, password: str) -> dict[str, str]:
+    """Bearer header for an account, waiting out login rate limiting (429 + Retry-After)."""
+    for _ in range(10):
+        response = await rec.call(
+            f"POST {path}", client.post(path, json={"username": username, "password": password}), ok=(200, 429)
+        )
+        if response is None:
+            return {}
+        if response.status_code == 200:
+            return {"Authorization": f"Bearer {response.json()['access_token']}"}
+        await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+    return {}
+
+
+async def login_storm(client: httpx.AsyncClient, rec: Recorder, rng: random.Random, args, deadline: float) -> None:
+    """Back-to-back customer logins; 429 and 503 are the server shedding load, not errors."""
+    while time.perf_counter() < deadline:
+        customer = rng.randint(args.first_customer, args.last_customer)
+        await rec.call(
+            "POST /api/auth/customer/login (storm)",
+            client.post("/api/auth/customer/login",
+                        json={"username": f"loadcust{customer}", "password": LOADTEST_PASSWORD}),
+            ok=(200, 429, 503),
+        )
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, rec: Recorder, rng: random.Random, args):
+        self.client = client
+        self.rec = rec
+        self.rng = rng
+        self.args = args
+        self.customer_headers: dict[str, str] = {}
+        self.admin_headers: dict[str, str] = {}
+        self.product_ids: list[int] = []
+
+    async def setup(self, admin_headers: dict[str, str]) -> None:
+        customer = self.rng.randint(self.args.first_customer, self.args.last_customer)
+        self.customer_headers = await login(
+            self.client, self.rec, "/api/auth/customer/login", f"loadcust{customer}", LOADTEST_PASSWORD
+        )
+        self.admin_headers = admin_headers
+
+    async def browse(self) -> None:
+        params = {"limit": 24}
+        if self.rng.random() < 0.5:
+            params["category_id"] = self.rng.randint(1, 4)
+        response = await self.rec.call("GET /api/products/", self.client.get("/api/products/", params=params))
+        if response:
+            self.product_ids = [p["id"] for p in response.json()] or self.product_ids
+        if self.product_ids:
+            pid = self.rng.choice(self.product_ids)
+            await self.rec.call("GET /api/products/{id}", self.client.get(f"/api/products/{pid}"))
+
+    async def search(self) -> None:
+        term = self.rng.choice(ADJECTIVES + NOUNS).lower()[: self.rng.randint(3, 6)]
+        await self.rec.call(
+            "GET /api/products/?search", self.client.get("/api/products/", params={"search": term, "limit": 24})
+        )
+
+    async def checkout(self) -> None:
+        if not (self.customer_headers and self.product_ids):
+            await self.browse()
+            if not (self.customer_headers and self.product_ids):
+                return
+        items = [
+            {"product_id": pid, "quantity": self.rng.randint(1, 3)}
+            for pid in self.rng.sample(self.product_ids, min(len(self.product_ids), self.rng.randint(1, 3)))
+        ]
+        await self.rec.call(
+            "POST /api/orders/",
+            self.client.post("/api/orders/", json={"items": items, "shipping_address": "1 Load Test Ave"},
+                             headers=self.customer_headers),
+        )
+
+    async def my_orders(self) -> None:
+        if self.customer_headers:
+            await self.rec.call(
+                "GET /api/orders/me/orders",
+                self.client.get("/api/orders/me/orders", params={"limit": 20}, headers=self.customer_headers),
+            )
+
+    async def admin(self) -> None:
+        if not self.admin_headers:
+            return
+        page = self.rng.choice(["dashboard", "orders", "customers", "products", "employees"])
+        if page == "dashboard":
+            await self.rec.call("GET /api/dashboard/summary",
+                                self.client.get("/api/dashboard/summary", headers=self.admin_headers))
+        else:
+            await self.rec.call(f"GET /api/{page}/ (admin grid)",
+                                self.client.get(f"/api/{page}/", params={"limit": 50}, headers=self.admin_headers))
+
+    async def run(self, deadline: float) -> None:
+        actions: dict[str, Callable[[], Awaitable[None]]] = {name: getattr(self, name) for name in SCENARIOS}
+        names, weights = list(SCENARIOS), list(SCENARIOS.values())
+        while time.perf_counter() < deadline:
+            await actions[self.rng.choices(names, weights)[0]]()
+            if self.args.think_ms:
+                await asyncio.sleep(self.rng.uniform(0, 2 * self.args.think_ms) / 1000)
+
+
+def _compare(current: dict, baseline: dict, tolerance: float) -> int:
+    regressions = 0
+    print(f"\n{'endpoint':<40}{'p95 ms':>18}{'rps':>20}")
+    for label, now in current.items():
+        before = baseline.get(label)
+        if not before or not before.get("p95_ms") or not now.get("p95_ms"):
+            print(f"{label:<40}{'(new)':>18}")
+            continue
+        p95_change = now["p95_ms"] / before["p95_ms"] - 1
+        rps_change = now["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        bad = p95_change > tolerance or rps_change < -tolerance
+        regressions += bad
+        print(
+            f"{label:<40}{before['p95_ms']:>8.1f} -> {now['p95_ms']:<7.1f}"
+            f"{before['rps']:>9.1f} -> {now['rps']:<7.1f}{'  REGRESSION' if bad else ''}"
+        )
+    return regressions
+
+
+async def main(args) -> int:
+    clients = args.users + args.login_storm
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    rec = Recorder()
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30.0) as client:
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        users = [VirtualUser(client, rec, random.Random(args.seed + i), args) for i in range(args.users)]
+        # One admin session shared by every user, as a handful of back-office staff would
+        admin_headers = await login(client, rec, "/api/auth/admin/login", args.admin_user, args.admin_password)
+        await asyncio.gather(*(u.setup(admin_headers) for u in users))
+        sessionless = sum(not u.customer_headers for u in users)
+        if sessionless or not admin_headers:
+            print(f"{sessionless} of {args.users} virtual users have no customer session"
+                  f"{', and admin login failed' if not admin_headers else ''}"
+                  " (check seed_data accounts and the auth rate limit)")
+            if not args.allow_sessionless:
+                return 1
+        storm = [login_storm(client, rec, random.Random(args.seed - 1 - i), args, deadline)
+                 for i in range(args.login_storm)]
+        await asyncio.gather(*(u.run(deadline) for u in users), *storm)
+        elapsed = time.perf_counter() - started
+
+    results = rec.report(elapsed)
+    total = sum(r["requests"] for r in results.values())
+    print(f"{'endpoint':<40}{'requests':>9}{'errors':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for label, r in results.items():
+        print(f"{label:<40}{r['requests']:>9}{r['errors']:>8}{r['rps']:>9.1f}"
+              + "".join(f"{r[k]:>9.1f}" if r[k] is not None else f"{'-':>9}" for k in ("p50_ms", "p95_ms", "p99_ms")))
+    print(f"{total} requests in {elapsed:.1f}s = {total / elapsed:.1f} req/s with {args.users} users"
+          + (f" ({sessionless} without a customer session)" if sessionless else ""))
+    failures = 0
+    if args.login_storm or args.max_products_p99_ms:
+        p99 = results.get("GET /api/products/", {}).get("p99_ms")
+        print(f"GET /api/products/ p99: {p99} ms with {args.login_storm} login-storm clients")
+        if args.max_products_p99_ms and (p99 is None or p99 > args.max_products_p99_ms):
+            print(f"  over the {args.max_products_p99_ms} ms budget")
+            failures += 1
+
+    if args.save:
+        meta = {"users": args.users, "duration": args.duration, "seed": args.seed, "think_ms": args.think_ms,
+                "login_storm": args.login_storm, "sessionless": sessionless,
+                "admin_session": bool(admin_headers)}
+        with open(args.save, "w") as f:
+            json.dump({"meta": meta, "endpoints": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["endpoints"]
+        failures += _compare(results, baseline, args.tolerance)
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean pause between a user's actions")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--first-customer", type=int, default=1, help="lowest loadcust<N> id to log in as")
+    parser.add_argument("--last-customer", type=int, default=100_000)
+    parser.add_argument("--login-storm", type=int, default=0, help="extra clients doing nothing but customer logins")
+    parser.add_argument("--max-products-p99-ms", type=float, help="exit 1 if GET /api/products/ p99 exceeds this")
+    parser.add_argument("--allow-sessionless", action="store_true",
+                        help="run even if some logins failed (those users skip checkout/my_orders/admin)")
+    parser.add_argument("--admin-user", default="admin")
+    parser.add_argument("--admin-password", default="admin123")
+    parser.add_argument("--save", help="write results to this baseline file")
+    parser.add_argument("--baseline", help="diff against this baseline; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed p95/throughput change (fraction)")
+    sys.exit(1 if asyncio.run(main(parser.parse_args())) else 0)
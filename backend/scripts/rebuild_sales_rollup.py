@@ -0,0 +1,37 @@
+"""Rebuild the sales rollups from orders for a date range (backfills and repairs).
+
+Checkout and status changes keep the rollup current; run this once after
+deploying the table, or after bulk-loading historical orders:
+
+    cd backend && python -m scripts.rebuild_sales_rollup --start 2020-01-01
+
+Each day is rebuilt in its own transaction, so the API stays responsive
+and an interrupted run can simply be restarted.
+"""
+import argparse
+import asyncio
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from app.database import AsyncSessionLocal, engine
+from app.models import Order
+from app.utils.analytics import rebuild_range
+
+
+async def main(start: date | None, end: date) -> None:
+    async with AsyncSessionLocal() as db:
+        if start is None:
+            first = await db.scalar(select(func.min(Order.order_date)))
+            start = first.date() if first else end
+        days = await rebuild_range(db, start, end + timedelta(days=1))
+    await engine.dispose()
+    print(f"Rebuilt {days} day(s) of sales rollups from {start} to {end}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=date.fromisoformat, help="first day (default: earliest order)")
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="last day, inclusive")
+    args = parser.parse_args()
+    asyncio.run(main(args.start, args.end))
@@ -0,0 +1,192 @@
+"""Deterministic bulk data generator for load tests.
+
+Scales the schema to realistic sizes with COPY, in batches, so millions of
+rows load in minutes. The same ``--seed`` and sizes always produce the same
+rows. Ids continue after the current maximum, so existing data is kept.
+Every generated customer can log in as ``loadcust<N>`` with the password
+``loadtest123``, which is what scripts/loadtest.py uses:
+
+    docker compose up -d db
+    cd backend && python -m scripts.seed_data --products 1000000 --customers 1000000 --orders 2000000
+
+Afterwards the sales rollup is rebuilt for the generated date range and the
+dashboard summary is refreshed.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Awaitable, Callable, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.config import settings
+from app.utils import hash_password
+from app.utils.analytics import rebuild_range
+from app.utils.dashboard import refresh_summary
+from scripts.loadtest import ADJECTIVES, LOADTEST_PASSWORD, NOUNS
+
+BATCH_SIZE = 50_000
+HISTORY_DAYS = 730
+FIRST_NAMES = ["Ana", "Ben", "Chen", "Dara", "Eli", "Fatima", "Goran", "Hana", "Ivan", "Jun", "Kofi", "Lena"]
+LAST_NAMES = ["Smith", "Garcia", "Nguyen", "Okafor", "Petrov", "Rossi", "Schmidt", "Tanaka", "Usman", "Weber"]
+STATUSES = ["pending", "confirmed", "shipped", "delivered", "delivered", "delivered", "cancelled"]
+
+
+def price_of(product_id: int) -> Decimal:
+    return Decimal(500 + product_id * 7919 % 99_500) / 100
+
+
+def _products(rng: random.Random, first: int, n: int, categories: list[int]) -> Iterator[tuple]:
+    for pid in range(first, first + n):
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {pid}"
+        yield (pid, name, f"{name} for load testing", price_of(pid), 1_000_000, rng.choice(categories), None)
+
+
+def _customers(rng: random.Random, first: int, n: int, password_hash: str) -> Iterator[tuple]:
+    for cid in range(first, first + n):
+        yield (
+            cid, f"loadcust{cid}", password_hash, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+            f"loadcust{cid}@example.test", None, f"{cid} Load Test Ave",
+        )
+
+
+def _employees(rng: random.Random, first: int, n: int, departments: list[int], branches: list[int]) -> Iterator[tuple]:
+    for eid in range(first, first + n):
+        # Each employee reports to a random earlier one: a deep, bushy org chart
+        manager = rng.randrange(first, eid) if eid > first else None
+        yield (
+            eid, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), f"loademp{eid}@example.test",
+            date(2015, 1, 1) + timedelta(days=rng.randrange(3650)), rng.choice(departments), manager,
+            rng.choice(branches),
+        )
+
+
+def _orders(
+    rng: random.Random, first: int, n: int, customers: tuple[int, int], products: tuple[int, int],
+    branches: list[int], first_item: int, items_out: list,
+) -> Iterator[tuple]:
+    """Yields orders and appends their items to ``items_out`` (drained per batch by the caller)."""
+    now = datetime(2026, 1, 1)
+    item_id = first_item
+    for oid in range(first, first + n):
+        total = Decimal(0)
+        for _ in range(rng.randint(1, 4)):
+            pid = rng.randint(*products)
+            qty = rng.randint(1, 3)
+            items_out.append((item_id, oid, pid, qty, price_of(pid), Decimal(0)))
+            item_id += 1
+            total += price_of(pid) * qty
+        placed = now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+        yield (oid, rng.randint(*customers), placed, rng.choice(STATUSES), total, f"{oid} Load Test Ave",
+               rng.choice(branches), placed, placed)
+
+
+async def _next_id(db: AsyncSession, table: str) -> int:
+    return (await db.execute(text(f"SELECT COALESCE(max(id), 0) + 1 FROM {table}"))).scalar()
+
+
+async def _ids(db: AsyncSession, table: str) -> list[int]:
+    return list((await db.execute(text(f"SELECT id FROM {table} ORDER BY id"))).scalars())
+
+
+async def _copy(db: AsyncSession, table: str, columns: list[str], rows: Iterator[tuple],
+                on_batch: Callable[[], Awaitable[None]] | None = None) -> int:
+    pg = (await (await db.connection()).get_raw_connection()).driver_connection
+    total, batch = 0, []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            await pg.copy_records_to_table(table, records=batch, columns=columns)
+            total += len(batch)
+            batch.clear()
+            if on_batch:
+                await on_batch()
+    if batch:
+        await pg.copy_records_to_table(table, records=batch, columns=columns)
+        total += len(batch)
+        if on_batch:
+            await on_batch()
+    await db.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"))
+    await db.commit()
+    return total
+
+
+async def main(args) -> None:
+    rng = random.Random(args.seed)
+    engine = create_async_engine(settings.database_url)
+    async with AsyncSession(engine) as db:
+        categories, branches, departments = (
+            await _ids(db, "categories"), await _ids(db, "branches"), await _ids(db, "departments")
+        )
+        if not (categories and branches and departments):
+            raise SystemExit("Seed categories, branches and departments first (database/init.sql)")
+
+        started = time.perf_counter()
+        first_product = await _next_id(db, "products")
+        n = await _copy(db, "products", ["id", "name", "description", "price", "stock_quantity", "category_id",
+                                         "image_url"], _products(rng, first_product, args.products, categories))
+        print(f"products   {n:>10,}")
+
+        first_customer = await _next_id(db, "customers")
+        password_hash = hash_password(LOADTEST_PASSWORD)
+        n = await _copy(db, "customers", ["id", "username", "password_hash", "first_name", "last_name", "email",
+                                          "phone", "address"],
+                        _customers(rng, first_customer, args.customers, password_hash))
+        print(f"customers  {n:>10,}")
+
+        n = await _copy(db, "employees", ["id", "first_name", "last_name", "email", "hire_date", "department_id",
+                                          "manager_id", "branch_id"],
+                        _employees(rng, await _next_id(db, "employees"), args.employees, departments, branches))
+        print(f"employees  {n:>10,}")
+
+        if args.orders and args.products and args.customers:
+            items: list[tuple] = []
+            item_columns = ["id", "order_id", "product_id", "quantity", "unit_price", "discount_pct"]
+            pg = (await (await db.connection()).get_raw_connection()).driver_connection
+
+            async def flush_items() -> None:
+                # Items go in after their orders' batch so the foreign key holds
+                await pg.copy_records_to_table("order_items", records=items, columns=item_columns)
+                items.clear()
+
+            orders = _orders(
+                rng, await _next_id(db, "orders"), args.orders,
+                (first_customer, first_customer + args.customers - 1),
+                (first_product, first_product + args.products - 1),
+                branches, await _next_id(db, "order_items"), items,
+            )
+            n = await _copy(db, "orders", ["id", "customer_id", "order_date", "status", "total_amount",
+                                           "shipping_address", "branch_id", "created_at", "updated_at"],
+                            orders, on_batch=flush_items)
+            await db.execute(text(
+                "SELECT setval(pg_get_serial_sequence('order_items', 'id'), (SELECT max(id) FROM order_items))"
+            ))
+            # Checkout snapshots each item's category; generated items take their product's
+            await db.execute(text(
+                "UPDATE order_items oi SET category_id = p.category_id FROM products p "
+                "WHERE p.id = oi.product_id AND oi.category_id IS NULL"
+            ))
+            await db.commit()
+            print(f"orders     {n:>10,}")
+
+        await db.execute(text("ANALYZE"))
+        await db.commit()
+        end = date(2026, 1, 1)
+        await rebuild_range(db, end - timedelta(days=HISTORY_DAYS + 1), end + timedelta(days=1))
+        await refresh_summary(db, force=True)
+        print(f"done in {time.perf_counter() - started:.0f}s")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--employees", type=int, default=5_000)
+    parser.add_argument("--orders", type=int, default=500_000)
+    asyncio.run(main(parser.parse_args()))
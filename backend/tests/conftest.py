@@ -0,0 +1,4 @@
+import os
+
+# app.config requires a secret; tests never issue tokens
+os.environ.setdefault("SECRET_KEY", "test-secret")
@@ -0,0 +1,101 @@
+"""Hydrating a page of orders costs one items query however large the page is.
+
+Same database requirements as test_oversell.py.
+"""
+import asyncio
+import os
+import uuid
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+pytestmark = pytest.mark.skipif(not os.environ.get("DATABASE_URL"), reason="needs DATABASE_URL")
+
+ITEMS_PER_ORDER = 2
+SIZES = (10, 100, 5000)
+
+
+async def _seed(n: int) -> tuple[int, int]:
+    from app.database import AsyncSessionLocal, engine
+    from app.models import Customer, Order, OrderItem, Product
+
+    tag = uuid.uuid4().hex[:12]
+    try:
+        async with AsyncSessionLocal() as db:
+            customer_id = await db.scalar(
+                insert(Customer)
+                .values(username=f"querycount-{tag}", password_hash="x", first_name="Query", last_name="Count",
+                        email=f"querycount-{tag}@example.com")
+                .returning(Customer.id)
+            )
+            product_id = await db.scalar(
+                insert(Product).values(name=f"Query count {tag}", price=1, stock_quantity=0).returning(Product.id)
+            )
+            order_ids = (
+                await db.scalars(
+                    insert(Order).returning(Order.id),
+                    [{"customer_id": customer_id, "status": "pending", "total_amount": ITEMS_PER_ORDER} for _ in range(n)],
+                )
+            ).all()
+            await db.execute(
+                insert(OrderItem),
+                [
+                    {"order_id": oid, "product_id": product_id, "quantity": 1, "unit_price": 1, "discount_pct": 0}
+                    for oid in order_ids
+                    for _ in range(ITEMS_PER_ORDER)
+                ],
+            )
+            await db.commit()
+        return customer_id, product_id
+    finally:
+        await engine.dispose()
+
+
+async def _cleanup(customer_id: int, product_id: int) -> None:
+    from app.database import AsyncSessionLocal, engine
+    from app.models import Customer, Order, OrderItem, Product
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(OrderItem).where(OrderItem.product_id == product_id))
+            await db.execute(delete(Order).where(Order.customer_id == customer_id))
+            await db.execute(delete(Product).where(Product.id == product_id))
+            await db.execute(delete(Customer).where(Customer.id == customer_id))
+            await db.commit()
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    ids = asyncio.run(_seed(max(SIZES)))
+    yield ids
+    asyncio.run(_cleanup(*ids))
+
+
+async def _hydrate(customer_id: int, n: int):
+    from app.database import AsyncSessionLocal, engine
+    from app.models import Order
+    from app.routers.orders import _ORDER_COLUMNS, _order_payloads, build_order_responses
+    from app.utils.sqlprofile import assert_max_queries
+
+    try:
+        async with AsyncSessionLocal() as db:
+            page = select(Order).where(Order.customer_id == customer_id).order_by(Order.id).limit(n)
+            orders = (await db.scalars(page)).all()
+            rows = (await db.execute(page.with_only_columns(*_ORDER_COLUMNS))).all()
+            with assert_max_queries(1):
+                responses = await build_order_responses(orders, db)
+            with assert_max_queries(1):
+                payloads = await _order_payloads(rows, db)
+        return responses, payloads
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_order_hydration_is_one_query(seeded, n):
+    responses, payloads = asyncio.run(_hydrate(seeded[0], n))
+    assert len(responses) == len(payloads) == n
+    assert all(len(r.items) == ITEMS_PER_ORDER for r in responses)
+    assert all(len(p["items"]) == ITEMS_PER_ORDER for p in payloads)
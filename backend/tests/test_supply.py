@@ -0,0 +1,82 @@
+"""Deleting a delivery whose stock has been sold refuses rather than driving inventory negative.
+
+Runs against a migrated, disposable database given by DATABASE_URL and
+skips without one.
+"""
+import asyncio
+import os
+import uuid
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, select, update
+
+pytestmark = pytest.mark.skipif(not os.environ.get("DATABASE_URL"), reason="needs DATABASE_URL")
+
+
+async def _delete_consumed_supply():
+    from app.database import AsyncSessionLocal, engine
+    from app.models import Product, Store, StoreInventory, Supply
+    from app.routers.stores import delete_supply
+    from app.utils.inventory import apply_inventory_deltas
+
+    tag = uuid.uuid4().hex[:12]
+    async with AsyncSessionLocal() as db:
+        store_id = await db.scalar(insert(Store).values(name=f"Supply {tag}").returning(Store.id))
+        product_id = await db.scalar(insert(Product).values(name=f"Supply {tag}", price=1).returning(Product.id))
+        supply_id = await db.scalar(
+            insert(Supply)
+            .values(product_id=product_id, store_id=store_id, quantity=10, supply_date=date.today())
+            .returning(Supply.id)
+        )
+        await apply_inventory_deltas(db, [(store_id, product_id, 10)])
+        # Most of the delivery has been sold since
+        await db.execute(
+            update(StoreInventory)
+            .where(StoreInventory.store_id == store_id, StoreInventory.product_id == product_id)
+            .values(quantity=3)
+        )
+        await db.commit()
+
+    async def stock():
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(
+                select(StoreInventory.quantity).where(
+                    StoreInventory.store_id == store_id, StoreInventory.product_id == product_id
+                )
+            )
+
+    async def remove():
+        async with AsyncSessionLocal() as db:
+            try:
+                await delete_supply(supply_id, db=db)
+            except HTTPException as exc:
+                return exc.status_code
+            return 204
+
+    try:
+        refused, left = await remove(), await stock()
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(StoreInventory)
+                .where(StoreInventory.store_id == store_id, StoreInventory.product_id == product_id)
+                .values(quantity=12)
+            )
+            await db.commit()
+        deleted, after = await remove(), await stock()
+        return refused, left, deleted, after
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Supply).where(Supply.id == supply_id))
+            await db.execute(delete(StoreInventory).where(StoreInventory.store_id == store_id))
+            await db.execute(delete(Store).where(Store.id == store_id))
+            await db.execute(delete(Product).where(Product.id == product_id))
+            await db.commit()
+        await engine.dispose()
+
+
+def test_delete_supply_never_drives_inventory_negative():
+    refused, left, deleted, after = asyncio.run(_delete_consumed_supply())
+    assert (refused, left) == (409, 3)
+    assert (deleted, after) == (204, 2)
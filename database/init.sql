@@ -142,7 +142,8 @@ CREATE TABLE IF NOT EXISTS order_items (
     product_id INTEGER REFERENCES products(id),
     quantity INTEGER NOT NULL,
     unit_price NUMERIC(10, 2) NOT NULL,
-    discount_pct NUMERIC(4, 2) DEFAULT 0
+    discount_pct NUMERIC(4, 2) DEFAULT 0,
+    category_id INTEGER  -- product category at checkout (analytics attribution)
 );
 
 -- Shipments
@@ -159,6 +160,68 @@ CREATE TABLE IF NOT EXISTS shipments (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
+-- Dashboard summary rollup (single row, refreshed by the API on a schedule)
+CREATE TABLE IF NOT EXISTS dashboard_summary (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    products INTEGER NOT NULL DEFAULT 0,
+    customers INTEGER NOT NULL DEFAULT 0,
+    employees INTEGER NOT NULL DEFAULT 0,
+    orders INTEGER NOT NULL DEFAULT 0,
+    revenue NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    orders_by_status JSONB NOT NULL DEFAULT '{}',
+    low_stock JSONB NOT NULL DEFAULT '[]',
+    refreshed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Daily units/revenue facts for the analytics API (branch_id/category_id 0 = unassigned)
+CREATE TABLE IF NOT EXISTS sales_daily (
+    day DATE NOT NULL,
+    branch_id INTEGER NOT NULL DEFAULT 0,
+    category_id INTEGER NOT NULL DEFAULT 0,
+    product_id INTEGER NOT NULL,
+    units INTEGER NOT NULL DEFAULT 0,
+    revenue NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, branch_id, category_id, product_id)
+);
+
+-- Daily order counts per branch; separate so an order with several products counts once
+CREATE TABLE IF NOT EXISTS sales_orders_daily (
+    day DATE NOT NULL,
+    branch_id INTEGER NOT NULL DEFAULT 0,
+    orders INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, branch_id)
+);
+
+-- Shared auth rate-limit token buckets (RATE_LIMIT_BACKEND=postgres); disposable, so unlogged
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_buckets (
+    key VARCHAR(200) PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Foreign-key and filter indexes (kept in sync with backend/alembic/versions)
+CREATE INDEX IF NOT EXISTS ix_orders_customer_id ON orders (customer_id, id);
+CREATE INDEX IF NOT EXISTS ix_orders_order_date ON orders (order_date);
+CREATE INDEX IF NOT EXISTS ix_order_items_order_id ON order_items (order_id);
+CREATE INDEX IF NOT EXISTS ix_order_items_product_id ON order_items (product_id);
+CREATE INDEX IF NOT EXISTS ix_shipments_order_id ON shipments (order_id);
+CREATE INDEX IF NOT EXISTS ix_employees_department_id ON employees (department_id);
+CREATE INDEX IF NOT EXISTS ix_employees_manager_id ON employees (manager_id);
+CREATE INDEX IF NOT EXISTS ix_supply_store_id ON supply (store_id);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_store_inventory_store_product ON store_inventory (store_id, product_id);
+CREATE INDEX IF NOT EXISTS ix_discounts_product_id ON discounts (product_id);
+CREATE INDEX IF NOT EXISTS ix_products_category_id ON products (category_id);
+CREATE INDEX IF NOT EXISTS ix_products_stock_quantity ON products (stock_quantity, id);
+CREATE INDEX IF NOT EXISTS ix_sales_daily_product_day ON sales_daily (product_id, day);
+
+-- Search indexes (pg_trgm): serve ILIKE '%term%' and word-similarity lookups
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_products_description_trgm ON products USING gin (description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_customers_first_name_trgm ON customers USING gin (first_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_customers_last_name_trgm ON customers USING gin (last_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_customers_email_trgm ON customers USING gin (email gin_trgm_ops);
+
 -- Seed default admin user (password: admin123)
 -- WARNING: Development seed data only. Do NOT run in production.
 INSERT INTO users (username, password_hash, email, role) VALUES
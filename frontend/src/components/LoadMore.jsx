@@ -0,0 +1,10 @@
+export default function LoadMore({ query }) {
+  if (!query.hasNextPage) return null
+  return (
+    <div className="flex justify-center">
+      <button className="btn-secondary" onClick={() => query.fetchNextPage()} disabled={query.isFetchingNextPage}>
+        {query.isFetchingNextPage ? 'Loading…' : 'Load more'}
+      </button>
+    </div>
+  )
+}
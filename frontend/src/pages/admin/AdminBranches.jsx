@@ -1,7 +1,9 @@
 import { useState } from 'react'
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useMutation, useQueryClient } from '@tanstack/react-query'
 import api from '../../utils/api'
+import usePagedList from '../../utils/usePagedList'
 import LoadingSpinner from '../../components/LoadingSpinner'
+import LoadMore from '../../components/LoadMore'
 import Alert from '../../components/Alert'
 
 export default function AdminBranches() {
@@ -10,10 +12,8 @@ export default function AdminBranches() {
   const [form, setForm] = useState({ name: '', location: '', phone: '' })
   const [error, setError] = useState('')
 
-  const { data: branches = [], isLoading } = useQuery({
-    queryKey: ['branches'],
-    queryFn: () => api.get('/branches').then(r => r.data),
-  })
+  const branchesQuery = usePagedList(['branches', 'page'], '/branches')
+  const { rows: branches, isLoading } = branchesQuery
 
   const createMutation = useMutation({
     mutationFn: (data) => api.post('/branches', data),
@@ -92,6 +92,7 @@ export default function AdminBranches() {
           </tbody>
         </table>
       </div>
+      <LoadMore query={branchesQuery} />
     </div>
   )
 }
@@ -1,12 +1,10 @@
-import { useQuery } from '@tanstack/react-query'
-import api from '../../utils/api'
+import usePagedList from '../../utils/usePagedList'
 import LoadingSpinner from '../../components/LoadingSpinner'
+import LoadMore from '../../components/LoadMore'
 
 export default function AdminCustomers() {
-  const { data: customers = [], isLoading } = useQuery({
-    queryKey: ['customers'],
-    queryFn: () => api.get('/customers').then(r => r.data),
-  })
+  const customersQuery = usePagedList(['customers', 'page'], '/customers')
+  const { rows: customers, isLoading } = customersQuery
 
   if (isLoading) return <LoadingSpinner />
 
@@ -42,6 +40,7 @@ export default function AdminCustomers() {
           </tbody>
         </table>
       </div>
+      <LoadMore query={customersQuery} />
     </div>
   )
 }
@@ -4,19 +4,21 @@ import api from '../../utils/api'
 import LoadingSpinner from '../../components/LoadingSpinner'
 
 export default function AdminDashboard() {
-  const { data: products = [] } = useQuery({ queryKey: ['products'], queryFn: () => api.get('/products').then(r => r.data) })
-  const { data: orders = [] } = useQuery({ queryKey: ['orders'], queryFn: () => api.get('/orders').then(r => r.data) })
-  const { data: customers = [] } = useQuery({ queryKey: ['customers'], queryFn: () => api.get('/customers').then(r => r.data) })
-  const { data: employees = [] } = useQuery({ queryKey: ['employees'], queryFn: () => api.get('/employees').then(r => r.data) })
+  const { data: summary, isLoading } = useQuery({
+    queryKey: ['dashboard-summary'],
+    queryFn: () => api.get('/dashboard/summary').then(r => r.data),
+  })
+
+  if (isLoading) return <LoadingSpinner />
 
   const stats = [
-    { label: 'Products', value: products.length, icon: '📦', to: '/admin/products', color: 'bg-blue-500' },
-    { label: 'Orders', value: orders.length, icon: '🛒', to: '/admin/orders', color: 'bg-green-500' },
-    { label: 'Customers', value: customers.length, icon: '👥', to: '/admin/customers', color: 'bg-purple-500' },
-    { label: 'Employees', value: employees.length, icon: '👤', to: '/admin/employees', color: 'bg-orange-500' },
+    { label: 'Products', value: summary?.products ?? 0, icon: '📦', to: '/admin/products', color: 'bg-blue-500' },
+    { label: 'Orders', value: summary?.orders ?? 0, icon: '🛒', to: '/admin/orders', color: 'bg-green-500' },
+    { label: 'Customers', value: summary?.customers ?? 0, icon: '👥', to: '/admin/customers', color: 'bg-purple-500' },
+    { label: 'Employees', value: summary?.employees ?? 0, icon: '👤', to: '/admin/employees', color: 'bg-orange-500' },
   ]
 
-  const recentOrders = orders.slice(0, 5)
+  const recentOrders = summary?.recent_orders ?? []
 
   return (
     <div className="space-y-6">
@@ -1,7 +1,9 @@
 import { useState } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import api from '../../utils/api'
+import usePagedList from '../../utils/usePagedList'
 import LoadingSpinner from '../../components/LoadingSpinner'
+import LoadMore from '../../components/LoadMore'
 import Alert from '../../components/Alert'
 
 export default function AdminEmployees() {
@@ -10,9 +12,10 @@ export default function AdminEmployees() {
   const [form, setForm] = useState({ first_name: '', last_name: '', email: '', phone: '', hire_date: '', salary: '', job_title: '', department_id: '', branch_id: '' })
   const [error, setError] = useState('')
 
-  const { data: employees = [], isLoading } = useQuery({ queryKey: ['employees'], queryFn: () => api.get('/employees').then(r => r.data) })
+  const employeesQuery = usePagedList(['employees', 'page'], '/employees')
+  const { rows: employees, isLoading } = employeesQuery
   const { data: departments = [] } = useQuery({ queryKey: ['departments'], queryFn: () => api.get('/departments').then(r => r.data) })
-  const { data: branches = [] } = useQuery({ queryKey: ['branches'], queryFn: () => api.get('/branches').then(r => r.data) })
+  const { data: branches = [] } = useQuery({ queryKey: ['branches'], queryFn: () => api.get('/branches', { params: { limit: 1000 } }).then(r => r.data) })
 
   const createMutation = useMutation({
     mutationFn: (data) => api.post('/employees', {
@@ -126,6 +129,7 @@ export default function AdminEmployees() {
           </tbody>
         </table>
       </div>
+      <LoadMore query={employeesQuery} />
     </div>
   )
 }
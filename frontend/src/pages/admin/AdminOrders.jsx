@@ -1,7 +1,9 @@
 import { useState } from 'react'
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useMutation, useQueryClient } from '@tanstack/react-query'
 import api from '../../utils/api'
+import usePagedList from '../../utils/usePagedList'
 import LoadingSpinner from '../../components/LoadingSpinner'
+import LoadMore from '../../components/LoadMore'
 import Alert from '../../components/Alert'
 
 const STATUS_OPTIONS = ['pending', 'confirmed', 'shipped', 'delivered', 'cancelled']
@@ -18,10 +20,8 @@ export default function AdminOrders() {
   const qc = useQueryClient()
   const [selected, setSelected] = useState(null)
 
-  const { data: orders = [], isLoading } = useQuery({
-    queryKey: ['orders'],
-    queryFn: () => api.get('/orders').then(r => r.data),
-  })
+  const ordersQuery = usePagedList(['orders', 'page'], '/orders')
+  const { rows: orders, isLoading } = ordersQuery
 
   const statusMutation = useMutation({
     mutationFn: ({ id, status }) => api.patch(`/orders/${id}/status`, { status }),
@@ -113,6 +113,7 @@ export default function AdminOrders() {
           </tbody>
         </table>
       </div>
+      <LoadMore query={ordersQuery} />
     </div>
   )
 }
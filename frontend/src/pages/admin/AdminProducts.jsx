@@ -1,7 +1,9 @@
 import { useState } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import api from '../../utils/api'
+import usePagedList from '../../utils/usePagedList'
 import LoadingSpinner from '../../components/LoadingSpinner'
+import LoadMore from '../../components/LoadMore'
 import Alert from '../../components/Alert'
 
 export default function AdminProducts() {
@@ -11,10 +13,8 @@ export default function AdminProducts() {
   const [form, setForm] = useState({ name: '', description: '', price: '', stock_quantity: '', category_id: '', image_url: '' })
   const [error, setError] = useState('')
 
-  const { data: products = [], isLoading } = useQuery({
-    queryKey: ['products', search],
-    queryFn: () => api.get('/products', { params: search ? { search } : {} }).then(r => r.data),
-  })
+  const productsQuery = usePagedList(['products', 'page', search], '/products', search ? { search } : {})
+  const { rows: products, isLoading } = productsQuery
   const { data: categories = [] } = useQuery({
     queryKey: ['categories'],
     queryFn: () => api.get('/categories').then(r => r.data),
@@ -125,6 +125,7 @@ export default function AdminProducts() {
           </tbody>
         </table>
       </div>
+      <LoadMore query={productsQuery} />
     </div>
   )
 }
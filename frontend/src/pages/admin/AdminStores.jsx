@@ -1,7 +1,9 @@
 import { useState } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import api from '../../utils/api'
+import usePagedList from '../../utils/usePagedList'
 import LoadingSpinner from '../../components/LoadingSpinner'
+import LoadMore from '../../components/LoadMore'
 import Alert from '../../components/Alert'
 
 export default function AdminStores() {
@@ -10,9 +12,10 @@ export default function AdminStores() {
   const [form, setForm] = useState({ name: '', branch_id: '', location: '', manager_id: '' })
   const [error, setError] = useState('')
 
-  const { data: stores = [], isLoading } = useQuery({ queryKey: ['stores'], queryFn: () => api.get('/stores').then(r => r.data) })
-  const { data: branches = [] } = useQuery({ queryKey: ['branches'], queryFn: () => api.get('/branches').then(r => r.data) })
-  const { data: employees = [] } = useQuery({ queryKey: ['employees'], queryFn: () => api.get('/employees').then(r => r.data) })
+  const storesQuery = usePagedList(['stores', 'page'], '/stores')
+  const { rows: stores, isLoading } = storesQuery
+  const { data: branches = [] } = useQuery({ queryKey: ['branches'], queryFn: () => api.get('/branches', { params: { limit: 1000 } }).then(r => r.data) })
+  const { data: employees = [] } = useQuery({ queryKey: ['employees'], queryFn: () => api.get('/employees', { params: { limit: 1000 } }).then(r => r.data) })
 
   const createMutation = useMutation({
     mutationFn: (data) => api.post('/stores', {
@@ -105,6 +108,7 @@ export default function AdminStores() {
           </tbody>
         </table>
       </div>
+      <LoadMore query={storesQuery} />
     </div>
   )
 }
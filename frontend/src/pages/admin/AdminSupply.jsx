@@ -1,7 +1,9 @@
 import { useState } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import api from '../../utils/api'
+import usePagedList from '../../utils/usePagedList'
 import LoadingSpinner from '../../components/LoadingSpinner'
+import LoadMore from '../../components/LoadMore'
 import Alert from '../../components/Alert'
 
 export default function AdminSupply() {
@@ -10,9 +12,10 @@ export default function AdminSupply() {
   const [form, setForm] = useState({ product_id: '', store_id: '', quantity: '', supply_date: '', supplier_name: '' })
   const [error, setError] = useState('')
 
-  const { data: supply = [], isLoading } = useQuery({ queryKey: ['supply'], queryFn: () => api.get('/supply').then(r => r.data) })
-  const { data: products = [] } = useQuery({ queryKey: ['products'], queryFn: () => api.get('/products').then(r => r.data) })
-  const { data: stores = [] } = useQuery({ queryKey: ['stores'], queryFn: () => api.get('/stores').then(r => r.data) })
+  const supplyQuery = usePagedList(['supply', 'page'], '/supply')
+  const { rows: supply, isLoading } = supplyQuery
+  const { data: products = [] } = useQuery({ queryKey: ['products'], queryFn: () => api.get('/products', { params: { limit: 1000 } }).then(r => r.data) })
+  const { data: stores = [] } = useQuery({ queryKey: ['stores'], queryFn: () => api.get('/stores', { params: { limit: 1000 } }).then(r => r.data) })
 
   const createMutation = useMutation({
     mutationFn: (data) => api.post('/supply', {
@@ -112,6 +115,7 @@ export default function AdminSupply() {
           </tbody>
         </table>
       </div>
+      <LoadMore query={supplyQuery} />
     </div>
   )
 }
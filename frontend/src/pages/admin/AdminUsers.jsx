@@ -1,7 +1,9 @@
 import { useState } from 'react'
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useMutation, useQueryClient } from '@tanstack/react-query'
 import api from '../../utils/api'
+import usePagedList from '../../utils/usePagedList'
 import LoadingSpinner from '../../components/LoadingSpinner'
+import LoadMore from '../../components/LoadMore'
 import Alert from '../../components/Alert'
 
 export default function AdminUsers() {
@@ -11,7 +13,8 @@ export default function AdminUsers() {
   const [error, setError] = useState('')
   const [success, setSuccess] = useState('')
 
-  const { data: users = [], isLoading } = useQuery({ queryKey: ['admin-users'], queryFn: () => api.get('/users').then(r => r.data) })
+  const usersQuery = usePagedList(['admin-users', 'page'], '/users')
+  const { rows: users, isLoading } = usersQuery
 
   const createMutation = useMutation({
     mutationFn: (data) => api.post('/users', data),
@@ -99,6 +102,7 @@ export default function AdminUsers() {
           </tbody>
         </table>
       </div>
+      <LoadMore query={usersQuery} />
     </div>
   )
 }
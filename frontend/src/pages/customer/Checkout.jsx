@@ -11,7 +11,7 @@ export default function Checkout() {
   const [error, setError] = useState('')
   const [loading, setLoading] = useState(false)
 
-  const total = cart.reduce((s, i) => s + Number(i.price) * i.qty, 0)
+  const total = cart.reduce((s, i) => s + Number(i.discounted_price ?? i.price) * i.qty, 0)
 
   const handleSubmit = async (e) => {
     e.preventDefault()
@@ -23,7 +23,7 @@ export default function Checkout() {
         items: cart.map(i => ({
           product_id: i.id,
           quantity: i.qty,
-          discount_pct: 0,
+          discount_pct: i.discount_pct ?? 0,
         })),
       }
       await api.post('/orders', payload)
@@ -53,7 +53,7 @@ export default function Checkout() {
           {cart.map(item => (
             <div key={item.id} className="flex justify-between py-2 text-sm">
               <span>{item.name} × {item.qty}</span>
-              <span>${(Number(item.price) * item.qty).toFixed(2)}</span>
+              <span>${(Number(item.discounted_price ?? item.price) * item.qty).toFixed(2)}</span>
             </div>
           ))}
         </div>
@@ -1,7 +1,7 @@
-import { useQuery } from '@tanstack/react-query'
 import { Link } from 'react-router-dom'
-import api from '../../utils/api'
+import usePagedList from '../../utils/usePagedList'
 import LoadingSpinner from '../../components/LoadingSpinner'
+import LoadMore from '../../components/LoadMore'
 
 const STATUS_COLORS = {
   pending: 'bg-yellow-100 text-yellow-800',
@@ -12,10 +12,8 @@ const STATUS_COLORS = {
 }
 
 export default function MyOrders() {
-  const { data: orders = [], isLoading } = useQuery({
-    queryKey: ['my-orders'],
-    queryFn: () => api.get('/orders/me/orders').then(r => r.data),
-  })
+  const ordersQuery = usePagedList(['my-orders'], '/orders/me/orders')
+  const { rows: orders, isLoading } = ordersQuery
 
   if (isLoading) return <LoadingSpinner />
 
@@ -64,6 +62,7 @@ export default function MyOrders() {
               )}
             </div>
           ))}
+          <LoadMore query={ordersQuery} />
         </div>
       )}
     </div>
@@ -2,7 +2,9 @@ import { useState } from 'react'
 import { useQuery } from '@tanstack/react-query'
 import { Link } from 'react-router-dom'
 import api from '../../utils/api'
+import usePagedList from '../../utils/usePagedList'
 import LoadingSpinner from '../../components/LoadingSpinner'
+import LoadMore from '../../components/LoadMore'
 
 export default function Shop() {
   const [search, setSearch] = useState('')
@@ -10,10 +12,8 @@ export default function Shop() {
   const [cart, setCart] = useState([])
   const [showCart, setShowCart] = useState(false)
 
-  const { data: products = [], isLoading } = useQuery({
-    queryKey: ['products', search, categoryId],
-    queryFn: () => api.get('/products', { params: { ...(search && { search }), ...(categoryId && { category_id: categoryId }) } }).then(r => r.data),
-  })
+  const productsQuery = usePagedList(['products', 'page', search, categoryId], '/products', { ...(search && { search }), ...(categoryId && { category_id: categoryId }) })
+  const { rows: products, isLoading } = productsQuery
   const { data: categories = [] } = useQuery({
     queryKey: ['categories'],
     queryFn: () => api.get('/categories').then(r => r.data),
@@ -29,7 +29,7 @@ export default function Shop() {
 
   const removeFromCart = (id) => setCart(prev => prev.filter(i => i.id !== id))
 
-  const cartTotal = cart.reduce((sum, i) => sum + Number(i.price) * i.qty, 0)
+  const cartTotal = cart.reduce((sum, i) => sum + Number(i.discounted_price ?? i.price) * i.qty, 0)
 
   if (isLoading) return <LoadingSpinner />
 
@@ -58,7 +58,7 @@ export default function Shop() {
                 <div key={item.id} className="flex items-center justify-between py-2 border-b border-gray-100">
                   <span className="text-sm">{item.name} × {item.qty}</span>
                   <div className="flex items-center space-x-3">
-                    <span className="text-sm font-medium">${(Number(item.price) * item.qty).toFixed(2)}</span>
+                    <span className="text-sm font-medium">${(Number(item.discounted_price ?? item.price) * item.qty).toFixed(2)}</span>
                     <button
                       onClick={() => removeFromCart(item.id)}
                       className="text-red-500 text-xs"
@@ -107,7 +107,7 @@ export default function Shop() {
             {p.category_name && <p className="text-xs text-gray-400 mb-2">{p.category_name}</p>}
             {p.description && <p className="text-xs text-gray-500 mb-3 line-clamp-2">{p.description}</p>}
             <div className="flex items-center justify-between">
-              <span className="text-lg font-bold text-primary-600">${Number(p.price).toFixed(2)}</span>
+              <span className="text-lg font-bold text-primary-600">${Number(p.discounted_price ?? p.price).toFixed(2)}</span>
               <button
                 onClick={() => addToCart(p)}
                 disabled={p.stock_quantity === 0}
@@ -119,6 +119,7 @@ export default function Shop() {
           </div>
         ))}
       </div>
+      <LoadMore query={productsQuery} />
     </div>
   )
 }
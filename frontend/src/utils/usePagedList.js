@@ -0,0 +1,17 @@
+import { useInfiniteQuery } from '@tanstack/react-query'
+import api from './api'
+
+// Keyset-paginated list endpoints return one page per request (DEFAULT_PAGE_SIZE rows
+// unless `limit` is given) and the next page's cursor in the X-Next-Cursor header.
+export default function usePagedList(queryKey, path, params = {}) {
+  const query = useInfiniteQuery({
+    queryKey,
+    queryFn: ({ pageParam }) =>
+      api
+        .get(path, { params: { ...params, ...(pageParam && { cursor: pageParam }) } })
+        .then(r => ({ rows: r.data, next: r.headers['x-next-cursor'] })),
+    initialPageParam: null,
+    getNextPageParam: (last) => last.next ?? undefined,
+  })
+  return { ...query, rows: query.data?.pages.flatMap(p => p.rows) ?? [] }
+}